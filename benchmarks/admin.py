@@ -0,0 +1,73 @@
+"""Время загрузки списков в админке на наполненной базе.
+
+    python yatube/manage.py seed --scale 1m
+    python -m benchmarks.admin --output admin.json
+"""
+from .utils import dataset_size, get_parser, measure, report, setup_django
+
+ADMIN_USERNAME = 'bench-admin'
+# Номер страницы списка постов (в админке p считается с нуля). На
+# небольшой базе берётся последняя страница: дальше админка
+# перенаправляет на первую.
+DEEP_PAGE = 50
+
+
+def get_admin():
+    from posts.models import User
+
+    user = User.objects.filter(username=ADMIN_USERNAME).first()
+    if user is None:
+        user = User.objects.create_superuser(
+            ADMIN_USERNAME, 'bench@example.com', None
+        )
+    return user
+
+
+def deep_page():
+    from django.contrib import admin
+    from posts.models import Post
+
+    per_page = admin.site._registry[Post].list_per_page
+    last = max(Post.objects.count() - 1, 0) // per_page
+    return min(DEEP_PAGE, last)
+
+
+def main():
+    args = get_parser(__doc__).parse_args()
+    setup_django()
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+    from django.utils import timezone
+
+    client = Client()
+    client.force_login(get_admin())
+    today = timezone.now()
+    post_list = reverse('admin:posts_post_changelist')
+    targets = {
+        'post_changelist': post_list,
+        'post_changelist_page_50': f'{post_list}?p={deep_page()}',
+        'post_search': f'{post_list}?q=тест',
+        'post_date_hierarchy': (
+            f'{post_list}?pub_date__year={today.year}'
+            f'&pub_date__month={today.month}'
+        ),
+        'comment_changelist': reverse('admin:posts_comment_changelist'),
+        'follow_changelist': reverse('admin:posts_follow_changelist'),
+    }
+    results = {}
+    for name, url in targets.items():
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.status_code == 200, (url, response.status_code)
+        results[name] = {
+            'url': url,
+            'queries': len(queries),
+            **measure(lambda: client.get(url), args.repeat, args.warmup),
+        }
+    report('admin', results, args.output, dataset=dataset_size())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""ASGI против WSGI при большом числе одновременных запросов.
+
+WSGI-приложение вызывается из пула в --threads потоков, ASGI — из
+цикла событий с --concurrency одновременными запросами. С флагом
+--concurrent-queries представления выполняют независимые запросы
+параллельно (settings.CONCURRENT_QUERIES).
+
+    python -m benchmarks.asgi --concurrency 256 --output asgi.json
+"""
+import asyncio
+import time
+
+from .utils import (
+    dataset_size, get_parser, report, setup_django, summarize
+)
+from .views import get_targets, run_wsgi, session_cookie
+
+
+def asgi_scope(path, cookie):
+    path, _, query = path.partition('?')
+    headers = [(b'host', b'testserver')]
+    if cookie:
+        headers.append((b'cookie', cookie.encode('latin-1')))
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'query_string': query.encode('latin-1'),
+        'headers': headers,
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 0),
+    }
+
+
+async def run_asgi(application, path, cookie, concurrency, repeat):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with semaphore:
+            sent = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                sent.append(message)
+
+            start = time.perf_counter()
+            await application(asgi_scope(path, cookie), receive, send)
+            assert sent[0]['status'] == 200, (path, sent[0]['status'])
+            return time.perf_counter() - start
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(call() for _ in range(repeat)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def main():
+    parser = get_parser(__doc__)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--concurrency', type=int, default=256)
+    parser.add_argument('--concurrent-queries', action='store_true')
+    parser.add_argument('--only', nargs='*', help='Имена представлений.')
+    args = parser.parse_args()
+    setup_django()
+
+    from django.conf import settings
+    from django.core.wsgi import get_wsgi_application
+    from core.asgi import ASGIHandler
+
+    settings.CONCURRENT_QUERIES = args.concurrent_queries
+    wsgi_application = get_wsgi_application()
+    asgi_application = ASGIHandler(wsgi_application, args.threads)
+    results = {}
+    for name, (path, user) in get_targets().items():
+        if args.only and name not in args.only:
+            continue
+        cookie = session_cookie(user)
+        run_wsgi(wsgi_application, path, cookie, args.threads, args.warmup)
+        results[name] = {
+            'path': path,
+            'wsgi': run_wsgi(
+                wsgi_application, path, cookie, args.threads, args.repeat
+            ),
+            'asgi': asyncio.run(run_asgi(
+                asgi_application, path, cookie,
+                args.concurrency, args.repeat
+            )),
+        }
+    report(
+        'asgi', results, args.output,
+        threads=args.threads, concurrency=args.concurrency,
+        concurrent_queries=args.concurrent_queries, dataset=dataset_size()
+    )
+
+
+if __name__ == '__main__':
+    main()
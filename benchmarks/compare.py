@@ -0,0 +1,43 @@
+"""Сравнение двух JSON-отчётов бенчмарков.
+
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+METRICS = ('p50_ms', 'p95_ms', 'throughput_rps')
+
+
+def flatten(results, prefix=''):
+    """Раскладывает вложенные результаты в пары «путь — сводка»."""
+    for key, value in results.items():
+        if not isinstance(value, dict):
+            continue
+        name = f'{prefix}{key}'
+        if any(metric in value for metric in METRICS):
+            yield name, value
+        else:
+            yield from flatten(value, f'{name}.')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('before')
+    parser.add_argument('after')
+    args = parser.parse_args()
+    with open(args.before) as file:
+        before = dict(flatten(json.load(file)['results']))
+    with open(args.after) as file:
+        after = dict(flatten(json.load(file)['results']))
+    for name in sorted(before.keys() & after.keys()):
+        for metric in METRICS:
+            if metric not in before[name] or metric not in after[name]:
+                continue
+            old, new = before[name][metric], after[name][metric]
+            change = (new - old) / old * 100 if old else 0
+            print(f'{name:40} {metric:15} {old:10.2f} {new:10.2f} '
+                  f'{change:+7.1f}%')
+
+
+if __name__ == '__main__':
+    main()
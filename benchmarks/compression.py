@@ -0,0 +1,66 @@
+"""Размер ответа и процессорное время на запрос при разном сжатии.
+
+Каждая страница из benchmarks.views запрашивается без сжатия, с gzip
+и с brotli (если установлен пакет brotli). Кэш очищается перед каждым
+запросом, чтобы в замер входило само сжатие, а не готовый вариант.
+
+    python -m benchmarks.compression --output compression.json
+"""
+import time
+
+from .utils import dataset_size, get_parser, report, setup_django
+from .views import get_targets
+
+ENCODINGS = {
+    'identity': '',
+    'gzip': 'gzip',
+    'br': 'br, gzip',
+}
+
+
+def measure_cpu(client, path, accept, repeat, warmup):
+    from django.core.cache import cache
+
+    size = 0
+    encoding = None
+    for _ in range(warmup):
+        client.get(path, HTTP_ACCEPT_ENCODING=accept)
+    started = time.process_time()
+    for _ in range(repeat):
+        cache.clear()
+        response = client.get(path, HTTP_ACCEPT_ENCODING=accept)
+        assert response.status_code == 200, (path, response.status_code)
+        size = len(response.content)
+        encoding = response.get('Content-Encoding', 'identity')
+    return {
+        'encoding': encoding,
+        'bytes': size,
+        'cpu_ms': (time.process_time() - started) / repeat * 1000,
+    }
+
+
+def main():
+    parser = get_parser(__doc__)
+    parser.add_argument('--only', nargs='*', help='Имена представлений.')
+    args = parser.parse_args()
+    setup_django()
+    from django.test import Client
+
+    results = {}
+    for name, (path, user) in get_targets().items():
+        if args.only and name not in args.only:
+            continue
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        results[name] = {
+            label: measure_cpu(
+                client, path, accept, args.repeat, args.warmup
+            )
+            for label, accept in ENCODINGS.items()
+        }
+    report('compression', results, args.output, dataset=dataset_size())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Рассылка server-sent events множеству простаивающих клиентов.
+
+Открывает --clients потоков /events/ в одном цикле событий, затем
+публикует --repeat постов через шину и измеряет, за сколько каждая
+публикация доходит до всех клиентов, и сколько памяти занимают
+подключения.
+
+    python -m benchmarks.events --clients 5000 --output events.json
+"""
+import asyncio
+import time
+import tracemalloc
+
+from .utils import get_parser, report, setup_django, summarize
+
+
+async def run(clients, repeat):
+    from django.conf import settings
+    from django.core.wsgi import get_wsgi_application
+    from core.asgi import ASGIHandler
+    from core.pubsub import bus
+    from posts.events import CHANNEL
+
+    application = ASGIHandler(get_wsgi_application())
+    disconnected = asyncio.Event()
+    received = asyncio.Queue()
+
+    def make_client():
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {'type': 'http.request', 'body': b''}
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message.get('body', b'').startswith(b'event:'):
+                received.put_nowait(time.perf_counter())
+
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': settings.EVENTS_PATH,
+            'query_string': b'feed=index',
+            'headers': [],
+        }
+        return application(scope, receive, send)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tasks = [asyncio.ensure_future(make_client()) for _ in range(clients)]
+    while not bus.has_subscribers(CHANNEL):
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.5)
+    memory = sum(
+        stat.size_diff
+        for stat in tracemalloc.take_snapshot().compare_to(before, 'filename')
+    )
+    tracemalloc.stop()
+
+    latencies = []
+    started = time.perf_counter()
+    for number in range(repeat):
+        published = time.perf_counter()
+        bus.publish(CHANNEL, {'id': 10 ** 9 + number, 'author_id': 0})
+        for _ in range(clients):
+            delivered = await received.get()
+        latencies.append(delivered - published)
+    elapsed = time.perf_counter() - started
+
+    disconnected.set()
+    await asyncio.gather(*tasks)
+    result = summarize(latencies, elapsed)
+    result['memory_per_client_bytes'] = memory / clients
+    return result
+
+
+def main():
+    parser = get_parser(__doc__)
+    parser.add_argument('--clients', type=int, default=1000)
+    args = parser.parse_args()
+    setup_django()
+    result = asyncio.run(run(args.clients, args.repeat))
+    report('events', {'fanout': result}, args.output, clients=args.clients)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Время загрузки воркера и его память для профилей настроек.
+
+Для каждого профиля запускается отдельный процесс: он импортирует
+yatube.wsgi (с прогревом, если он включён) и обслуживает --repeat
+запросов главной страницы. Процесс сообщает время импорта, RSS после
+загрузки и после запросов.
+
+    python -m benchmarks.startup --profiles dev bench --output startup.json
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from .utils import PROJECT_DIR, ROOT_DIR, get_parser, report
+
+
+def rss_kb():
+    # На Linux ru_maxrss уже в килобайтах.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(repeat):
+    sys.path.insert(0, PROJECT_DIR)
+    started = time.perf_counter()
+    from yatube.wsgi import application
+    import_ms = (time.perf_counter() - started) * 1000
+    boot_rss = rss_kb()
+
+    from .views import wsgi_environ
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = application(
+            wsgi_environ('/', ''), lambda status, headers: None
+        )
+        b''.join(body)
+        body.close()
+    print(json.dumps({
+        'import_ms': import_ms,
+        'boot_rss_kb': boot_rss,
+        'requests_ms': (time.perf_counter() - started) * 1000,
+        'rss_kb': rss_kb(),
+    }))
+
+
+def run_profile(profile, repeat):
+    env = dict(os.environ, YATUBE_PROFILE=profile)
+    output = subprocess.check_output(
+        [sys.executable, '-m', 'benchmarks.startup',
+         '--child', '--repeat', str(repeat)],
+        cwd=ROOT_DIR, env=env
+    )
+    return json.loads(output.decode().splitlines()[-1])
+
+
+def main():
+    parser = get_parser(__doc__)
+    parser.add_argument('--profiles', nargs='*', default=['dev', 'bench'])
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.repeat)
+        return
+    results = {
+        profile: [run_profile(profile, args.repeat) for _ in range(args.runs)]
+        for profile in args.profiles
+    }
+    report('startup', results, args.output, repeat=args.repeat)
+
+
+if __name__ == '__main__':
+    main()
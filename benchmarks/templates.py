@@ -0,0 +1,76 @@
+"""Время рендеринга posts/index.html с десятью постами.
+
+Сравнивает загрузчики проекта (core.loaders) без кэша (как при
+DEBUG = True) и под кэширующим загрузчиком после прогрева. Карточки
+постов, как на прогретом сайте, берутся из кэша (см. post_cards).
+
+    python -m benchmarks.templates --output templates.json
+"""
+from .utils import get_parser, measure, report, setup_django
+
+POSTS_ON_PAGE = 10
+
+
+def make_context():
+    from django.contrib.auth.models import AnonymousUser
+    from django.core.paginator import Paginator
+    from django.test import RequestFactory
+    from django.utils import timezone
+    from posts.models import Group, Post, User
+
+    author = User(pk=1, username='author', first_name='Лев',
+                  last_name='Толстой')
+    group = Group(pk=1, title='Группа', slug='group')
+    now = timezone.now()
+    # updated входит в ключ кэша карточки.
+    posts = [
+        Post(pk=number, text='Текст поста ' * 20, author=author,
+             group=group, pub_date=now, updated=now)
+        for number in range(1, POSTS_ON_PAGE + 1)
+    ]
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    page_obj = Paginator(posts, POSTS_ON_PAGE).get_page(1)
+    return request, {'page_obj': page_obj}
+
+
+def make_engine(cached):
+    from django.conf import settings
+    from django.template import Engine
+    from django.template.backends.django import get_installed_libraries
+
+    loaders = [
+        'core.loaders.FilesystemLoader',
+        'core.loaders.AppDirectoriesLoader',
+    ]
+    if cached:
+        loaders = [('django.template.loaders.cached.Loader', loaders)]
+    options = settings.TEMPLATES[0]['OPTIONS']
+    return Engine(
+        dirs=settings.TEMPLATES[0]['DIRS'],
+        loaders=loaders,
+        context_processors=options['context_processors'],
+        libraries=get_installed_libraries(),
+    )
+
+
+def main():
+    args = get_parser(__doc__).parse_args()
+    setup_django()
+    from django.template import RequestContext
+
+    request, context = make_context()
+    results = {}
+    for name, cached in (('uncached', False), ('cached', True)):
+        engine = make_engine(cached)
+
+        def render():
+            template = engine.get_template('posts/index.html')
+            template.render(RequestContext(request, context))
+
+        results[name] = measure(render, args.repeat, args.warmup)
+    report('templates', results, args.output, posts=POSTS_ON_PAGE)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Общие помощники для бенчмарков.
+
+Модули пакета запускаются из корня репозитория:
+
+    python -m benchmarks.views --output results.json
+
+База данных берётся из настроек проекта, поэтому перед запуском её
+нужно наполнить: `python yatube/manage.py seed --scale 100k`.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(ROOT_DIR, 'yatube')
+
+
+def setup_django():
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    # Профиль без DEBUG: иначе connection.queries растёт на каждом запросе.
+    os.environ.setdefault('YATUBE_PROFILE', 'bench')
+    import django
+    django.setup()
+
+
+def get_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--output', help='Файл для JSON-результатов.')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    return parser
+
+
+def summarize(latencies, elapsed=None):
+    """Сводка по задержкам в миллисекундах."""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    result = {
+        'count': count,
+        'mean_ms': statistics.mean(ordered) * 1000,
+        'p50_ms': ordered[count // 2] * 1000,
+        'p95_ms': ordered[min(count - 1, int(count * 0.95))] * 1000,
+        'p99_ms': ordered[min(count - 1, int(count * 0.99))] * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+    if elapsed is not None:
+        result['throughput_rps'] = count / elapsed
+    return result
+
+
+def measure(func, repeat, warmup=0):
+    for _ in range(warmup):
+        func()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dataset_size():
+    from posts.models import Comment, Follow, Post, User
+    return {
+        'users': User.objects.count(),
+        'posts': Post.objects.count(),
+        'comments': Comment.objects.count(),
+        'follows': Follow.objects.count(),
+    }
+
+
+def report(name, results, output=None, **extra):
+    payload = {
+        'benchmark': name,
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        **extra,
+        'results': results,
+    }
+    text = json.dumps(payload, ensure_ascii=False, indent=2)
+    if output:
+        with open(output, 'w') as file:
+            file.write(text)
+    print(text)
+    return payload
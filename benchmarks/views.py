@@ -0,0 +1,155 @@
+"""Задержка и пропускная способность представлений posts/views.py.
+
+Каждое представление прогоняется дважды: последовательно через
+тестовый клиент Django и параллельно через WSGI-приложение
+в нескольких потоках.
+
+    python -m benchmarks.views --threads 8 --output views.json
+"""
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .utils import (
+    dataset_size, get_parser, measure, report, setup_django, summarize
+)
+
+
+def get_targets():
+    from django.db.models import Count
+    from django.urls import reverse
+    from posts.models import Group, Post, User
+
+    group = Group.objects.annotate(
+        total=Count('posts')).order_by('-total').first()
+    author = User.objects.annotate(
+        total=Count('posts')).order_by('-total').first()
+    reader = User.objects.annotate(
+        total=Count('follower')).order_by('-total').first()
+    post = Post.objects.annotate(
+        total=Count('comments')).order_by('-total').first()
+    if not all((group, author, reader, post)):
+        sys.exit('База пуста: сначала выполните `manage.py seed`.')
+    targets = {
+        'index': (reverse('posts:index'), None),
+        'index_deep_page': (reverse('posts:index') + '?page=500', None),
+        'group_posts': (
+            reverse('posts:group_list', args=(group.slug,)), None
+        ),
+        'profile': (reverse('posts:profile', args=(author.username,)), None),
+        'profile_as_reader': (
+            reverse('posts:profile', args=(author.username,)), reader
+        ),
+        'post_detail': (reverse('posts:post_detail', args=(post.pk,)), None),
+        'follow_index': (reverse('posts:follow_index'), reader),
+        'post_create_form': (reverse('posts:post_create'), author),
+        'post_edit_form': (
+            reverse('posts:post_edit', args=(post.pk,)), post.author
+        ),
+    }
+    return targets
+
+
+def session_cookie(user):
+    from django.conf import settings
+    from django.test import Client
+
+    if user is None:
+        return ''
+    client = Client()
+    client.force_login(user)
+    name = settings.SESSION_COOKIE_NAME
+    return f'{name}={client.cookies[name].value}'
+
+
+def wsgi_environ(path, cookie):
+    path, _, query = path.partition('?')
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'HTTP_COOKIE': cookie,
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+
+def run_wsgi(application, path, cookie, threads, repeat):
+    def call():
+        status = []
+        start = time.perf_counter()
+        body = application(
+            wsgi_environ(path, cookie),
+            lambda code, headers, exc_info=None: status.append(code)
+        )
+        try:
+            for _ in body:
+                pass
+        finally:
+            body.close()
+        assert status[0].startswith('200'), (path, status[0])
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        started = time.perf_counter()
+        latencies = list(executor.map(lambda _: call(), range(repeat)))
+        elapsed = time.perf_counter() - started
+    return summarize(latencies, elapsed)
+
+
+def main():
+    parser = get_parser(__doc__)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument(
+        '--cold', action='store_true',
+        help='Очищать кэш перед каждым запросом.'
+    )
+    parser.add_argument('--only', nargs='*', help='Имена представлений.')
+    args = parser.parse_args()
+    setup_django()
+
+    from django.core.cache import cache
+    from django.core.wsgi import get_wsgi_application
+    from django.test import Client
+
+    application = get_wsgi_application()
+    results = {}
+    for name, (path, user) in get_targets().items():
+        if args.only and name not in args.only:
+            continue
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+
+        def request():
+            if args.cold:
+                cache.clear()
+            response = client.get(path)
+            assert response.status_code == 200, (name, response.status_code)
+
+        results[name] = {
+            'path': path,
+            'client': measure(request, args.repeat, args.warmup),
+            'wsgi': run_wsgi(
+                application, path, session_cookie(user),
+                args.threads, args.repeat
+            ),
+        }
+    report(
+        'views', results, args.output,
+        threads=args.threads, cold=args.cold, dataset=dataset_size()
+    )
+
+
+if __name__ == '__main__':
+    main()
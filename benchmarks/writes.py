@@ -0,0 +1,80 @@
+"""Пропускная способность записи подписок и комментариев в SQLite.
+
+--threads потоков одновременно переключают подписки и оставляют
+комментарии через posts.writes.write_buffer: сначала с записью
+каждого действия отдельной транзакцией (задержка 0), затем с
+групповой записью (settings.WRITE_BUFFER_DELAY).
+
+    python -m benchmarks.writes --threads 16 --output writes.json
+"""
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .utils import dataset_size, get_parser, report, setup_django, summarize
+
+
+def run_writers(users, posts, threads, repeat):
+    from django.db import OperationalError, connection
+    from posts.models import Comment
+    from posts.writes import write_buffer
+
+    def call(number):
+        rng = random.Random(number)
+        user_id = rng.choice(users)
+        start = time.perf_counter()
+        try:
+            if number % 2:
+                write_buffer.add_comment(Comment(
+                    text='Комментарий', author_id=user_id,
+                    post_id=rng.choice(posts)
+                ))
+            elif number % 4:
+                write_buffer.follow(user_id, rng.choice(users))
+            else:
+                write_buffer.unfollow(user_id, rng.choice(users))
+        except OperationalError:
+            # database is locked: писатель не дождался блокировки.
+            return None
+        finally:
+            connection.close()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        started = time.perf_counter()
+        results = list(executor.map(call, range(repeat)))
+        elapsed = time.perf_counter() - started
+    latencies = [latency for latency in results if latency is not None]
+    summary = summarize(latencies, elapsed)
+    summary['errors'] = len(results) - len(latencies)
+    return summary
+
+
+def main():
+    parser = get_parser(__doc__)
+    parser.add_argument('--threads', type=int, default=16)
+    args = parser.parse_args()
+    setup_django()
+
+    from django.conf import settings
+    from django.test.utils import override_settings
+    from posts.models import Post, User
+
+    users = list(User.objects.values_list('pk', flat=True)[:1000])
+    posts = list(Post.objects.values_list('pk', flat=True)[:1000])
+    results = {}
+    for name, delay in (('immediate', 0),
+                        ('grouped', settings.WRITE_BUFFER_DELAY)):
+        with override_settings(WRITE_BUFFER_DELAY=delay):
+            results[name] = run_writers(
+                users, posts, args.threads, args.repeat
+            )
+    report(
+        'writes', results, args.output,
+        threads=args.threads, delay=settings.WRITE_BUFFER_DELAY,
+        dataset=dataset_size()
+    )
+
+
+if __name__ == '__main__':
+    main()
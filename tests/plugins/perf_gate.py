@@ -0,0 +1,123 @@
+"""Проверка производительности для тестов с маркером `perf`.
+
+Для каждого такого теста замеряются число SQL-запросов, пиковый объём
+выделенной памяти (tracemalloc) и время выполнения. Результаты
+сравниваются с базовой линией из файла `perf_baseline`; если тест стал
+хуже с учётом допусков, он падает.
+
+Обновить базовую линию: `pytest -m perf --perf-update`.
+"""
+import json
+import os
+import time
+import tracemalloc
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+_results = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--perf-update', action='store_true', default=False,
+        help='Перезаписать базовую линию производительности.'
+    )
+    parser.addini('perf_baseline', 'Файл с базовой линией производительности.',
+                  default='tests/perf_baseline.json')
+    parser.addini('perf_query_tolerance', 'Допустимый прирост числа запросов.',
+                  default='0')
+    parser.addini('perf_memory_tolerance', 'Допустимый относительный прирост '
+                  'пиковой памяти.', default='0.25')
+    parser.addini('perf_time_tolerance', 'Допустимый относительный прирост '
+                  'времени выполнения.', default='3.0')
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'perf: замерять запросы, память и время теста'
+    )
+
+
+def _baseline_path(config):
+    return os.path.join(str(config.rootdir), config.getini('perf_baseline'))
+
+
+def _load_baseline(config):
+    path = _baseline_path(config)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def _regressions(config, measured, expected):
+    limits = {
+        'queries': expected['queries']
+        + int(config.getini('perf_query_tolerance')),
+        'peak_kb': expected['peak_kb']
+        * (1 + float(config.getini('perf_memory_tolerance'))),
+        'wall_ms': expected['wall_ms']
+        * (1 + float(config.getini('perf_time_tolerance'))),
+    }
+    return [
+        f'{metric}: {measured[metric]:.1f} > {limit:.1f} '
+        f'(база {expected[metric]:.1f})'
+        for metric, limit in limits.items()
+        if measured[metric] > limit
+    ]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    if item.get_closest_marker('perf') is None:
+        yield
+        return
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.clear_traces()
+    else:
+        tracemalloc.start()
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        outcome = yield
+        wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    if not tracing:
+        tracemalloc.stop()
+    if outcome.excinfo is not None:
+        return
+    measured = {
+        'queries': len(queries),
+        'peak_kb': round(peak / 1024, 1),
+        'wall_ms': round(wall * 1000, 2),
+    }
+    _results[item.nodeid] = measured
+    config = item.config
+    if config.getoption('perf_update'):
+        return
+    expected = _load_baseline(config).get(item.nodeid)
+    if expected is None:
+        pytest.fail(
+            f'Нет базовой линии для {item.nodeid}, '
+            'запустите pytest с --perf-update', pytrace=False
+        )
+    problems = _regressions(config, measured, expected)
+    if problems:
+        pytest.fail(
+            'Регрессия производительности: ' + '; '.join(problems),
+            pytrace=False
+        )
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if not config.getoption('perf_update') or not _results:
+        return
+    baseline = _load_baseline(config)
+    baseline.update(_results)
+    with open(_baseline_path(config), 'w') as file:
+        json.dump(baseline, file, ensure_ascii=False, indent=2,
+                  sort_keys=True)
+        file.write('\n')
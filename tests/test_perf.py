@@ -0,0 +1,31 @@
+import pytest
+from django.core.cache import cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.perf
+class TestViewsPerformance:
+
+    def test_index(self, client, few_posts_with_group):
+        cache.clear()
+        response = client.get('/')
+        assert response.status_code == 200
+
+    def test_group_posts(self, client, few_posts_with_group):
+        response = client.get(f'/group/{few_posts_with_group.group.slug}/')
+        assert response.status_code == 200
+
+    def test_profile(self, user_client, another_user,
+                     another_few_posts_with_group_with_follower):
+        response = user_client.get(f'/profile/{another_user.username}/')
+        assert response.status_code == 200
+
+    def test_post_detail(self, client, post_with_group):
+        response = client.get(f'/posts/{post_with_group.id}/')
+        assert response.status_code == 200
+
+    def test_follow_index(self, user_client,
+                          another_few_posts_with_group_with_follower):
+        response = user_client.get('/follow/')
+        assert response.status_code == 200
@@ -0,0 +1,60 @@
+import os
+
+from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from .models import RequestProfile
+
+
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'method',
+        'path',
+        'status_code',
+        'duration',
+        'mode',
+        'trigger',
+        'created',
+        'download_link',
+    )
+    list_filter = ('mode', 'trigger')
+    search_fields = ('path',)
+    readonly_fields = [field.name for field in RequestProfile._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        urls = [
+            path(
+                '<int:profile_id>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='core_requestprofile_download',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def download_view(self, request, profile_id):
+        profile = get_object_or_404(RequestProfile, pk=profile_id)
+        if not os.path.exists(profile.file_path):
+            raise Http404
+        return FileResponse(
+            open(profile.file_path, 'rb'),
+            as_attachment=True,
+            filename=profile.filename,
+        )
+
+    def download_link(self, obj):
+        url = reverse('admin:core_requestprofile_download', args=(obj.pk,))
+        return format_html('<a href="{}">{}</a>', url, obj.filename)
+    download_link.short_description = 'Профиль'
+
+
+admin.site.register(RequestProfile, RequestProfileAdmin)
@@ -0,0 +1,205 @@
+import asyncio
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Сколько частей потокового ответа ждут отправки клиенту.
+RESPONSE_QUEUE_SIZE = 8
+
+
+def build_environ(scope, body):
+    path = scope['path'].encode('utf-8').decode('latin-1')
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    protocol = scope.get('http_version', '1.1')
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': path,
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f'HTTP/{protocol}',
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', ()):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        if name in environ:
+            # HTTP/2 передаёт cookie несколькими заголовками, и склеиваются
+            # они через '; ', как в самом заголовке.
+            separator = '; ' if name == 'HTTP_COOKIE' else ','
+            value = f'{environ[name]}{separator}{value}'
+        environ[name] = value
+    return environ
+
+
+class ASGIHandler:
+    """ASGI-приложение поверх WSGI-приложения Django.
+
+    В Django 2.2 нет асинхронных представлений, поэтому запрос
+    выполняется в пуле потоков, а цикл событий читает тело запроса
+    и отдаёт ответ по частям. Ответ читается и закрывается в том же
+    потоке, что и выполнялся: close() закрывает соединения с базой,
+    открытые этим потоком. Обычный ответ уже в памяти, и поток
+    освобождается сразу; потоковый ответ держит поток, пока клиент
+    не примет всё, кроме последних RESPONSE_QUEUE_SIZE частей. Число
+    одновременно работающих представлений ограничено ASGI_THREADS.
+
+    ASGI_STREAMS сопоставляет пути асинхронным обработчикам долгих
+    соединений: они работают в цикле событий, минуя Django, и получают
+    run для вызова синхронного кода в пуле.
+    """
+
+    def __init__(self, wsgi_application, max_workers=None, streams=None):
+        self.wsgi_application = wsgi_application
+        if streams is None:
+            streams = {
+                path: import_string(handler)
+                for path, handler in settings.ASGI_STREAMS.items()
+            }
+        self.streams = streams
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.ASGI_THREADS,
+            thread_name_prefix='asgi'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http' and scope['path'] in self.streams:
+            await self.streams[scope['path']](scope, receive, send, self.run)
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        else:
+            raise ValueError(f'Unsupported scope type {scope["type"]!r}')
+
+    async def run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if settings.WARMUP:
+                    from .warmup import warmup
+                    await self.run(warmup)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        body = tempfile.SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        )
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                body.close()
+                return None
+            body.write(message.get('body', b''))
+            if not message.get('more_body', False):
+                body.seek(0)
+                return body
+
+    def call_wsgi(self, environ):
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+
+        iterable = self.wsgi_application(environ, start_response)
+        return started, iterable
+
+    def respond(self, environ, loop, queue, stopped):
+        """Выполняет запрос, читает и закрывает ответ в одном потоке.
+
+        В очередь уходят статус с заголовками, затем части тела и в конце
+        None. Если цикл событий перестал ждать ответ (клиент отключился),
+        выставляется stopped, и чтение прекращается.
+        """
+        def put(message):
+            asyncio.run_coroutine_threadsafe(
+                queue.put(message), loop
+            ).result()
+
+        try:
+            started, iterable = self.call_wsgi(environ)
+            try:
+                put(started)
+                for chunk in iterable:
+                    if stopped.is_set():
+                        break
+                    if chunk:
+                        put(chunk)
+            finally:
+                close = getattr(iterable, 'close', None)
+                if close is not None:
+                    close()
+        finally:
+            put(None)
+
+    async def http(self, scope, receive, send):
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        environ = build_environ(scope, body)
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=RESPONSE_QUEUE_SIZE)
+        stopped = threading.Event()
+        task = loop.run_in_executor(
+            self.executor, self.respond, environ, loop, queue, stopped
+        )
+        finished = False
+        try:
+            started = await queue.get()
+            if started is None:
+                finished = True
+                await task
+                return
+            await send({
+                'type': 'http.response.start',
+                'status': started['status'],
+                'headers': started['headers'],
+            })
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    finished = True
+                    break
+                await send({
+                    'type': 'http.response.body',
+                    'body': chunk,
+                    'more_body': True,
+                })
+            await send({'type': 'http.response.body', 'body': b''})
+            await task
+        finally:
+            if not finished:
+                # Поток ждёт места в очереди: забираем всё до конца,
+                # чтобы он закрыл ответ и освободился.
+                stopped.set()
+                while await queue.get() is not None:
+                    pass
+                await asyncio.wait((task,))
+            body.close()
@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.CONCURRENT_WORKERS, thread_name_prefix='queries'
+)
+
+
+def _call_in_thread(func):
+    try:
+        return func()
+    finally:
+        connections.close_all()
+
+
+def gather(*funcs):
+    """Выполняет независимые функции с запросами к базе параллельно.
+
+    Каждая функция работает в своём потоке со своим соединением.
+    При выключенном CONCURRENT_QUERIES функции выполняются по очереди:
+    так тесты видят данные незавершённой транзакции.
+    """
+    if not settings.CONCURRENT_QUERIES:
+        return [func() for func in funcs]
+    futures = [_executor.submit(_call_in_thread, func) for func in funcs]
+    return [future.result() for future in futures]
+
+
+def submit(func, *args):
+    """Фоновая работа, результат которой запросу не нужен."""
+    if not settings.CONCURRENT_QUERIES:
+        return func(*args)
+    _executor.submit(_call_in_thread, lambda: func(*args))
@@ -0,0 +1,36 @@
+import hashlib
+
+from django.conf import settings
+
+from .versions import get_version
+
+# Версия данных, видимых только одному пользователю (например, счётчика
+# уведомлений в шапке).
+USER_VERSION = 'user:{}'
+# Версия того, что о пользователе видят другие (имени), по username.
+PROFILE_VERSION = 'auth.user:{}'
+
+
+def make_etag(request, *parts):
+    """ETag страницы из версий данных и того, что зависит от посетителя.
+
+    В страницу попадают имя пользователя и CSRF-токен формы, поэтому
+    в метку входят id пользователя, версия его личных данных и значение
+    CSRF-куки, а также полный путь с номером страницы.
+    """
+    user = 0
+    if request.user.is_authenticated:
+        user = request.user.pk
+        parts += (get_version(USER_VERSION.format(user)),)
+    csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+    source = ':'.join(
+        str(part) for part in (*parts, user, csrf, request.get_full_path())
+    )
+    return hashlib.md5(source.encode()).hexdigest()
+
+
+def versions_etag(*names):
+    """etag_func для condition(), зависящий только от версий `names`."""
+    def etag_func(request, *args, **kwargs):
+        return make_etag(request, *(get_version(name) for name in names))
+    return etag_func
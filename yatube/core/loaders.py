@@ -0,0 +1,48 @@
+import re
+
+from django.conf import settings
+from django.template.loaders import app_directories, filesystem
+
+PRESERVED_RE = re.compile(
+    r'<(pre|textarea)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL
+)
+INDENT_RE = re.compile(r'\n\s+')
+
+
+def minify_html(source):
+    """Убирает отступы и пустые строки из исходника шаблона.
+
+    Перевод строки на месте отступа сохраняется, поэтому пробелы между
+    строчными элементами не пропадают. Содержимое <pre> и <textarea>
+    не меняется.
+    """
+    result = []
+    position = 0
+    for match in PRESERVED_RE.finditer(source):
+        result.append(INDENT_RE.sub('\n', source[position:match.start()]))
+        result.append(match.group())
+        position = match.end()
+    result.append(INDENT_RE.sub('\n', source[position:]))
+    return ''.join(result).strip()
+
+
+class MinifyMixin:
+    """Сжимает HTML-шаблоны один раз, при загрузке исходника.
+
+    Вместе с кэширующим загрузчиком это происходит при компиляции
+    шаблона, а не на каждый ответ.
+    """
+
+    def get_contents(self, origin):
+        contents = super().get_contents(origin)
+        if settings.TEMPLATES_MINIFY and origin.name.endswith('.html'):
+            return minify_html(contents)
+        return contents
+
+
+class FilesystemLoader(MinifyMixin, filesystem.Loader):
+    pass
+
+
+class AppDirectoriesLoader(MinifyMixin, app_directories.Loader):
+    pass
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from core.profiler import make_token
+
+
+class Command(BaseCommand):
+    help = 'Выдаёт токен для заголовка X-Profile.'
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_token())
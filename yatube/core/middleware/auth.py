@@ -0,0 +1,60 @@
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.functional import SimpleLazyObject
+
+_users = {}
+_lock = threading.Lock()
+
+
+def get_user(request):
+    """Пользователь сессии из кэша процесса.
+
+    Ключ — id пользователя и хэш авторизации из сессии, поэтому запись
+    проверяется тем же хэшем, что и в auth.get_user. Сохранение
+    пользователя сбрасывает его записи (forget_user), а в других
+    процессах они живут не дольше USER_CACHE_TIMEOUT.
+    """
+    user_id = request.session.get(auth.SESSION_KEY)
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if user_id is None or session_hash is None:
+        return auth.get_user(request)
+    key = (str(user_id), session_hash)
+    entry = _users.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return copy.copy(entry[1])
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        with _lock:
+            if len(_users) >= settings.USER_CACHE_SIZE:
+                _users.clear()
+            _users[key] = (
+                time.monotonic() + settings.USER_CACHE_TIMEOUT,
+                copy.copy(user),
+            )
+    return user
+
+
+def forget_user(user_id):
+    user_id = str(user_id)
+    with _lock:
+        for key in [key for key in _users if key[0] == user_id]:
+            del _users[key]
+
+
+def get_cached_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = get_user(request)
+    return request._cached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware без запроса пользователя к базе."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
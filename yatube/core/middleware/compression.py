@@ -0,0 +1,120 @@
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+re_accepts_br = re.compile(r'\bbr\b')
+re_accepts_gzip = re.compile(r'\bgzip\b')
+
+COMPRESSED_KEY = 'compressed:{}:{}'
+# Форматы, которые уже сжаты: повторное сжатие тратит время впустую.
+INCOMPRESSIBLE_TYPES = (
+    'image/', 'audio/', 'video/', 'font/woff', 'application/zip',
+    'application/gzip', 'application/x-gzip', 'application/x-bzip2',
+    'application/x-7z-compressed', 'application/x-rar-compressed',
+)
+# Исключения из INCOMPRESSIBLE_TYPES: текстовые форматы.
+COMPRESSIBLE_TYPES = ('image/svg+xml',)
+
+
+def brotli_sequence(sequence):
+    compressor = brotli.Compressor(
+        quality=settings.COMPRESSION_BROTLI_QUALITY
+    )
+    for item in sequence:
+        data = compressor.process(item) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+ENCODERS = {
+    'br': (
+        lambda content: brotli.compress(
+            content, quality=settings.COMPRESSION_BROTLI_QUALITY
+        ),
+        brotli_sequence,
+    ),
+    'gzip': (compress_string, compress_sequence),
+}
+
+
+def is_compressible(content_type):
+    media_type = content_type.split(';')[0].strip().lower()
+    return (
+        media_type in COMPRESSIBLE_TYPES
+        or not media_type.startswith(INCOMPRESSIBLE_TYPES)
+    )
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Сжимает ответы brotli или gzip, смотря что принимает клиент.
+
+    brotli используется, только если установлен пакет `brotli`.
+    Сжатое тело ответа с ETag кэшируется на COMPRESSION_CACHE_TIMEOUT:
+    ETag однозначно описывает страницу, поэтому повторный запрос той же
+    страницы отдаёт готовый вариант и не тратит время на сжатие.
+    """
+
+    def get_encoding(self, request):
+        accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and re_accepts_br.search(accept):
+            return 'br'
+        if re_accepts_gzip.search(accept):
+            return 'gzip'
+        return None
+
+    def compress(self, encoding, response):
+        compress_content = ENCODERS[encoding][0]
+        etag = response.get('ETag')
+        if not etag or response.status_code != 200:
+            return compress_content(response.content)
+        key = COMPRESSED_KEY.format(encoding, etag)
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = compress_content(response.content)
+            cache.set(key, compressed, settings.COMPRESSION_CACHE_TIMEOUT)
+        return compressed
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        if not is_compressible(response.get('Content-Type', '')):
+            return response
+        # Vary нужен и несжатым 304 и коротким ответам: другой вариант
+        # того же адреса может прийти сжатым.
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if response.status_code == 304:
+            return response
+        if not response.streaming and len(response.content) < 200:
+            return response
+        encoding = self.get_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            compress_stream = ENCODERS[encoding][1]
+            response.streaming_content = compress_stream(
+                response.streaming_content
+            )
+            del response['Content-Length']
+        else:
+            compressed = self.compress(encoding, response)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,51 @@
+import itertools
+import time
+
+from django.conf import settings
+
+from ..profiler import check_token, get_collector, store
+
+_request_counter = itertools.count(1)
+
+
+class ProfilerMiddleware:
+    """Профилирует отдельные запросы вместе с рендерингом шаблонов.
+
+    Запрос профилируется, если сотрудник передал параметр
+    `PROFILER_QUERY_PARAM`, если пришёл заголовок `X-Profile`
+    с подписанным токеном или если запрос попал в выборку
+    1 из `PROFILER_SAMPLE_RATE`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def get_trigger(self, request):
+        if settings.PROFILER_QUERY_PARAM in request.GET:
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_staff:
+                return 'param'
+        token = request.META.get('HTTP_X_PROFILE')
+        if token and check_token(token):
+            return 'header'
+        rate = settings.PROFILER_SAMPLE_RATE
+        if rate and next(_request_counter) % rate == 0:
+            return 'sample'
+        return None
+
+    def __call__(self, request):
+        trigger = self.get_trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+        mode = settings.PROFILER_MODE
+        collector = get_collector(mode)
+        start = time.perf_counter()
+        collector.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            collector.stop()
+        duration = time.perf_counter() - start
+        profile = store(collector, request, response, duration, mode, trigger)
+        response['X-Profile-Id'] = str(profile.pk)
+        return response
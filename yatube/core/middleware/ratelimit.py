@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.shortcuts import render
+
+from ..ratelimit import parse_rate, rate_limiter
+
+
+def client_ip(request):
+    """IP клиента с учётом TRUSTED_PROXIES обратных прокси.
+
+    Каждый прокси дописывает в X-Forwarded-For адрес, с которого к нему
+    пришёл запрос, поэтому клиент — TRUSTED_PROXIES-й адрес с конца.
+    Более ранние адреса клиент может подставить сам.
+    """
+    proxies = settings.TRUSTED_PROXIES
+    forwarded = [
+        address.strip()
+        for address in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+        if address.strip()
+    ]
+    if proxies and len(forwarded) >= proxies:
+        return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR')
+
+
+class RateLimitMiddleware:
+    """Ограничивает частоту запросов к представлениям из RATELIMITS.
+
+    Правило задаётся для имени URL: частота и методы запроса.
+    Авторизованные пользователи ограничиваются по id, анонимные —
+    по IP-адресу клиента (см. client_ip). При превышении отдаётся 429
+    с Retry-After.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def get_key(self, request, view_name):
+        if request.user.is_authenticated:
+            return f'{view_name}:user:{request.user.pk}'
+        return f'{view_name}:ip:{client_ip(request)}'
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not settings.RATELIMIT_ENABLED:
+            return None
+        view_name = request.resolver_match.view_name
+        rule = settings.RATELIMITS.get(view_name)
+        if rule is None or request.method not in rule['methods']:
+            return None
+        limit, period = parse_rate(rule['rate'])
+        retry_after = rate_limiter.hit(
+            self.get_key(request, view_name), limit, period
+        )
+        if retry_after is None:
+            return None
+        response = render(
+            request,
+            'core/429.html',
+            {'retry_after': retry_after},
+            status=HTTPStatus.TOO_MANY_REQUESTS
+        )
+        response['Retry-After'] = str(retry_after)
+        return response
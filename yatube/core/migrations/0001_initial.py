@@ -0,0 +1,33 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=2048, verbose_name='Адрес')),
+                ('method', models.CharField(max_length=10, verbose_name='Метод')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='Код ответа')),
+                ('duration', models.FloatField(verbose_name='Длительность, мс')),
+                ('mode', models.CharField(choices=[('sample', 'Сэмплирование стека'), ('cprofile', 'cProfile')], max_length=10, verbose_name='Режим')),
+                ('trigger', models.CharField(max_length=10, verbose_name='Причина')),
+                ('filename', models.CharField(max_length=255, verbose_name='Файл')),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата')),
+            ],
+            options={
+                'verbose_name': 'Профиль запроса',
+                'verbose_name_plural': 'Профили запросов',
+                'ordering': ['-created'],
+            },
+        ),
+    ]
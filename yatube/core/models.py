@@ -0,0 +1,58 @@
+import os
+
+from django.conf import settings
+from django.db import models
+
+
+class RequestProfile(models.Model):
+    MODE_SAMPLE = 'sample'
+    MODE_CPROFILE = 'cprofile'
+    MODE_CHOICES = (
+        (MODE_SAMPLE, 'Сэмплирование стека'),
+        (MODE_CPROFILE, 'cProfile'),
+    )
+
+    path = models.CharField(
+        verbose_name='Адрес',
+        max_length=2048
+    )
+    method = models.CharField(
+        verbose_name='Метод',
+        max_length=10
+    )
+    status_code = models.PositiveSmallIntegerField(
+        verbose_name='Код ответа'
+    )
+    duration = models.FloatField(
+        verbose_name='Длительность, мс'
+    )
+    mode = models.CharField(
+        verbose_name='Режим',
+        max_length=10,
+        choices=MODE_CHOICES
+    )
+    trigger = models.CharField(
+        verbose_name='Причина',
+        max_length=10
+    )
+    filename = models.CharField(
+        verbose_name='Файл',
+        max_length=255
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата',
+        auto_now_add=True,
+        db_index=True
+    )
+
+    class Meta:
+        ordering = ['-created']
+        verbose_name = 'Профиль запроса'
+        verbose_name_plural = 'Профили запросов'
+
+    def __str__(self):
+        return f'{self.method} {self.path}'
+
+    @property
+    def file_path(self):
+        return os.path.join(settings.PROFILER_ROOT, self.filename)
@@ -0,0 +1,324 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+from .versions import get_version
+
+ELLIPSIS = None
+
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix='paginator-count'
+)
+
+
+def get_elided_page_range(number, num_pages, on_each_side=2, on_ends=1):
+    """Номера страниц вокруг текущей и по краям, пропуски — ELLIPSIS.
+
+    Повторяет Paginator.get_elided_page_range из Django 3.2.
+    """
+    if num_pages <= (on_each_side + on_ends) * 2:
+        return list(range(1, num_pages + 1))
+    pages = []
+    if number > 1 + on_each_side + on_ends + 1:
+        pages.extend(range(1, on_ends + 1))
+        pages.append(ELLIPSIS)
+        pages.extend(range(number - on_each_side, number + 1))
+    else:
+        pages.extend(range(1, number + 1))
+    if number < num_pages - on_each_side - on_ends - 1:
+        pages.extend(range(number + 1, number + on_each_side + 1))
+        pages.append(ELLIPSIS)
+        pages.extend(range(num_pages - on_ends + 1, num_pages + 1))
+    else:
+        pages.extend(range(number + 1, num_pages + 1))
+    return pages
+
+
+def query_digest(queryset):
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        # Например, filter(pk__in=[]): запрос к базе не выполняется.
+        sql, params = 'empty', ()
+    return hashlib.md5(f'{sql}{params}'.encode()).hexdigest()
+
+
+def count_cache_key(queryset, dependencies=()):
+    """Ключ зависит от SQL запроса и версий данных задействованных моделей."""
+    digest = query_digest(queryset)
+    versions = '.'.join(
+        get_version(name)
+        for name in (queryset.model._meta.label_lower, *dependencies)
+    )
+    return f'paginator_count:{versions}:{digest}'
+
+
+def cached_count(queryset, dependencies=()):
+    """COUNT(*) запроса из кэша до изменения версий его моделей."""
+    key = count_cache_key(queryset, dependencies)
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.PAGINATOR_COUNT_TIMEOUT)
+    return count
+
+
+class ChainedQuerySets:
+    """Несколько querysets подряд как одна последовательность.
+
+    Подходит для Paginator: число объектов каждой части берётся из
+    кэша, а срез читает только те части, в которые попадает.
+    """
+
+    def __init__(self, *querysets):
+        self.querysets = querysets
+
+    @cached_property
+    def counts(self):
+        return [cached_count(queryset) for queryset in self.querysets]
+
+    def count(self):
+        return sum(self.counts)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        stop = self.count() if index.stop is None else index.stop
+        objects = []
+        offset = 0
+        for queryset, count in zip(self.querysets, self.counts):
+            low, high = max(start - offset, 0), min(stop - offset, count)
+            if low < high:
+                objects.extend(queryset[low:high])
+            offset += count
+        return objects
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор, который не выполняет COUNT(*) на каждой странице.
+
+    Число объектов кэшируется на PAGINATOR_COUNT_TIMEOUT секунд
+    и сбрасывается при изменении версии модели (см. core.versions).
+    Если запрос зависит от других моделей, их метки передаются
+    в `dependencies`.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True, dependencies=()):
+        super().__init__(object_list, per_page, orphans,
+                         allow_empty_first_page)
+        self.dependencies = dependencies
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        return cached_count(self.object_list, self.dependencies)
+
+
+ESTIMATE_QUERIES = {
+    'postgresql': (
+        'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+    ),
+    'mysql': (
+        'SELECT table_rows FROM information_schema.tables '
+        'WHERE table_schema = DATABASE() AND table_name = %s'
+    ),
+    'sqlite': 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+}
+
+
+def where_sql(query, connection):
+    compiler = query.get_compiler(connection=connection)
+    try:
+        return query.where.as_sql(compiler, connection)
+    except EmptyResultSet:
+        return None
+
+
+def estimate_count(queryset):
+    """Оценка числа строк из статистики планировщика.
+
+    Работает только для запросов без фильтров, кроме фильтра одного из
+    менеджеров модели (мягко удалённых строк мало, а оценка и так
+    приблизительна). Для SQLite статистика появляется после `ANALYZE`.
+    Если оценки нет, возвращает None.
+    """
+    connection = connections[queryset.db]
+    where = where_sql(queryset.query, connection)
+    if queryset.query.distinct or all(
+        where != where_sql(manager.all().query, connection)
+        for manager in queryset.model._meta.managers
+    ):
+        return None
+    sql = ESTIMATE_QUERIES.get(connection.vendor)
+    if sql is None:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None or row[0] is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate > 0 else None
+
+
+def _refresh_count(queryset, key, latest_key):
+    try:
+        count = queryset.count()
+        cache.set(key, count, settings.PAGINATOR_COUNT_TIMEOUT)
+        cache.set(latest_key, count, None)
+        return count
+    finally:
+        cache.delete(f'{latest_key}:lock')
+
+
+def _refresh_count_in_thread(queryset, key, latest_key):
+    try:
+        _refresh_count(queryset, key, latest_key)
+    finally:
+        connections[queryset.db].close()
+
+
+class EstimatedCountPaginator(CachedCountPaginator):
+    """Пагинатор для больших таблиц.
+
+    Пока объектов не больше PAGINATOR_EXACT_THRESHOLD, считает их точно
+    (запросом с LIMIT, поэтому подсчёт ограничен по стоимости). Для
+    больших выборок отдаёт последнее известное значение или оценку
+    планировщика, а точный COUNT(*) пересчитывает в фоновом потоке.
+    Число большой выборки не зависит от версий данных и живёт
+    PAGINATOR_COUNT_TIMEOUT секунд: новые посты не запускают пересчёт.
+    """
+    # Число — нижняя граница или оценка, а не точное значение.
+    approximate = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return len(self.object_list)
+        key = count_cache_key(self.object_list, self.dependencies)
+        count = cache.get(key)
+        if count is not None:
+            return count
+        digest = query_digest(self.object_list)
+        large_key = f'paginator_count:large:{digest}'
+        count = cache.get(large_key)
+        if count is not None:
+            return count
+        threshold = settings.PAGINATOR_EXACT_THRESHOLD
+        latest_key = f'paginator_count:latest:{digest}'
+        latest = cache.get(latest_key)
+        if latest is not None and latest > threshold:
+            return self.refresh(large_key, latest_key) or latest
+        bounded = self.object_list[:threshold + 1].count()
+        if bounded <= threshold:
+            cache.set(key, bounded, settings.PAGINATOR_COUNT_TIMEOUT)
+            cache.set(latest_key, bounded, None)
+            return bounded
+        count = self.refresh(large_key, latest_key)
+        if count is not None:
+            return count
+        self.approximate = True
+        return max(estimate_count(self.object_list) or 0, bounded)
+
+    @property
+    def count_label(self):
+        """Число объектов для шаблона: пока точного нет — «10000+»."""
+        count = self.count
+        if self.approximate:
+            return f'{settings.PAGINATOR_EXACT_THRESHOLD}+'
+        return str(count)
+
+    def refresh(self, key, latest_key):
+        """Точный пересчёт; в фоне возвращает None."""
+        queryset = self.object_list.all()
+        if not settings.PAGINATOR_ASYNC_REFRESH:
+            return _refresh_count(queryset, key, latest_key)
+        if cache.add(f'{latest_key}:lock', True, 60):
+            _refresh_executor.submit(
+                _refresh_count_in_thread, queryset, key, latest_key
+            )
+        return None
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def encode_cursor(value, pk):
+    microseconds = (value - EPOCH) // timedelta(microseconds=1)
+    return f'{microseconds}-{pk}'
+
+
+def decode_cursor(cursor):
+    try:
+        microseconds, pk = (int(part) for part in cursor.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    return EPOCH + timedelta(microseconds=microseconds), pk
+
+
+class CursorPage:
+    """Страница курсорной пагинации: без COUNT и без OFFSET."""
+
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+
+def paginate_by_cursor(queryset, cursor, per_page, field):
+    """Следующие per_page объектов после курсора в порядке (field, pk).
+
+    Курсор кодирует значение поля-даты и первичный ключ последнего
+    объекта страницы, поэтому запрос идёт по индексу (…, field).
+    Поле с минусом ('-created') задаёт обратный порядок.
+    """
+    descending = field.startswith('-')
+    field = field.lstrip('-')
+    if descending:
+        queryset = queryset.order_by(f'-{field}', '-pk')
+        after, pk_after = f'{field}__lt', 'pk__lt'
+    else:
+        queryset = queryset.order_by(field, 'pk')
+        after, pk_after = f'{field}__gt', 'pk__gt'
+    position = decode_cursor(cursor) if cursor else None
+    if position is not None:
+        value, pk = position
+        queryset = queryset.filter(
+            Q(**{after: value}) | Q(**{field: value, pk_after: pk})
+        )
+    objects = list(queryset[:per_page + 1])
+    next_cursor = None
+    if len(objects) > per_page:
+        objects = objects[:per_page]
+        last = objects[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+    return CursorPage(objects, next_cursor)
@@ -0,0 +1,117 @@
+import cProfile
+import os
+import sys
+import threading
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core import signing
+
+from .models import RequestProfile
+
+SIGNING_SALT = 'core.profiler'
+
+
+def make_token():
+    """Возвращает подписанное значение для заголовка профилирования."""
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign('profile')
+
+
+def check_token(token):
+    try:
+        value = signing.TimestampSigner(salt=SIGNING_SALT).unsign(
+            token, max_age=settings.PROFILER_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return value == 'profile'
+
+
+class StackSampler:
+    """Периодически снимает стек потока и копит свёрнутые стеки.
+
+    Результат — текст в формате «collapsed stacks» (`a;b;c 12`),
+    который понимают flamegraph.pl, speedscope и inferno.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                filename = os.path.basename(code.co_filename)
+                stack.append(
+                    f'{code.co_name} ({filename}:{code.co_firstlineno})'
+                )
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def dump(self, path):
+        with open(path, 'w') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f'{stack} {count}\n')
+
+
+class CProfileCollector:
+    """Обёртка над cProfile с тем же интерфейсом, что и у StackSampler."""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def dump(self, path):
+        self.profile.dump_stats(path)
+
+
+def get_collector(mode):
+    if mode == RequestProfile.MODE_CPROFILE:
+        return CProfileCollector()
+    return StackSampler(settings.PROFILER_INTERVAL)
+
+
+def store(collector, request, response, duration, mode, trigger):
+    """Сохраняет профиль на диск и удаляет самые старые сверх лимита."""
+    os.makedirs(settings.PROFILER_ROOT, exist_ok=True)
+    extension = 'prof' if mode == RequestProfile.MODE_CPROFILE else 'folded'
+    filename = f'{uuid.uuid4().hex}.{extension}'
+    collector.dump(os.path.join(settings.PROFILER_ROOT, filename))
+    profile = RequestProfile.objects.create(
+        path=request.get_full_path()[:2048],
+        method=request.method,
+        status_code=response.status_code,
+        duration=duration * 1000,
+        mode=mode,
+        trigger=trigger,
+        filename=filename,
+    )
+    expired = RequestProfile.objects.order_by('-created', '-pk')[
+        settings.PROFILER_MAX_PROFILES:
+    ]
+    for old in expired:
+        if os.path.exists(old.file_path):
+            os.remove(old.file_path)
+        old.delete()
+    return profile
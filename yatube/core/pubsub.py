@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+
+def _put_all(queues, message):
+    for queue in queues:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Клиент не успевает читать: сообщение для него теряется.
+            pass
+
+
+class Bus:
+    """Шина сообщений внутри процесса.
+
+    Публиковать можно из любого потока, подписчики — asyncio-очереди.
+    На каждый цикл событий за одну публикацию приходится один
+    call_soon_threadsafe, сколько бы в нём ни было подписчиков, поэтому
+    тысячи простаивающих клиентов ничего не стоят.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(lambda: defaultdict(set))
+
+    def subscribe(self, channel):
+        queue = asyncio.Queue(maxsize=settings.PUBSUB_QUEUE_SIZE)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers[channel][loop].add(queue)
+        return queue
+
+    def unsubscribe(self, channel, queue):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loops = self._subscribers[channel]
+            loops[loop].discard(queue)
+            if not loops[loop]:
+                del loops[loop]
+            if not loops:
+                del self._subscribers[channel]
+
+    def has_subscribers(self, channel):
+        return channel in self._subscribers
+
+    def publish(self, channel, message):
+        with self._lock:
+            loops = [
+                (loop, list(queues))
+                for loop, queues in self._subscribers.get(channel, {}).items()
+            ]
+        for loop, queues in loops:
+            try:
+                loop.call_soon_threadsafe(_put_all, queues, message)
+            except RuntimeError:
+                # Цикл событий уже закрыт.
+                pass
+
+
+bus = Bus()
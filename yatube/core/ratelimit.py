@@ -0,0 +1,76 @@
+import math
+import threading
+import time
+
+from django.core.cache import caches
+
+from .versions import SHARED_CACHE
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+LOCAL_BLOCKS_SIZE = 10000
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60)."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period]
+
+
+class RateLimiter:
+    """Ограничение частоты запросов по ключу.
+
+    Ведро токенов приближается скользящим окном из двух счётчиков
+    в общем кэше: у кэша есть только атомарный incr, а не чтение с
+    последующей записью. Счётчик прошлого окна учитывается с весом
+    оставшейся доли периода. Отклонённый ключ запоминается в памяти
+    процесса до конца блокировки, и следующие его запросы отклоняются
+    без обращения к кэшу.
+    """
+
+    def __init__(self):
+        self._blocked = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, period, now=None):
+        """Учитывает запрос. Возвращает None или секунды до повтора."""
+        if now is None:
+            now = time.time()
+        until = self._blocked.get(key)
+        if until is not None:
+            if until > now:
+                return math.ceil(until - now)
+            self._blocked.pop(key, None)
+
+        cache = caches[SHARED_CACHE]
+        window = int(now // period)
+        current_key = f'ratelimit:{key}:{window}'
+        previous = cache.get(f'ratelimit:{key}:{window - 1}', 0)
+        cache.add(current_key, 0, period * 2)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # Ключ вытеснен между add и incr.
+            cache.add(current_key, 1, period * 2)
+            current = 1
+        remaining = period - (now - window * period)
+        weighted = previous * remaining / period + current
+        if weighted <= limit:
+            return None
+
+        retry_after = remaining
+        if previous and current <= limit:
+            # Когда вес прошлого окна опустится до свободного места.
+            retry_after = (weighted - limit) * period / previous
+        retry_after = max(math.ceil(retry_after), 1)
+        with self._lock:
+            if len(self._blocked) >= LOCAL_BLOCKS_SIZE:
+                self._blocked.clear()
+            self._blocked[key] = now + retry_after
+        return retry_after
+
+    def clear(self):
+        with self._lock:
+            self._blocked.clear()
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .conditional import PROFILE_VERSION, USER_VERSION
+from .middleware.auth import forget_user
+from .versions import bump_version
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def forget_cached_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+def is_visible_change(created=False, update_fields=None, **kwargs):
+    """Видно ли сохранение пользователя на страницах других.
+
+    Нового пользователя ещё нигде не показывают, а при входе
+    сохраняется только last_login.
+    """
+    return not created and (
+        update_fields is None or set(update_fields) != {'last_login'}
+    )
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def bump_user_version(sender, instance, **kwargs):
+    if is_visible_change(**kwargs):
+        bump_version(
+            PROFILE_VERSION.format(instance.username),
+            USER_VERSION.format(instance.pk)
+        )
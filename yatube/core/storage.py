@@ -0,0 +1,71 @@
+import gzip
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.ico', '.json', '.txt', '.xml', '.html', '.map',
+)
+
+
+def compress_variants(content):
+    """Сжатые варианты файла: (суффикс, содержимое)."""
+    yield '.gz', gzip.compress(content, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', brotli.compress(content, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэширует имена статики и кладёт рядом .gz и .br варианты.
+
+    Сжатие делается один раз в collectstatic, а `{% static %}` берёт
+    адреса из манифеста, загруженного в память при старте, и запоминает
+    уже вычисленные URL.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._urls = {}
+        self._immutable_names = None
+
+    def post_process(self, paths, dry_run=False, **options):
+        self._urls = {}
+        self._immutable_names = None
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                yield from self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        for suffix, compressed in compress_variants(content):
+            if len(compressed) >= len(content):
+                continue
+            compressed_name = name + suffix
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
+            yield name, compressed_name, True
+
+    def url(self, name, force=False):
+        if settings.DEBUG or force:
+            return super().url(name, force)
+        url = self._urls.get(name)
+        if url is None:
+            url = self._urls[name] = super().url(name)
+        return url
+
+    def is_immutable(self, name):
+        """Имя с хэшем содержимого: файл под ним никогда не меняется."""
+        if self._immutable_names is None:
+            self._immutable_names = set(self.hashed_files.values())
+        return name in self._immutable_names
@@ -0,0 +1,16 @@
+from django import template
+
+from ..paginator import get_elided_page_range
+
+register = template.Library()
+
+
+@register.simple_tag
+def page_window(page_obj, on_each_side=2, on_ends=1):
+    """Ограниченный список номеров страниц; None означает пропуск."""
+    return get_elided_page_range(
+        page_obj.number,
+        page_obj.paginator.num_pages,
+        on_each_side=on_each_side,
+        on_ends=on_ends,
+    )
@@ -0,0 +1,191 @@
+import asyncio
+import threading
+from unittest import mock
+
+from django.core.wsgi import get_wsgi_application
+from django.test import (
+    SimpleTestCase, TransactionTestCase, override_settings
+)
+
+from posts.models import Post, User
+from .. import concurrent
+from ..asgi import ASGIHandler, build_environ
+from ..concurrent import gather, submit
+
+
+def echo_application(environ, start_response):
+    start_response('201 Created', [('Content-Type', 'text/plain')])
+    body = environ['wsgi.input'].read()
+    return [
+        environ['REQUEST_METHOD'].encode(),
+        environ['PATH_INFO'].encode('latin-1'),
+        b'',
+        body,
+    ]
+
+
+class StreamingResponse:
+    """Потоковый ответ, запоминающий потоки чтения и закрытия."""
+
+    def __init__(self, size):
+        self.size = size
+        self.threads = set()
+        self.closed = False
+
+    def __call__(self, environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return self
+
+    def __iter__(self):
+        for number in range(self.size):
+            self.threads.add(threading.get_ident())
+            yield str(number).encode()
+
+    def close(self):
+        self.threads.add(threading.get_ident())
+        self.closed = True
+
+
+def request(application, path, method='GET', body=b'', headers=()):
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': b'',
+        'headers': list(headers),
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 1234),
+    }
+    messages = [{'type': 'http.request', 'body': body}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    return sent
+
+
+class ASGIHandlerTests(SimpleTestCase):
+    def test_wsgi_response_is_streamed(self):
+        """Ответ WSGI-приложения отдаётся по частям."""
+        sent = request(
+            ASGIHandler(echo_application, max_workers=2),
+            '/путь/', method='POST', body=b'data'
+        )
+        self.assertEqual(sent[0]['status'], 201)
+        self.assertIn((b'content-type', b'text/plain'), sent[0]['headers'])
+        self.assertEqual(
+            [message['body'] for message in sent[1:]],
+            [b'POST', '/путь/'.encode(), b'data', b'']
+        )
+
+    def test_response_is_read_and_closed_in_one_thread(self):
+        """Потоковый ответ читается и закрывается в одном потоке."""
+        response = StreamingResponse(50)
+        sent = request(ASGIHandler(response, max_workers=4), '/')
+        self.assertEqual(len(sent), 52)
+        self.assertTrue(response.closed)
+        self.assertEqual(len(response.threads), 1)
+
+    def test_response_is_closed_after_disconnect(self):
+        """Если отправка клиенту оборвалась, ответ всё равно закрывается."""
+        response = StreamingResponse(1000)
+        scope = {'type': 'http', 'method': 'GET', 'path': '/'}
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                raise OSError('disconnected')
+
+        with self.assertRaises(OSError):
+            asyncio.run(
+                ASGIHandler(response, max_workers=2)(scope, receive, send)
+            )
+        self.assertTrue(response.closed)
+
+    def test_headers_are_translated(self):
+        """Заголовки попадают в environ по правилам WSGI."""
+        environ = build_environ({
+            'method': 'GET',
+            'path': '/',
+            'headers': [
+                (b'content-type', b'text/html'),
+                (b'accept', b'text/html'),
+                (b'accept', b'*/*'),
+                (b'cookie', b'sessionid=abc'),
+                (b'cookie', b'csrftoken=def'),
+            ],
+        }, None)
+        self.assertEqual(environ['CONTENT_TYPE'], 'text/html')
+        self.assertEqual(environ['HTTP_ACCEPT'], 'text/html,*/*')
+        self.assertEqual(
+            environ['HTTP_COOKIE'], 'sessionid=abc; csrftoken=def'
+        )
+
+    def test_django_page(self):
+        """Страница Django открывается через ASGI."""
+        sent = request(
+            ASGIHandler(get_wsgi_application(), max_workers=2),
+            '/about/author/'
+        )
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn('Об авторе'.encode(), b''.join(
+            message.get('body', b'') for message in sent[1:]
+        ))
+
+
+class GatherTests(SimpleTestCase):
+    def test_sequential_without_concurrent_queries(self):
+        """Без CONCURRENT_QUERIES функции выполняются в текущем потоке."""
+        current = threading.current_thread().name
+        self.assertEqual(
+            gather(lambda: threading.current_thread().name), [current]
+        )
+
+    @override_settings(CONCURRENT_QUERIES=True)
+    def test_functions_run_in_pool(self):
+        """Функции выполняются в пуле, результаты идут по порядку."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait(value):
+            barrier.wait()
+            return value
+
+        self.assertEqual(gather(lambda: wait(1), lambda: wait(2)), [1, 2])
+
+
+@override_settings(CONCURRENT_QUERIES=True)
+class ConcurrentQueriesTests(TransactionTestCase):
+    def test_thread_connections_are_closed(self):
+        """Запросы идут в потоках пула, соединения потом закрываются."""
+        Post.objects.create(
+            author=User.objects.create_user(username='author'), text='Пост'
+        )
+        with mock.patch.object(
+            concurrent.connections, 'close_all'
+        ) as close_all:
+            result = gather(
+                lambda: Post.objects.count(),
+                lambda: threading.current_thread().name,
+            )
+        self.assertEqual(result[0], 1)
+        self.assertTrue(result[1].startswith('queries'))
+        self.assertEqual(close_all.call_count, 2)
+
+    def test_submit_runs_in_pool(self):
+        done = threading.Event()
+        threads = []
+
+        def work():
+            threads.append(threading.current_thread().name)
+            done.set()
+
+        submit(work)
+        self.assertTrue(done.wait(5))
+        self.assertTrue(threads[0].startswith('queries'))
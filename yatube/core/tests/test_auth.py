@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import User
+
+
+def auth_queries(queries):
+    return [
+        query['sql'] for query in queries
+        if 'FROM "django_session"' in query['sql']
+        or '"auth_user"."id" = ' in query['sql']
+    ]
+
+
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db'
+)
+class CachedAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reader')
+        self.client.force_login(self.user)
+        self.url = reverse('posts:follow_index')
+
+    def test_steady_state_has_no_auth_queries(self):
+        """Повторный запрос не читает из базы ни сессию, ни пользователя."""
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(auth_queries(context.captured_queries), [])
+
+    def test_user_changes_are_picked_up(self):
+        """Изменение пользователя сбрасывает его запись в кэше."""
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_password_change_logs_out(self):
+        """После смены пароля старая сессия перестаёт действовать."""
+        self.client.get(self.url)
+        self.user.set_password('new-password')
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
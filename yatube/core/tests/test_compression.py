@@ -0,0 +1,115 @@
+import gzip
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import (
+    FileResponse, HttpResponse, HttpResponseNotModified,
+    StreamingHttpResponse
+)
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..loaders import minify_html
+from ..middleware import compression
+from ..middleware.compression import CompressionMiddleware
+
+PAGE = '<p>Текст страницы</p>\n' * 50
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get(
+            '/', HTTP_ACCEPT_ENCODING='gzip, deflate, br'
+        )
+
+    def process(self, response, request=None):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(request or self.request)
+
+    @mock.patch.object(compression, 'brotli', None)
+    def test_gzip_without_brotli(self):
+        """Без пакета brotli ответ сжимается gzip."""
+        response = self.process(HttpResponse(PAGE))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content).decode(), PAGE)
+
+    def test_not_accepted(self):
+        """Клиент без Accept-Encoding получает несжатый ответ."""
+        response = self.process(HttpResponse(PAGE), RequestFactory().get('/'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    @mock.patch.object(compression, 'brotli', None)
+    def test_streaming(self):
+        """Потоковый ответ сжимается по частям."""
+        response = self.process(StreamingHttpResponse(iter([PAGE] * 3)))
+        body = b''.join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body).decode(), PAGE * 3)
+
+    @mock.patch.object(compression, 'brotli', None)
+    def test_compressed_variant_is_cached_by_etag(self):
+        """Ответ с тем же ETag не сжимается повторно."""
+        first = HttpResponse(PAGE)
+        first['ETag'] = '"page"'
+        self.process(first)
+        second = HttpResponse(PAGE)
+        second['ETag'] = '"page"'
+        compress = mock.Mock()
+        encoders = {'gzip': (compress, compression.compress_sequence)}
+        with mock.patch.dict(compression.ENCODERS, encoders):
+            response = self.process(second)
+        compress.assert_not_called()
+        self.assertEqual(response['ETag'], 'W/"page"')
+        self.assertEqual(gzip.decompress(response.content).decode(), PAGE)
+
+    def test_compressed_formats_are_skipped(self):
+        """Картинки и архивы отдаются как есть, SVG сжимается."""
+        for content_type in ('image/png', 'font/woff2', 'application/zip'):
+            with self.subTest(content_type=content_type):
+                response = self.process(FileResponse(
+                    iter([b'\x89PNG' * 100]), content_type=content_type
+                ))
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertFalse(response.has_header('Vary'))
+        response = self.process(
+            HttpResponse(PAGE, content_type='image/svg+xml')
+        )
+        self.assertTrue(response.has_header('Content-Encoding'))
+
+    def test_vary_on_not_modified_and_short_responses(self):
+        """304 и короткие ответы тоже получают Vary: Accept-Encoding."""
+        for response in (HttpResponseNotModified(), HttpResponse('<p></p>')):
+            with self.subTest(status=response.status_code):
+                response = self.process(response)
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+
+class MinifyHtmlTests(SimpleTestCase):
+    def test_indentation_is_removed(self):
+        """Отступы и пустые строки убираются, переводы строк остаются."""
+        source = '<ul>\n    <li>\n\n      {{ post }}\n    </li>\n</ul>\n'
+        self.assertEqual(
+            minify_html(source), '<ul>\n<li>\n{{ post }}\n</li>\n</ul>'
+        )
+
+    def test_preformatted_text_is_kept(self):
+        """Содержимое <pre> и <textarea> не меняется."""
+        source = (
+            '<div>\n  <pre>\n    код\n  </pre>\n'
+            '  <textarea>\n  x</textarea>'
+        )
+        self.assertEqual(
+            minify_html(source),
+            '<div>\n<pre>\n    код\n  </pre>\n<textarea>\n  x</textarea>'
+        )
+
+    @override_settings(TEMPLATES_MINIFY=True)
+    def test_loader_minifies_templates(self):
+        """Загрузчик отдаёт шаблоны уже без отступов."""
+        from django.template import engines
+
+        engine = engines['django'].engine
+        loader = engine.template_loaders[0]
+        template = loader.get_template('posts/includes/paginator.html')
+        self.assertNotIn('\n  ', template.source)
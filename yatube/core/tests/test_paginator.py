@@ -0,0 +1,118 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from .. import paginator as paginator_module
+from ..paginator import (
+    ELLIPSIS, CachedCountPaginator, EstimatedCountPaginator,
+    estimate_count, get_elided_page_range
+)
+from posts.models import Post, User
+
+
+class ElidedPageRangeTests(TestCase):
+    def test_short_range_is_not_elided(self):
+        """Короткий список страниц выводится целиком."""
+        self.assertEqual(get_elided_page_range(2, 5), [1, 2, 3, 4, 5])
+
+    def test_long_range_is_elided(self):
+        """Для длинного списка выводятся края и соседи текущей страницы."""
+        cases = {
+            1: [1, 2, 3, ELLIPSIS, 10000],
+            500: [1, ELLIPSIS, 498, 499, 500, 501, 502, ELLIPSIS, 10000],
+            10000: [1, ELLIPSIS, 9998, 9999, 10000],
+        }
+        for number, expected in cases.items():
+            with self.subTest(number=number):
+                self.assertEqual(
+                    get_elided_page_range(number, 10000), expected
+                )
+
+
+class CachedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+
+    def setUp(self):
+        cache.clear()
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Пост {number}')
+            for number in range(3)
+        )
+
+    def test_count_is_cached(self):
+        """Повторный подсчёт не выполняет COUNT."""
+        self.assertEqual(CachedCountPaginator(Post.objects.all(), 2).count, 3)
+        with self.assertNumQueries(0):
+            paginator = CachedCountPaginator(Post.objects.all(), 2)
+            self.assertEqual(paginator.count, 3)
+
+    def test_count_is_reset_on_new_post(self):
+        """Новый пост сбрасывает закэшированное число объектов."""
+        CachedCountPaginator(Post.objects.all(), 2).count
+        Post.objects.create(author=self.user, text='Новый пост')
+        paginator = CachedCountPaginator(Post.objects.all(), 2)
+        self.assertEqual(paginator.count, 4)
+
+
+@override_settings(PAGINATOR_EXACT_THRESHOLD=3)
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+
+    def setUp(self):
+        cache.clear()
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Пост {number}')
+            for number in range(5)
+        )
+
+    def test_exact_count_below_threshold(self):
+        """Небольшие выборки считаются точно."""
+        posts = Post.objects.filter(text='Пост 1')
+        self.assertEqual(EstimatedCountPaginator(posts, 2).count, 1)
+
+    @override_settings(PAGINATOR_ASYNC_REFRESH=False)
+    def test_exact_count_without_async_refresh(self):
+        """Без фонового пересчёта большие выборки считаются сразу."""
+        paginator = EstimatedCountPaginator(Post.objects.all(), 2)
+        self.assertEqual(paginator.count, 5)
+
+    def test_large_count_is_refreshed_in_background(self):
+        """Для больших выборок точный подсчёт уходит в фон."""
+        with mock.patch.object(
+            paginator_module, '_refresh_executor'
+        ) as executor:
+            paginator = EstimatedCountPaginator(Post.objects.all(), 2)
+            self.assertGreaterEqual(paginator.count, 4)
+        executor.submit.assert_called_once()
+
+    def test_large_count_is_approximate_until_refreshed(self):
+        """Пока точного числа нет, выводится нижняя граница с плюсом."""
+        with mock.patch.object(paginator_module, '_refresh_executor'):
+            paginator = EstimatedCountPaginator(Post.objects.all(), 2)
+            self.assertEqual(paginator.count_label, '3+')
+
+    @override_settings(PAGINATOR_ASYNC_REFRESH=False)
+    def test_new_posts_do_not_recount_large_feeds(self):
+        """Число большой выборки живёт до таймаута, а не до нового поста."""
+        EstimatedCountPaginator(Post.objects.all(), 2).count
+        Post.objects.create(author=self.user, text='Новый пост')
+        with self.assertNumQueries(0):
+            paginator = EstimatedCountPaginator(Post.objects.all(), 2)
+            self.assertEqual(paginator.count_label, '5')
+
+    def test_estimate_from_planner_statistics(self):
+        """Оценка берётся из статистики планировщика."""
+        self.assertIsNone(estimate_count(Post.objects.filter(pk=1)))
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            self.assertEqual(estimate_count(Post.objects.all()), 5)
+            self.assertEqual(estimate_count(Post.live.all()), 5)
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from ..models import RequestProfile
+from ..profiler import make_token
+from posts.models import User
+
+TEMP_PROFILER_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(PROFILER_ROOT=TEMP_PROFILER_ROOT)
+class ProfilerMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        cls.user = User.objects.create_user(username='user')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_PROFILER_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        shutil.rmtree(TEMP_PROFILER_ROOT, ignore_errors=True)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+        self.user_client = Client()
+        self.user_client.force_login(self.user)
+        self.url = reverse('about:author')
+
+    def test_staff_query_param_profiles_request(self):
+        """Параметр запроса включает профилирование для сотрудника."""
+        response = self.staff_client.get(self.url, {'_profile': 1})
+        profile = RequestProfile.objects.get()
+        self.assertEqual(response['X-Profile-Id'], str(profile.pk))
+        self.assertEqual(profile.trigger, 'param')
+        self.assertTrue(os.path.exists(profile.file_path))
+
+    def test_query_param_ignored_for_regular_user(self):
+        """Обычный пользователь не может включить профилирование."""
+        response = self.user_client.get(self.url, {'_profile': 1})
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_signed_header_profiles_request(self):
+        """Подписанный заголовок включает профилирование."""
+        Client().get(self.url, HTTP_X_PROFILE=make_token())
+        Client().get(self.url, HTTP_X_PROFILE='forged')
+        self.assertEqual(
+            RequestProfile.objects.filter(trigger='header').count(), 1
+        )
+
+    @override_settings(PROFILER_MODE='cprofile')
+    def test_cprofile_mode(self):
+        """В режиме cProfile сохраняется файл статистики."""
+        self.staff_client.get(self.url, {'_profile': 1})
+        profile = RequestProfile.objects.get()
+        self.assertTrue(profile.filename.endswith('.prof'))
+
+    @override_settings(PROFILER_MAX_PROFILES=2)
+    def test_ring_buffer_is_bounded(self):
+        """Хранится не больше PROFILER_MAX_PROFILES профилей."""
+        for _ in range(4):
+            self.staff_client.get(self.url, {'_profile': 1})
+        profiles = RequestProfile.objects.all()
+        self.assertEqual(profiles.count(), 2)
+        self.assertCountEqual(
+            os.listdir(TEMP_PROFILER_ROOT),
+            [profile.filename for profile in profiles]
+        )
+
+    def test_admin_download(self):
+        """Профиль можно скачать из админки."""
+        superuser = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        client = Client()
+        client.force_login(superuser)
+        client.get(self.url, {'_profile': 1})
+        profile = RequestProfile.objects.get()
+        response = client.get(
+            reverse('admin:core_requestprofile_download', args=(profile.pk,))
+        )
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+from django.core.cache import cache, caches
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core.middleware.ratelimit import client_ip
+from core.ratelimit import RateLimiter, parse_rate, rate_limiter
+from core.versions import SHARED_CACHE
+from posts.models import Post, User
+
+
+@override_settings(
+    RATELIMIT_ENABLED=True,
+    RATELIMITS={'posts:add_comment': {'rate': '2/m', 'methods': ('POST',)}},
+)
+class RateLimitMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        rate_limiter.clear()
+        self.user = User.objects.create_user(username='spammer')
+        self.post = Post.objects.create(text='Пост', author=self.user)
+        self.client.force_login(self.user)
+        self.url = reverse('posts:add_comment', args=(self.post.pk,))
+
+    def test_over_limit_returns_429(self):
+        """Запрос сверх лимита получает 429 с Retry-After."""
+        for _ in range(2):
+            response = self.client.post(self.url, {'text': 'Комментарий'})
+            self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        response = self.client.post(self.url, {'text': 'Комментарий'})
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertTemplateUsed(response, 'core/429.html')
+        self.assertEqual(self.post.comments.count(), 2)
+
+    def test_other_methods_and_users_are_not_limited(self):
+        """Лимит считается отдельно для каждого пользователя и метода."""
+        for _ in range(3):
+            self.client.post(self.url, {'text': 'Комментарий'})
+        self.assertEqual(self.client.get(self.url).status_code,
+                         HTTPStatus.FOUND)
+        other = User.objects.create_user(username='other')
+        self.client.force_login(other)
+        response = self.client.post(self.url, {'text': 'Комментарий'})
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+
+class ClientIpTests(TestCase):
+    def request(self, forwarded):
+        return RequestFactory().get(
+            '/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=forwarded
+        )
+
+    @override_settings(TRUSTED_PROXIES=1)
+    def test_forwarded_address_behind_proxy(self):
+        """За прокси берётся адрес, который дописал сам прокси."""
+        request = self.request('6.6.6.6, 203.0.113.5')
+        self.assertEqual(client_ip(request), '203.0.113.5')
+
+    @override_settings(TRUSTED_PROXIES=0)
+    def test_forwarded_header_is_ignored_without_proxy(self):
+        self.assertEqual(client_ip(self.request('6.6.6.6')), '10.0.0.1')
+
+
+class RateLimiterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/m'), (10, 60))
+        self.assertEqual(parse_rate('5/h'), (5, 3600))
+
+    def test_previous_window_is_weighted(self):
+        """Счётчик прошлого окна учитывается с убывающим весом."""
+        limiter = RateLimiter()
+        for _ in range(4):
+            self.assertIsNone(limiter.hit('key', 4, 60, now=60))
+        # Четверть следующего окна: от прошлого осталось 3 запроса.
+        self.assertIsNone(limiter.hit('key', 4, 60, now=135))
+        self.assertIsNotNone(limiter.hit('key', 4, 60, now=135))
+
+    def test_blocked_key_skips_cache(self):
+        """Заблокированный ключ отклоняется без обращения к кэшу."""
+        limiter = RateLimiter()
+        limiter.hit('key', 1, 60, now=0)
+        self.assertEqual(limiter.hit('key', 1, 60, now=0), 60)
+        cache.clear()
+        self.assertEqual(limiter.hit('key', 1, 60, now=30), 30)
+        self.assertIsNone(limiter.hit('key', 1, 60, now=61))
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'default',
+        },
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'shared',
+        },
+    })
+    def test_counters_live_in_shared_cache(self):
+        """Счётчики общие для всех воркеров, а не в кэше процесса."""
+        RateLimiter().hit('key', 5, 60, now=0)
+        self.assertEqual(caches[SHARED_CACHE].get('ratelimit:key:0'), 1)
+        self.assertIsNone(caches['default'].get('ratelimit:key:0'))
@@ -0,0 +1,79 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..views import STATIC_IMMUTABLE_CACHE_CONTROL, static_file
+
+STYLES = 'body { margin: 0; }\n' * 100
+
+
+class CompressedManifestStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source)
+        self.addCleanup(shutil.rmtree, self.root)
+        os.makedirs(os.path.join(self.source, 'css'))
+        with open(os.path.join(self.source, 'css', 'site.css'), 'w') as file:
+            file.write(STYLES)
+        settings = override_settings(
+            DEBUG=False,
+            STATIC_ROOT=self.root,
+            STATICFILES_DIRS=[self.source],
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'
+            ),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        self.hashed_name = staticfiles_storage.stored_name('css/site.css')
+
+    def test_files_are_fingerprinted_and_compressed(self):
+        """collectstatic хэширует имена и сохраняет .gz рядом."""
+        self.assertNotEqual(self.hashed_name, 'css/site.css')
+        self.assertEqual(
+            staticfiles_storage.url('css/site.css'),
+            f'/static/{self.hashed_name}'
+        )
+        with open(os.path.join(self.root, self.hashed_name + '.gz'),
+                  'rb') as file:
+            self.assertEqual(gzip.decompress(file.read()).decode(), STYLES)
+
+    def test_hashed_file_is_served_immutable_and_compressed(self):
+        """Файл с хэшем отдаётся сжатым и с вечным кэшированием."""
+        request = RequestFactory().get(
+            '/', HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        response = static_file(request, self.hashed_name)
+        self.assertEqual(
+            response['Cache-Control'], STATIC_IMMUTABLE_CACHE_CONTROL
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        body = b''.join(response.streaming_content)
+        response.close()
+        self.assertEqual(gzip.decompress(body).decode(), STYLES)
+
+    def test_unhashed_file_is_revalidated(self):
+        """Файл без хэша в имени браузер перепроверяет."""
+        response = static_file(RequestFactory().get('/'), 'css/site.css')
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response.close()
+
+    def test_unchanged_file_is_not_modified(self):
+        """Перепроверка неизменившегося файла получает 304."""
+        response = static_file(RequestFactory().get('/'), 'css/site.css')
+        response.close()
+        request = RequestFactory().get(
+            '/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        response = static_file(request, 'css/site.css')
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('no-cache', response['Cache-Control'])
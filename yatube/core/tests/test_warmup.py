@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.template import engines
+from django.test import TestCase, override_settings
+
+from ..warmup import import_app_modules, warmup_templates, warmup_urls
+
+CACHED_TEMPLATES = [{
+    **settings.TEMPLATES[0],
+    'OPTIONS': {
+        **settings.TEMPLATES[0]['OPTIONS'],
+        'loaders': [(
+            'django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]
+        )],
+    },
+}]
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class WarmupTemplatesTests(TestCase):
+    def test_warmup_fills_cached_loader(self):
+        """Прогрев компилирует шаблоны проекта и включаемые фрагменты."""
+        self.assertGreater(warmup_templates(), 0)
+        loader = engines['django'].engine.template_loaders[0]
+        for name in (
+            'posts/index.html',
+            'posts/includes/paginator.html',
+            'posts/includes/switcher.html',
+        ):
+            with self.subTest(name=name):
+                self.assertIn(name, loader.get_template_cache)
+
+
+class WarmupTests(TestCase):
+    def test_app_modules_and_urls(self):
+        """Прогрев импортирует модули приложений и строит таблицы URL."""
+        self.assertGreater(import_app_modules(), 0)
+        self.assertGreater(warmup_urls(), 0)
@@ -0,0 +1,45 @@
+import uuid
+
+from django.core.cache import caches
+
+VERSION_KEY = 'version:{}'
+# Версии хранятся в кэше, общем для всех процессов: запись в одном
+# воркере должна сбрасывать ETag и кэши в остальных.
+SHARED_CACHE = 'shared'
+
+
+def _new_version():
+    return uuid.uuid4().hex[:12]
+
+
+def get_version(name):
+    """Текущая версия набора данных `name`.
+
+    Версия — случайная метка, а не счётчик: после очистки кэша она не
+    повторяет старые значения, поэтому построенные на ней ключи и ETag
+    не могут случайно совпасть с устаревшими.
+    """
+    cache = caches[SHARED_CACHE]
+    key = VERSION_KEY.format(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(names):
+    """Версии нескольких наборов данных за одно обращение к кэшу."""
+    keys = {VERSION_KEY.format(name): name for name in names}
+    found = caches[SHARED_CACHE].get_many(keys)
+    versions = {keys[key]: version for key, version in found.items()}
+    for name in set(keys.values()) - set(versions):
+        versions[name] = get_version(name)
+    return versions
+
+
+def bump_version(*names):
+    caches[SHARED_CACHE].set_many(
+        {VERSION_KEY.format(name): _new_version() for name in names},
+        None
+    )
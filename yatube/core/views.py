@@ -1,6 +1,21 @@
+import mimetypes
+import os
+import posixpath
+import re
 from http import HTTPStatus
 
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotModified
 from django.shortcuts import render
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+STATIC_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+STATIC_IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
 
 
 def page_not_found(request, exception):
@@ -26,3 +41,49 @@ def server_error(request):
         'core/500.html',
         status=HTTPStatus.INTERNAL_SERVER_ERROR
     )
+
+
+def static_file(request, path):
+    """Отдаёт собранную статику, если её не раздаёт веб-сервер.
+
+    Для файлов с хэшем в имени выставляется вечное кэширование,
+    а при поддержке клиентом — готовый .br или .gz вариант. Остальные
+    файлы браузер перепроверяет по Last-Modified и получает 304.
+    """
+    name = posixpath.normpath(path).lstrip('/')
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    content_type, _ = mimetypes.guess_type(full_path)
+    accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    encoding = None
+    for candidate, suffix in STATIC_ENCODINGS:
+        if (re.search(rf'\b{candidate}\b', accept)
+                and os.path.isfile(full_path + suffix)):
+            encoding = candidate
+            full_path += suffix
+            break
+    stat = os.stat(full_path)
+    if not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'),
+        stat.st_mtime, stat.st_size
+    ):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(
+            open(full_path, 'rb'),
+            content_type=content_type or 'application/octet-stream'
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    is_immutable = getattr(staticfiles_storage, 'is_immutable', None)
+    if is_immutable is not None and is_immutable(name):
+        response['Cache-Control'] = STATIC_IMMUTABLE_CACHE_CONTROL
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
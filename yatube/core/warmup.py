@@ -0,0 +1,78 @@
+import gc
+import os
+from importlib import import_module
+from importlib.util import find_spec
+
+from django.apps import apps
+from django.template import engines
+from django.urls import get_resolver
+
+APP_MODULES = ('forms', 'views', 'signals', 'admin')
+
+
+def iter_template_dirs(loaders):
+    for loader in loaders:
+        if hasattr(loader, 'loaders'):
+            yield from iter_template_dirs(loader.loaders)
+        elif hasattr(loader, 'get_dirs'):
+            yield from loader.get_dirs()
+
+
+def iter_template_names(engine):
+    """Имена всех шаблонов из каталогов движка, включая шаблоны приложений."""
+    for directory in iter_template_dirs(engine.template_loaders):
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(('.html', '.txt', '.xml')):
+                    path = os.path.join(root, filename)
+                    yield os.path.relpath(path, directory).replace(
+                        os.sep, '/'
+                    )
+
+
+def warmup_templates():
+    """Компилирует все шаблоны, чтобы наполнить кэширующий загрузчик.
+
+    Возвращает количество загруженных шаблонов.
+    """
+    count = 0
+    for engine in engines.all():
+        for name in iter_template_names(engine.engine):
+            engine.get_template(name)
+            count += 1
+    return count
+
+
+def import_app_modules():
+    """Импортирует модули приложений, которые иначе грузит первый запрос."""
+    count = 0
+    for app_config in apps.get_app_configs():
+        for name in APP_MODULES:
+            module = f'{app_config.name}.{name}'
+            if find_spec(module) is not None:
+                import_module(module)
+                count += 1
+    return count
+
+
+def warmup_urls():
+    """Импортирует URLconf и строит таблицы для reverse()."""
+    resolver = get_resolver()
+    return len(resolver.reverse_dict)
+
+
+def warmup():
+    """Прогрев процесса до обработки запросов.
+
+    После прогрева объекты переносятся в постоянное поколение сборщика
+    мусора: он их больше не обходит, и страницы памяти, общие с
+    родительским процессом после fork, не копируются.
+    """
+    result = {
+        'modules': import_app_modules(),
+        'urls': warmup_urls(),
+        'templates': warmup_templates(),
+    }
+    gc.collect()
+    gc.freeze()
+    return result
@@ -0,0 +1,23 @@
+from django.contrib import admin
+
+from core.paginator import EstimatedCountPaginator
+from .models import Notification
+
+
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'recipient',
+        'kind',
+        'count',
+        'unread',
+        'updated',
+    )
+    list_select_related = ('recipient',)
+    raw_id_fields = ('recipient', 'actor', 'post', 'archived_post')
+    list_filter = ('kind', 'unread')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+admin.site.register(Notification, NotificationAdmin)
@@ -0,0 +1,11 @@
+from .delivery import get_unread_count
+
+
+def unread_notifications(request):
+    """Добавляет число непрочитанных уведомлений пользователя."""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    return {
+        'unread_notifications': get_unread_count(user.pk)
+    }
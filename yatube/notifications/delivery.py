@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.conditional import USER_VERSION
+from core.versions import SHARED_CACHE, bump_version, get_version
+from posts.models import Post
+from .models import Notification
+
+# Счётчик хранится под версией личных данных пользователя: после новых
+# событий и прочтения ключ меняется во всех процессах сразу.
+UNREAD_KEY = 'notifications:unread:{}:{}'
+
+
+def collect_events(follows, comments):
+    """Сводит события пакета по ключу (получатель, тип, пост).
+
+    Значение — число событий и последний участник.
+    """
+    post_ids = {comment.post_id for comment in comments}
+    authors = dict(
+        Post.objects.filter(pk__in=post_ids).values_list('pk', 'author_id')
+    ) if post_ids else {}
+    events = {}
+    actions = [
+        (authors.get(comment.post_id), Notification.COMMENT,
+         comment.post_id, comment.author_id)
+        for comment in comments
+    ] + [
+        (author_id, Notification.FOLLOW, None, user_id)
+        for user_id, author_id in follows
+    ]
+    for recipient, kind, post_id, actor in actions:
+        if recipient is None or recipient == actor:
+            continue
+        count, _ = events.get((recipient, kind, post_id), (0, None))
+        events[recipient, kind, post_id] = (count + 1, actor)
+    return events
+
+
+def deliver(follows, comments):
+    """Добавляет события к непрочитанным уведомлениям получателей.
+
+    На каждое уведомление приходится один UPDATE, сколько бы событий
+    в него ни попало. Недостающее уведомление создаётся в точке
+    сохранения: если его успела создать параллельная доставка,
+    уникальный индекс не даст дубля, и события добавятся к ней.
+    """
+    events = collect_events(follows, comments)
+    if not events:
+        return
+    now = timezone.now()
+    with transaction.atomic():
+        for (recipient, kind, post_id), (count, actor) in events.items():
+            unread = Notification.objects.filter(
+                recipient_id=recipient, kind=kind, post_id=post_id,
+                unread=True
+            )
+            changes = {
+                'count': F('count') + count, 'actor_id': actor,
+                'updated': now,
+            }
+            if unread.update(**changes):
+                continue
+            try:
+                with transaction.atomic():
+                    Notification.objects.create(
+                        recipient_id=recipient, kind=kind, post_id=post_id,
+                        actor_id=actor, count=count, updated=now
+                    )
+            except IntegrityError:
+                unread.update(**changes)
+    bump_version(*{
+        USER_VERSION.format(recipient) for recipient, _, _ in events
+    })
+
+
+def get_unread_count(user_id):
+    """Число непрочитанных уведомлений, общее для всех процессов."""
+    cache = caches[SHARED_CACHE]
+    key = UNREAD_KEY.format(
+        user_id, get_version(USER_VERSION.format(user_id))
+    )
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(
+            recipient_id=user_id, unread=True
+        ).count()
+        cache.set(key, count, settings.NOTIFICATIONS_UNREAD_TIMEOUT)
+    return count
+
+
+def mark_read(user_id, last_id, last_updated):
+    """Отмечает прочитанными уведомления, показанные пользователю.
+
+    Уведомления новее показанных (с большим id или обновлённые позже)
+    остаются непрочитанными.
+    """
+    Notification.objects.filter(
+        recipient_id=user_id, unread=True,
+        pk__lte=last_id, updated__lte=last_updated
+    ).update(unread=False)
+    bump_version(USER_VERSION.format(user_id))
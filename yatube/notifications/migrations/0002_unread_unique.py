@@ -0,0 +1,46 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:11
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_duplicates(apps, schema_editor):
+    """Сводит повторяющиеся непрочитанные уведомления в одно."""
+    Notification = apps.get_model('notifications', 'Notification')
+    duplicates = Notification.objects.filter(unread=True).values(
+        'recipient', 'kind', 'post'
+    ).annotate(
+        rows=Count('pk'), total=Sum('count')
+    ).filter(rows__gt=1)
+    for group in duplicates:
+        rows = Notification.objects.filter(
+            unread=True, recipient=group['recipient'], kind=group['kind'],
+            post=group['post']
+        ).order_by('-updated', '-pk')
+        keep = rows.first()
+        rows.exclude(pk=keep.pk).delete()
+        keep.count = group['total']
+        keep.save(update_fields=('count',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notification_unread_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('post__isnull', False), ('unread', True)), fields=('recipient', 'kind', 'post'), name='notification_unread_post_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('post__isnull', True), ('unread', True)), fields=('recipient', 'kind'), name='notification_unread_uniq'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_archive'),
+        ('notifications', '0002_unread_unique'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='notification',
+            name='notification_unread_uniq',
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='archived_post',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='posts.ArchivedPost', verbose_name='Архивный пост'),
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('archived_post__isnull', True), ('post__isnull', True), ('unread', True)), fields=('recipient', 'kind'), name='notification_unread_uniq'),
+        ),
+    ]
@@ -0,0 +1,102 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from posts.models import ArchivedPost, Post, User
+
+
+class Notification(models.Model):
+    """Уведомление, собирающее однотипные события.
+
+    Пока уведомление не прочитано, новые события того же вида к тому же
+    посту увеличивают count и меняют последнего участника, а не
+    добавляют строки.
+    """
+    COMMENT = 'comment'
+    FOLLOW = 'follow'
+    KINDS = (
+        (COMMENT, 'Комментарий'),
+        (FOLLOW, 'Подписка'),
+    )
+
+    recipient = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name='Получатель',
+    )
+    kind = models.CharField(
+        verbose_name='Тип',
+        max_length=16,
+        choices=KINDS
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        blank=True,
+        null=True,
+        verbose_name='Пост',
+    )
+    # Пост, перенесённый archive_posts: строка уведомления переезжает
+    # на архивную копию вместо каскадного удаления.
+    archived_post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='+',
+        blank=True,
+        null=True,
+        verbose_name='Архивный пост',
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Последний участник',
+    )
+    count = models.PositiveIntegerField(
+        verbose_name='Число событий',
+        default=1
+    )
+    unread = models.BooleanField(verbose_name='Не прочитано', default=True)
+    updated = models.DateTimeField(
+        verbose_name='Дата события',
+        default=timezone.now
+    )
+
+    class Meta:
+        ordering = ["-updated", "-id"]
+        indexes = (
+            models.Index(
+                fields=('recipient', '-updated'),
+                name='notification_inbox_idx'
+            ),
+        )
+        # Одно непрочитанное уведомление на получателя, вид и пост.
+        # NULL в уникальном индексе не совпадает с NULL, поэтому для
+        # подписок (без поста) нужен отдельный индекс.
+        constraints = (
+            models.UniqueConstraint(
+                fields=('recipient', 'kind', 'post'),
+                name='notification_unread_post_uniq',
+                condition=Q(unread=True, post__isnull=False)
+            ),
+            models.UniqueConstraint(
+                fields=('recipient', 'kind'),
+                name='notification_unread_uniq',
+                condition=Q(
+                    unread=True, post__isnull=True,
+                    archived_post__isnull=True
+                )
+            ),
+        )
+        verbose_name = 'Уведомление'
+        verbose_name_plural = 'Уведомления'
+
+    def __str__(self):
+        return f'{self.get_kind_display()}: {self.count}'
+
+    @property
+    def target_post(self):
+        """Пост уведомления — из ленты или из архива."""
+        return self.post or self.archived_post
@@ -0,0 +1,21 @@
+from django.db.models import F
+from django.dispatch import receiver
+
+from core.concurrent import submit
+from posts.archive import posts_archived
+from posts.models import ArchivedPost
+from posts.writes import WriteBuffer, batch_written
+from .delivery import deliver
+from .models import Notification
+
+
+@receiver(batch_written, sender=WriteBuffer)
+def deliver_notifications(sender, follows, comments, **kwargs):
+    submit(deliver, follows, comments)
+
+
+@receiver(posts_archived, sender=ArchivedPost)
+def move_to_archive(sender, post_ids, **kwargs):
+    Notification.objects.filter(post_id__in=post_ids).update(
+        archived_post_id=F('post_id'), post=None
+    )
@@ -0,0 +1,124 @@
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import Client, TransactionTestCase
+from django.urls import reverse
+
+from posts.models import Comment, Post, User
+from ..delivery import deliver, get_unread_count, mark_read
+from ..models import Notification
+
+
+class NotificationTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author')
+        self.post = Post.objects.create(text='Пост', author=self.author)
+        self.readers = [
+            User.objects.create_user(username=f'reader{number}')
+            for number in range(3)
+        ]
+
+    def client_for(self, user):
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def comment(self, user):
+        self.client_for(user).post(
+            reverse('posts:add_comment', args=(self.post.pk,)),
+            {'text': 'Комментарий'}
+        )
+
+    def test_comments_are_aggregated(self):
+        """Комментарии к посту собираются в одно уведомление."""
+        for reader in self.readers:
+            self.comment(reader)
+        notification = Notification.objects.get(recipient=self.author)
+        self.assertEqual(notification.kind, Notification.COMMENT)
+        self.assertEqual(notification.count, len(self.readers))
+        self.assertEqual(notification.actor, self.readers[-1])
+
+    def test_own_comment_is_not_notified(self):
+        self.comment(self.author)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_repeated_follow_is_notified_once(self):
+        """Повторная подписка на того же автора не считается событием."""
+        client = self.client_for(self.readers[0])
+        for _ in range(3):
+            client.get(
+                reverse('posts:profile_follow', args=(self.author.username,))
+            )
+        notification = Notification.objects.get(recipient=self.author)
+        self.assertEqual(notification.kind, Notification.FOLLOW)
+        self.assertEqual(notification.count, 1)
+
+    def test_inbox_marks_notifications_read(self):
+        """Открытие входящих обнуляет счётчик, новые события — новая строка."""
+        client = self.client_for(self.author)
+        self.assertEqual(get_unread_count(self.author.pk), 0)
+        self.client_for(self.readers[0]).get(
+            reverse('posts:profile_follow', args=(self.author.username,))
+        )
+        self.comment(self.readers[1])
+        self.assertEqual(get_unread_count(self.author.pk), 2)
+        response = client.get(reverse('notifications:inbox'))
+        self.assertEqual(len(response.context['notifications']), 2)
+        self.assertTrue(all(
+            notification.unread
+            for notification in response.context['notifications']
+        ))
+        self.assertEqual(get_unread_count(self.author.pk), 0)
+        self.comment(self.readers[2])
+        self.assertEqual(get_unread_count(self.author.pk), 1)
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_inbox_is_paginated_newest_first(self):
+        Notification.objects.bulk_create(
+            Notification(recipient=self.author, kind=Notification.FOLLOW,
+                         actor=reader, unread=False)
+            for reader in self.readers * 10
+        )
+        client = self.client_for(self.author)
+        first = client.get(reverse('notifications:inbox'))
+        page = first.context['notifications']
+        self.assertTrue(page.has_next)
+        second = client.get(
+            reverse('notifications:inbox') + f'?cursor={page.next_cursor}'
+        ).context['notifications']
+        ids = [n.pk for n in page] + [n.pk for n in second]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(ids), len(self.readers) * 10)
+
+    def test_unread_notification_is_unique(self):
+        """Параллельная доставка не создаст второе непрочитанное."""
+        Notification.objects.create(
+            recipient=self.author, kind=Notification.COMMENT,
+            post=self.post, actor=self.readers[0]
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Notification.objects.create(
+                recipient=self.author, kind=Notification.COMMENT,
+                post=self.post, actor=self.readers[1]
+            )
+        comment = Comment(post=self.post, author=self.readers[1])
+        deliver([], [comment])
+        notification = Notification.objects.get(recipient=self.author)
+        self.assertEqual(notification.count, 2)
+        self.assertEqual(get_unread_count(self.author.pk), 1)
+
+    def test_mark_read_keeps_newer_notifications(self):
+        """Прочитанными отмечаются только показанные уведомления."""
+        self.comment(self.readers[0])
+        shown = Notification.objects.get(recipient=self.author)
+        self.client_for(self.readers[1]).get(
+            reverse('posts:profile_follow', args=(self.author.username,))
+        )
+        mark_read(self.author.pk, shown.pk, shown.updated)
+        self.assertEqual(
+            list(Notification.objects.filter(unread=True).values_list(
+                'kind', flat=True
+            )),
+            [Notification.FOLLOW]
+        )
+        self.assertEqual(get_unread_count(self.author.pk), 1)
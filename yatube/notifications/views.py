@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from core.paginator import paginate_by_cursor
+from .delivery import get_unread_count, mark_read
+
+
+@login_required
+def inbox(request):
+    template = 'notifications/inbox.html'
+    cursor = request.GET.get('cursor')
+    notifications = paginate_by_cursor(
+        request.user.notifications.select_related(
+            'actor', 'post', 'archived_post'
+        ),
+        cursor,
+        settings.NOTIFICATION_AMOUNT,
+        '-updated'
+    )
+    # Страница уже загружена, поэтому новые уведомления на ней
+    # ещё отмечены как непрочитанные.
+    if (cursor is None and len(notifications)
+            and get_unread_count(request.user.pk)):
+        mark_read(
+            request.user.pk,
+            max(notification.pk for notification in notifications),
+            notifications[0].updated
+        )
+    context = {
+        'notifications': notifications,
+    }
+    return render(request, template, context)
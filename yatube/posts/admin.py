@@ -1,19 +1,102 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+
+from core.paginator import EstimatedCountPaginator
 from .models import Post, Group, Comment, Follow
+from .search import full_text_filter
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """Выводит выбранное значение из уже загруженного объекта.
+
+    Стандартный виджет делает запрос за подписью выбранного значения,
+    то есть по запросу на каждую строку редактируемого списка.
+    """
+    preloaded = None
+
+    def optgroups(self, name, value, attr=None):
+        selected = self.preloaded
+        if selected is None or [str(v) for v in value] != [str(selected.pk)]:
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        label = self.choices.field.label_from_instance(selected)
+        options.append(self.create_option(
+            name, selected.pk, label, True, len(options)
+        ))
+        return [(None, options, 0)]
+
+
+class PreloadedRelationsForm(forms.ModelForm):
+    """Передаёт виджетам автодополнения объекты из select_related."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, field in self.fields.items():
+            widget = getattr(field.widget, 'widget', field.widget)
+            if not isinstance(widget, PreloadedAutocompleteSelect):
+                continue
+            descriptor = getattr(type(self.instance), name)
+            if descriptor.is_cached(self.instance):
+                widget.preloaded = getattr(self.instance, name)
+
+
+class PreloadedAutocompleteMixin:
+    form = PreloadedRelationsForm
+
+    def get_changelist_form(self, request, **kwargs):
+        kwargs.setdefault('form', PreloadedRelationsForm)
+        return super().get_changelist_form(request, **kwargs)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.get_autocomplete_fields(request):
+            kwargs['widget'] = PreloadedAutocompleteSelect(
+                db_field.remote_field, self.admin_site,
+                using=kwargs.get('using')
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+class FullTextSearchMixin:
+    """Поиск в админке по индексу вместо LIKE '%...%'.
+
+    Число ищется по первичному ключу, остальные запросы — по FTS-индексу
+    текста. Если индекс недоступен, используется стандартный поиск.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        if search_term.isdigit():
+            return queryset.filter(pk=int(search_term)), False
+        filtered = full_text_filter(queryset, search_term)
+        if filtered is None:
+            return super().get_search_results(request, queryset, search_term)
+        return filtered, False
 
 
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(PreloadedAutocompleteMixin, FullTextSearchMixin,
+                admin.ModelAdmin):
     list_display = (
         'pk',
         'text',
         'pub_date',
         'author',
         'group',
+        'deleted',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
+    autocomplete_fields = ('author', 'group')
     search_fields = ('text',)
-    list_filter = ('pub_date',)
+    list_filter = ('deleted', 'pub_date')
+    date_hierarchy = 'pub_date'
     empty_value_display = '-пусто-'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 class GroupAdmin(admin.ModelAdmin):
@@ -26,23 +109,34 @@ class GroupAdmin(admin.ModelAdmin):
     search_fields = ('title',)
 
 
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(PreloadedAutocompleteMixin, FullTextSearchMixin,
+                   admin.ModelAdmin):
     list_display = (
         'pk',
         'author',
         'text',
         'created',
     )
+    list_select_related = ('author',)
+    autocomplete_fields = ('author',)
+    raw_id_fields = ('post',)
     search_fields = ('text',)
     list_filter = ('created',)
+    date_hierarchy = 'created'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
-class FollowAdmin(admin.ModelAdmin):
+class FollowAdmin(PreloadedAutocompleteMixin, admin.ModelAdmin):
     list_display = (
         'pk',
         'user',
         'author',
     )
+    list_select_related = ('user', 'author')
+    autocomplete_fields = ('user', 'author')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 admin.site.register(Post, PostAdmin)
@@ -1,5 +1,23 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def install_search(sender, using, **kwargs):
+    from .search import install_fts
+    install_fts(using)
+
+
+def clear_follow_graph(sender, **kwargs):
+    # flush в TransactionTestCase удаляет подписки без сигналов,
+    # а затем шлёт post_migrate.
+    from .graph import follow_graph
+    follow_graph.clear()
 
 
 class PostsConfig(AppConfig):
     name = 'posts'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(install_search, sender=self)
+        post_migrate.connect(clear_follow_graph, sender=self)
@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.db.models import Q
+from django.dispatch import Signal
+
+from core.versions import bump_version
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+
+POST_FIELDS = (
+    'id', 'text', 'pub_date', 'author_id', 'group_id', 'image', 'updated',
+    'comment_count', 'deleted',
+)
+COMMENT_FIELDS = ('id', 'post_id', 'author_id', 'text', 'created')
+
+# Отправляется в транзакции пачки, когда архивные копии уже созданы, а
+# посты ещё не удалены: приложения переносят свои ссылки на посты в
+# архив, иначе удаление постов удалит их каскадом.
+posts_archived = Signal(providing_args=('post_ids',))
+
+
+def archive_batch(post_ids, batch_size):
+    """Переносит посты с комментариями в архив одной транзакцией."""
+    with transaction.atomic():
+        ArchivedPost.objects.bulk_create(
+            (
+                ArchivedPost(**values) for values in
+                Post.objects.filter(pk__in=post_ids).values(*POST_FIELDS)
+            ),
+            batch_size=batch_size
+        )
+        comments = Comment.objects.filter(post_id__in=post_ids)
+        ArchivedComment.objects.bulk_create(
+            (
+                ArchivedComment(**values) for values in
+                comments.values(*COMMENT_FIELDS).iterator()
+            ),
+            batch_size=batch_size
+        )
+        # Без сигналов: счётчики комментариев удаляемых постов не нужны.
+        comments._raw_delete(comments.db)
+        posts_archived.send(sender=ArchivedPost, post_ids=post_ids)
+        Post.objects.filter(pk__in=post_ids).delete()
+
+
+def archive_posts(cutoff, batch_size=1000):
+    """Переносит в архив посты старше cutoff и мягко удалённые.
+
+    Посты выбираются пачками по возрастанию id, каждая пачка переносится
+    отдельной транзакцией, чтобы не держать блокировку записи долго.
+    Возвращает число перенесённых постов.
+    """
+    candidates = Post.objects.filter(
+        Q(pub_date__lt=cutoff) | Q(deleted=True)
+    ).order_by('pk').values_list('pk', flat=True)
+    moved = 0
+    last_id = 0
+    while True:
+        post_ids = list(candidates.filter(pk__gt=last_id)[:batch_size])
+        if not post_ids:
+            break
+        archive_batch(post_ids, batch_size)
+        moved += len(post_ids)
+        last_id = post_ids[-1]
+    if moved:
+        bump_version(
+            ArchivedPost._meta.label_lower, Comment._meta.label_lower
+        )
+    return moved
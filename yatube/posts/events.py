@@ -0,0 +1,197 @@
+import asyncio
+import json
+import threading
+from http.cookies import SimpleCookie
+from importlib import import_module
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import close_old_connections
+from django.http import HttpRequest
+
+from core.pubsub import bus
+from .graph import follow_graph
+from .models import Post
+
+CHANNEL = 'posts'
+FEEDS = ('index', 'follow')
+
+
+class PostPublisher:
+    """Публикует новые посты в шину.
+
+    Посты этого процесса приходят из сигнала сразу после коммита.
+    Посты других процессов находит опрос: пока есть подписчики, раз
+    в EVENTS_POLL_INTERVAL секунд читаются посты с id больше последнего
+    опубликованного. Запрос идёт по первичному ключу и без новых постов
+    ничего не читает, поэтому от версий кэша опрос не зависит.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._task = None
+        self._ready = None
+        self.last_id = None
+
+    def publish(self, post_id, author_id):
+        with self._lock:
+            if self.last_id is not None and post_id <= self.last_id:
+                return
+            self.last_id = post_id
+        bus.publish(CHANNEL, {'id': post_id, 'author_id': author_id})
+
+    def poll(self):
+        try:
+            if self.last_id is None:
+                self.last_id = Post.live.order_by('-pk').values_list(
+                    'pk', flat=True
+                ).first() or 0
+                return
+            new_posts = Post.live.filter(pk__gt=self.last_id).order_by(
+                'pk'
+            ).values_list('pk', 'author_id')[:settings.PUBSUB_QUEUE_SIZE]
+            for post_id, author_id in new_posts:
+                self.publish(post_id, author_id)
+        finally:
+            close_old_connections()
+
+    async def watch(self, run, ready):
+        self.last_id = None
+        try:
+            while bus.has_subscribers(CHANNEL):
+                await run(self.poll)
+                ready.set()
+                await asyncio.sleep(settings.EVENTS_POLL_INTERVAL)
+        finally:
+            ready.set()
+
+    async def ensure_watching(self, run):
+        """Запускает опрос и ждёт, пока он запомнит последний пост.
+
+        Иначе пост, сохранённый сразу после подключения, мог бы попасть
+        в начальный last_id раньше сигнала, и сигнал бы его отбросил.
+        """
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.ensure_future(self.watch(run, self._ready))
+        await self._ready.wait()
+
+
+publisher = PostPublisher()
+
+
+def load_followees(scope):
+    """id авторов, на которых подписан владелец сессии, или None."""
+    cookie = SimpleCookie()
+    for name, value in scope.get('headers', ()):
+        if name == b'cookie':
+            cookie.load(value.decode('latin-1'))
+    morsel = cookie.get(settings.SESSION_COOKIE_NAME)
+    request = HttpRequest()
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(
+        morsel.value if morsel else None
+    )
+    try:
+        user = get_user(request)
+        if not user.is_authenticated:
+            return None
+        return set(follow_graph.followees(user.pk))
+    finally:
+        close_old_connections()
+
+
+def events_url(feed):
+    """Адрес потока событий для шаблона или None, если он выключен."""
+    if not settings.EVENTS_ENABLED:
+        return None
+    return f'{settings.EVENTS_PATH}?feed={feed}'
+
+
+async def wait_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+def encode_event(message):
+    data = json.dumps(message)
+    return f'event: post\ndata: {data}\n\n'.encode()
+
+
+async def send_status(send, status):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'text/plain; charset=utf-8')],
+    })
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def post_events(scope, receive, send, run):
+    """Поток server-sent events о новых постах.
+
+    ?feed=index — все посты, ?feed=follow — посты авторов, на которых
+    подписан пользователь (список читается один раз при подключении).
+    Соединение ждёт в цикле событий и не занимает поток.
+    """
+    feed = parse_qs(scope.get('query_string', b'').decode()).get(
+        'feed', ['index']
+    )[0]
+    if feed not in FEEDS:
+        await send_status(send, 404)
+        return
+    followees = None
+    if feed == 'follow':
+        followees = await run(load_followees, scope)
+        if followees is None:
+            await send_status(send, 403)
+            return
+
+    queue = bus.subscribe(CHANNEL)
+    await publisher.ensure_watching(run)
+    disconnect = asyncio.ensure_future(wait_disconnect(receive))
+    message = asyncio.ensure_future(queue.get())
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': f'retry: {settings.EVENTS_RETRY}\n\n'.encode(),
+            'more_body': True,
+        })
+        while True:
+            done, _ = await asyncio.wait(
+                (disconnect, message),
+                timeout=settings.EVENTS_HEARTBEAT,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnect in done:
+                break
+            if message in done:
+                post = message.result()
+                message = asyncio.ensure_future(queue.get())
+                if followees is not None and (
+                    post['author_id'] not in followees
+                ):
+                    continue
+                body = encode_event(post)
+            else:
+                # Комментарий не даёт прокси закрыть простаивающее
+                # соединение.
+                body = b': ping\n\n'
+            await send({
+                'type': 'http.response.body',
+                'body': body,
+                'more_body': True,
+            })
+    finally:
+        message.cancel()
+        disconnect.cancel()
+        bus.unsubscribe(CHANNEL, queue)
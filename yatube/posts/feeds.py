@@ -0,0 +1,148 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import condition
+
+from core.conditional import versions_etag
+from core.versions import get_version
+from .models import Group, Post, User
+
+FEED_KEY = 'feed:{}:{}'
+# Кроме постов лента выводит имена авторов и названия групп: их правка
+# тоже меняет версию постов (см. posts/signals.py).
+FEED_DEPENDENCIES = ('posts.post',)
+
+
+class PostsFeed(Feed):
+    """Последние посты в формате RSS или Atom."""
+
+    def __init__(self, feed_type=Rss201rev2Feed):
+        super().__init__()
+        self.feed_type = feed_type
+
+    def get_queryset(self, obj):
+        return Post.live.select_related('author', 'group')
+
+    def items(self, obj):
+        return self.get_queryset(obj)[:settings.FEED_AMOUNT]
+
+    def item_title(self, item):
+        return item.text[:50]
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=(item.pk,))
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated
+
+    def item_categories(self, item):
+        return (item.group.title,) if item.group else ()
+
+
+class LatestPostsFeed(PostsFeed):
+    title = 'Yatube: последние записи'
+    description = 'Новые записи всех авторов'
+
+    def link(self):
+        return reverse('posts:index')
+
+
+class GroupPostsFeed(PostsFeed):
+    def get_object(self, request, group_name):
+        return get_object_or_404(Group, slug=group_name)
+
+    def get_queryset(self, obj):
+        return obj.posts(manager='live').select_related('author', 'group')
+
+    def title(self, obj):
+        return f'Yatube: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('posts:group_list', args=(obj.slug,))
+
+
+class AuthorPostsFeed(PostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_queryset(self, obj):
+        return obj.posts(manager='live').select_related('author', 'group')
+
+    def title(self, obj):
+        return f'Yatube: записи {obj.get_full_name() or obj.username}'
+
+    def description(self, obj):
+        return f'Новые записи пользователя {obj.username}'
+
+    def link(self, obj):
+        return reverse('posts:profile', args=(obj.username,))
+
+
+def cached_feed(feed, *names):
+    """Представление ленты с готовым XML в кэше.
+
+    Ключ строится из пути и версий `names`, поэтому лента
+    перестраивается один раз после изменения данных. ETag и
+    Last-Modified берутся из версий и из кэша без запросов к базе:
+    опрос неизменившейся ленты стоит несколько обращений к кэшу.
+    """
+    def entry_key(request):
+        versions = ':'.join(get_version(name) for name in names)
+        return FEED_KEY.format(request.path, versions)
+
+    def last_modified(request, **kwargs):
+        entry = cache.get(entry_key(request))
+        return entry and entry['modified']
+
+    @condition(etag_func=versions_etag(*names),
+               last_modified_func=last_modified)
+    def view(request, **kwargs):
+        key = entry_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            response = feed(request, **kwargs)
+            modified = parse_http_date_safe(response.get('Last-Modified'))
+            entry = {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'modified': modified and datetime.fromtimestamp(
+                    modified, tz=timezone.utc
+                ),
+            }
+            cache.set(key, entry, settings.FEED_CACHE_TIMEOUT)
+        response = HttpResponse(
+            entry['content'], content_type=entry['content_type']
+        )
+        if entry['modified']:
+            response['Last-Modified'] = http_date(
+                entry['modified'].timestamp()
+            )
+        return response
+    return view
+
+
+latest_rss = cached_feed(LatestPostsFeed(), *FEED_DEPENDENCIES)
+latest_atom = cached_feed(LatestPostsFeed(Atom1Feed), *FEED_DEPENDENCIES)
+group_rss = cached_feed(GroupPostsFeed(), *FEED_DEPENDENCIES)
+group_atom = cached_feed(GroupPostsFeed(Atom1Feed), *FEED_DEPENDENCIES)
+author_rss = cached_feed(AuthorPostsFeed(), *FEED_DEPENDENCIES)
+author_atom = cached_feed(AuthorPostsFeed(Atom1Feed), *FEED_DEPENDENCIES)
@@ -0,0 +1,71 @@
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connection
+
+from core.versions import bump_version, get_version
+from .models import Follow
+
+FOLLOWEES = 'user'
+FOLLOWERS = 'author'
+VERSION_NAME = 'posts.follow:{}:{}'
+
+
+class FollowGraph:
+    """Граф подписок в памяти процесса.
+
+    Для каждого пользователя хранятся отсортированные массивы id авторов,
+    на которых он подписан, и id подписчиков. Массивы загружаются при
+    первом обращении и сверяются с версией в общем кэше (см.
+    core/versions.py), поэтому изменения из других процессов тоже
+    видны. Внутри транзакции загруженное не запоминается: её данные
+    могут откатиться.
+    """
+
+    def __init__(self):
+        self._arrays = {FOLLOWEES: {}, FOLLOWERS: {}}
+
+    def _load(self, kind, user_id):
+        other = FOLLOWERS if kind == FOLLOWEES else FOLLOWEES
+        version = get_version(VERSION_NAME.format(kind, user_id))
+        arrays = self._arrays[kind]
+        entry = arrays.get(user_id)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        ids = array('I', Follow.objects.filter(
+            **{kind: user_id, f'{other}__isnull': False}
+        ).order_by(other).values_list(f'{other}_id', flat=True))
+        if not connection.in_atomic_block:
+            if len(arrays) >= settings.FOLLOW_GRAPH_SIZE:
+                arrays.clear()
+            arrays[user_id] = (version, ids)
+        return ids
+
+    def followees(self, user_id):
+        """id авторов, на которых подписан пользователь, по возрастанию."""
+        return self._load(FOLLOWEES, user_id)
+
+    def followers(self, author_id):
+        """id подписчиков автора по возрастанию."""
+        return self._load(FOLLOWERS, author_id)
+
+    def is_following(self, user_id, author_id):
+        ids = self.followees(user_id)
+        index = bisect_left(ids, author_id)
+        return index < len(ids) and ids[index] == author_id
+
+    def invalidate(self, user_id, author_id):
+        self._arrays[FOLLOWEES].pop(user_id, None)
+        self._arrays[FOLLOWERS].pop(author_id, None)
+        bump_version(
+            VERSION_NAME.format(FOLLOWEES, user_id),
+            VERSION_NAME.format(FOLLOWERS, author_id),
+        )
+
+    def clear(self):
+        for arrays in self._arrays.values():
+            arrays.clear()
+
+
+follow_graph = FollowGraph()
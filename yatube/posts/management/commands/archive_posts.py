@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.archive import archive_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит старые и мягко удалённые посты вместе с комментариями '
+        'в архивные таблицы, чтобы основная таблица оставалась небольшой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, required=True, metavar='DAYS',
+            help='Архивировать посты старше этого числа дней.'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['older_than'])
+        moved = archive_posts(cutoff, options['batch_size'])
+        self.stdout.write(f'Перенесено постов: {moved}')
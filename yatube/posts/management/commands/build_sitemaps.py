@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from posts.sitemaps import build_sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает карту сайта в SITEMAP_ROOT: только шарды, '
+        'в которых изменились объекты (для cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Перестроить все шарды, например после правки постов.'
+        )
+
+    def handle(self, *args, **options):
+        built, total = build_sitemaps(full=options['full'])
+        self.stdout.write(f'Перестроено шардов: {built} из {total}')
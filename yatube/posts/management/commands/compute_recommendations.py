@@ -0,0 +1,69 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.versions import bump_version
+from posts.models import Recommendation
+from posts.recommendations import VERSION_NAME, RecommendationBuilder
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рекомендации «кого почитать» по подпискам '
+        'и общим обсуждениям.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=20,
+            help='Сколько рекомендаций хранить на пользователя.'
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--chunk-size', type=int, default=10000)
+        parser.add_argument(
+            '--max-degree', type=int, default=1000,
+            help='Пропускать авторов и посты с большим числом связей.'
+        )
+        parser.add_argument('--follow-weight', type=float, default=1.0)
+        parser.add_argument('--comment-weight', type=float, default=0.5)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        builder = RecommendationBuilder(
+            chunk_size=options['chunk_size'],
+            max_degree=options['max_degree'],
+            follow_weight=options['follow_weight'],
+            comment_weight=options['comment_weight'],
+        )
+        loaded = time.monotonic()
+        # Строки пользователей, не попавших в расчёт, удаляются в конце.
+        last_old_id = Recommendation.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+        users = builder.users()
+        created = 0
+        batch_size = options['batch_size']
+        for start in range(0, len(users), batch_size):
+            batch = users[start:start + batch_size]
+            rows = [
+                Recommendation(user_id=user_id, author_id=author_id,
+                               score=score)
+                for user_id in batch
+                for score, author_id in builder.recommend(
+                    user_id, options['top']
+                )
+            ]
+            with transaction.atomic():
+                Recommendation.objects.filter(user_id__in=batch).delete()
+                Recommendation.objects.bulk_create(rows)
+            created += len(rows)
+        Recommendation.objects.filter(pk__lte=last_old_id).delete()
+        bump_version(VERSION_NAME)
+        self.stdout.write(
+            f'Рёбер: подписок {len(builder.follows)}, комментариев '
+            f'{len(builder.commented)}. Пользователей {len(users)}, '
+            f'рекомендаций {created}. Загрузка '
+            f'{loaded - started:.1f} с, расчёт '
+            f'{time.monotonic() - loaded:.1f} с.'
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from posts.trending import rebuild_buckets, refresh_trending
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает списки популярных постов и групп (для cron).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Сначала пересобрать счётчики из комментариев и постов.'
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            self.stdout.write(f'Счётчиков: {rebuild_buckets()}')
+        trending = refresh_trending()
+        self.stdout.write(
+            f'Постов: {len(trending["posts"])}, '
+            f'групп: {len(trending["groups"])}'
+        )
@@ -0,0 +1,246 @@
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from faker import Faker
+
+from posts.models import Comment, Follow, Group, Post, User
+
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+SEED_PASSWORD = 'seed-password'
+TEXT_POOL_SIZE = 1000
+
+
+@contextmanager
+def manual_dates(*fields):
+    """Временно отключает auto_now_add, чтобы задать даты вручную."""
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def chunks(total, size):
+    for start in range(0, total, size):
+        yield min(size, total - start)
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу синтетическими данными со степенным '
+        'распределением: пользователи, группы, посты, комментарии, подписки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', choices=SCALES, default='10k',
+            help='Количество постов.'
+        )
+        parser.add_argument(
+            '--posts', type=int,
+            help='Точное количество постов вместо --scale.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='За сколько дней распределить даты публикаций.'
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.period = timedelta(days=options['days']).total_seconds()
+
+        posts = options['posts']
+        if posts is None:
+            posts = SCALES[options['scale']]
+        users = max(posts // 10, 2)
+        groups = max(posts // 1000, 1)
+        self.texts = [
+            self.faker.paragraph(nb_sentences=5)
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+
+        user_ids = self.create_users(users)
+        group_ids = self.create_groups(groups)
+        post_ids = self.create_posts(posts, user_ids, group_ids)
+        comments = self.create_comments(posts * 2, user_ids, post_ids)
+        follows = self.create_follows(users * 10, user_ids)
+        with connection.cursor() as cursor:
+            # Статистика для оценок числа строк в пагинаторе.
+            cursor.execute('ANALYZE')
+        self.stdout.write(
+            f'Создано: пользователей {len(user_ids)}, групп {len(group_ids)}, '
+            f'постов {len(post_ids)}, комментариев {comments}, '
+            f'подписок {follows}'
+        )
+
+    def power_law(self, population, alpha=1.2):
+        """Накопленные веса Парето для random.choices."""
+        total = 0
+        cum_weights = []
+        for _ in population:
+            total += self.random.paretovariate(alpha)
+            cum_weights.append(total)
+        return cum_weights
+
+    def random_date(self):
+        return self.now - timedelta(
+            seconds=self.random.random() * self.period
+        )
+
+    def new_ids(self, model, since):
+        return list(
+            model.objects.filter(pk__gt=since)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def last_id(self, model):
+        return model.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        ).first() or 0
+
+    def run_suffix(self):
+        """Метка запуска для уникальных имён.
+
+        Берётся не из self.random: с тем же --seed повторный запуск
+        получил бы те же имена и упёрся в уникальный индекс.
+        """
+        return uuid.uuid4().hex[:12]
+
+    def create_users(self, total):
+        since = self.last_id(User)
+        password = make_password(SEED_PASSWORD)
+        suffix = self.run_suffix()
+        created = 0
+        for size in chunks(total, self.batch_size):
+            User.objects.bulk_create(
+                User(
+                    username=f'seed{suffix}_{created + number}',
+                    first_name=self.faker.first_name(),
+                    last_name=self.faker.last_name(),
+                    password=password,
+                )
+                for number in range(size)
+            )
+            created += size
+        return self.new_ids(User, since)
+
+    def create_groups(self, total):
+        since = self.last_id(Group)
+        suffix = self.run_suffix()
+        Group.objects.bulk_create(
+            (
+                Group(
+                    title=self.faker.sentence(nb_words=3)[:200],
+                    slug=f'seed-{suffix}-{number}',
+                    description=self.random.choice(self.texts),
+                )
+                for number in range(total)
+            )
+        )
+        return self.new_ids(Group, since)
+
+    def create_posts(self, total, user_ids, group_ids):
+        since = self.last_id(Post)
+        author_weights = self.power_law(user_ids)
+        group_weights = self.power_law(group_ids)
+        with manual_dates(Post._meta.get_field('pub_date')):
+            for size in chunks(total, self.batch_size):
+                authors = self.random.choices(
+                    user_ids, cum_weights=author_weights, k=size
+                )
+                groups = self.random.choices(
+                    group_ids, cum_weights=group_weights, k=size
+                )
+                with transaction.atomic():
+                    Post.objects.bulk_create(
+                        Post(
+                            text=self.random.choice(self.texts),
+                            author_id=author_id,
+                            group_id=(
+                                group_id if self.random.random() < 0.7
+                                else None
+                            ),
+                            pub_date=self.random_date(),
+                        )
+                        for author_id, group_id in zip(authors, groups)
+                    )
+        return self.new_ids(Post, since)
+
+    def create_comments(self, total, user_ids, post_ids):
+        if not post_ids:
+            return 0
+        author_weights = self.power_law(user_ids)
+        post_weights = self.power_law(post_ids, alpha=1.1)
+        with manual_dates(Comment._meta.get_field('created')):
+            for size in chunks(total, self.batch_size):
+                authors = self.random.choices(
+                    user_ids, cum_weights=author_weights, k=size
+                )
+                posts = self.random.choices(
+                    post_ids, cum_weights=post_weights, k=size
+                )
+                with transaction.atomic():
+                    Comment.objects.bulk_create(
+                        Comment(
+                            text=self.random.choice(self.texts)[:200],
+                            author_id=author_id,
+                            post_id=post_id,
+                            created=self.random_date(),
+                        )
+                        for author_id, post_id in zip(authors, posts)
+                    )
+        # bulk_create не шлёт сигналы, поэтому счётчики пересчитываются.
+        totals = Comment.objects.filter(post=OuterRef('pk')).order_by(
+        ).values('post').annotate(total=Count('pk')).values('total')
+        Post.objects.filter(pk__gte=post_ids[0]).update(
+            comment_count=Coalesce(
+                Subquery(totals, output_field=IntegerField()), 0
+            )
+        )
+        return total
+
+    def create_follows(self, total, user_ids):
+        """Подписки по принципу предпочтительного присоединения."""
+        author_weights = self.power_law(user_ids, alpha=1.05)
+        pairs = set()
+        attempts = 0
+        while len(pairs) < total and attempts < total * 3:
+            size = min(self.batch_size, total - len(pairs))
+            followers = self.random.choices(user_ids, k=size)
+            authors = self.random.choices(
+                user_ids, cum_weights=author_weights, k=size
+            )
+            batch = [
+                pair for pair in zip(followers, authors)
+                if pair[0] != pair[1] and pair not in pairs
+            ]
+            pairs.update(batch)
+            attempts += size
+            Follow.objects.bulk_create(
+                (
+                    Follow(user_id=user_id, author_id=author_id)
+                    for user_id, author_id in set(batch)
+                ),
+                ignore_conflicts=True,
+            )
+        return len(pairs)
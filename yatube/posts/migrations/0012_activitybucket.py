@@ -0,0 +1,35 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_recommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityBucket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('comments', 'Комментарии к посту'), ('posts', 'Посты в группе')], max_length=16, verbose_name='Тип')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Объект')),
+                ('bucket', models.PositiveIntegerField(verbose_name='Интервал')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество')),
+            ],
+            options={
+                'verbose_name': 'Активность',
+                'verbose_name_plural': 'Активность',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='activitybucket',
+            index=models.Index(fields=['kind', 'bucket'], name='activity_kind_bucket_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='activitybucket',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id', 'bucket'), name='unique_activity_bucket'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -13,6 +14,13 @@ class Group(models.Model):
         return self.title
 
 
+class LivePostManager(models.Manager):
+    """Посты без мягко удалённых: для всего, что видят читатели."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted=False)
+
+
 class Post(models.Model):
     text = models.TextField(
         verbose_name='Текст поста',
@@ -42,16 +50,55 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True
     )
+    updated = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True
+    )
+    comment_count = models.PositiveIntegerField(
+        verbose_name='Число комментариев',
+        default=0,
+        editable=False
+    )
+    deleted = models.BooleanField(
+        verbose_name='Удалён',
+        default=False,
+        editable=False
+    )
+
+    # Менеджер по умолчанию не фильтрует: удалённые посты нужны админке,
+    # dumpdata и проверке внешних ключей. Страницы берут посты из live.
+    objects = models.Manager()
+    live = LivePostManager()
 
     class Meta:
         ordering = ["-pub_date"]
         get_latest_by = ["pub_date"]
+        # Частичные индексы: лентам нужны только неудалённые посты.
+        indexes = (
+            models.Index(
+                fields=('-pub_date',), name='post_pub_date_idx',
+                condition=Q(deleted=False)
+            ),
+            models.Index(
+                fields=('author', '-pub_date'), name='post_author_date_idx',
+                condition=Q(deleted=False)
+            ),
+            models.Index(
+                fields=('group', '-pub_date'), name='post_group_date_idx',
+                condition=Q(deleted=False)
+            ),
+        )
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
 
     def __str__(self):
         return self.text[:15]
 
+    def soft_delete(self):
+        """Скрывает пост; из таблицы его уберёт archive_posts."""
+        self.deleted = True
+        self.save(update_fields=('deleted', 'updated'))
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -76,7 +123,14 @@ class Comment(models.Model):
     )
 
     class Meta:
+        ordering = ["created", "id"]
         get_latest_by = ["created"]
+        indexes = (
+            models.Index(fields=('-created',), name='comment_created_idx'),
+            models.Index(
+                fields=('post', 'created'), name='comment_post_created_idx'
+            ),
+        )
 
 
 class Follow(models.Model):
@@ -103,3 +157,152 @@ class Follow(models.Model):
         )
         verbose_name = 'Подписка'
         verbose_name_plural = 'Подписки'
+
+
+class Recommendation(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='recommendations',
+        verbose_name='Пользователь',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Рекомендованный автор',
+    )
+    score = models.FloatField(verbose_name='Оценка')
+
+    class Meta:
+        ordering = ["-score"]
+        indexes = (
+            models.Index(
+                fields=('user', '-score'), name='recommendation_user_idx'
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'),
+                name='unique_recommendation'),
+        )
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
+
+
+class ActivityBucket(models.Model):
+    """Число событий объекта за один интервал времени."""
+    COMMENTS = 'comments'
+    POSTS = 'posts'
+    KINDS = (
+        (COMMENTS, 'Комментарии к посту'),
+        (POSTS, 'Посты в группе'),
+    )
+
+    kind = models.CharField(
+        verbose_name='Тип',
+        max_length=16,
+        choices=KINDS
+    )
+    object_id = models.PositiveIntegerField(verbose_name='Объект')
+    bucket = models.PositiveIntegerField(verbose_name='Интервал')
+    count = models.PositiveIntegerField(
+        verbose_name='Количество',
+        default=0
+    )
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('kind', 'bucket'), name='activity_kind_bucket_idx'
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('kind', 'object_id', 'bucket'),
+                name='unique_activity_bucket'),
+        )
+        verbose_name = 'Активность'
+        verbose_name_plural = 'Активность'
+
+
+class ArchivedPost(models.Model):
+    """Пост, перенесённый из posts_post командой archive_posts.
+
+    id сохраняется, поэтому адрес поста не меняется.
+    """
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField(verbose_name='Текст поста')
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts',
+        verbose_name='Автор',
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        related_name='archived_posts',
+        blank=True,
+        null=True,
+        verbose_name='Группа',
+    )
+    image = models.ImageField(
+        verbose_name='Картинка',
+        upload_to='posts/',
+        blank=True
+    )
+    updated = models.DateTimeField(verbose_name='Дата изменения')
+    comment_count = models.PositiveIntegerField(
+        verbose_name='Число комментариев',
+        default=0
+    )
+    deleted = models.BooleanField(verbose_name='Удалён', default=False)
+    archived = models.DateTimeField(
+        verbose_name='Дата архивации',
+        auto_now_add=True
+    )
+
+    class Meta:
+        ordering = ["-pub_date"]
+        indexes = (
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='archivedpost_author_date_idx'
+            ),
+        )
+        verbose_name = 'Архивный пост'
+        verbose_name_plural = 'Архивные посты'
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        verbose_name='Пост'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments',
+        verbose_name='Автор',
+    )
+    text = models.TextField(verbose_name='Комментарий')
+    created = models.DateTimeField(verbose_name='Дата публикации')
+
+    class Meta:
+        ordering = ["created", "id"]
+        indexes = (
+            models.Index(
+                fields=('post', 'created'),
+                name='archivedcomment_post_idx'
+            ),
+        )
+        verbose_name = 'Архивный комментарий'
+        verbose_name_plural = 'Архивные комментарии'
@@ -0,0 +1,137 @@
+import heapq
+from array import array
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.versions import get_version
+from .graph import follow_graph
+from .models import Comment, Follow, Post, Recommendation
+
+VERSION_NAME = 'posts.recommendation'
+
+
+class Adjacency:
+    """Разреженная матрица смежности в духе CSR.
+
+    Соседи всех вершин лежат подряд в одном array('I'), для вершины
+    хранятся только границы её отрезка. Строится из пар (вершина, сосед),
+    упорядоченных по вершине.
+    """
+
+    def __init__(self, pairs):
+        self.bounds = {}
+        self.targets = array('I')
+        current, start = None, 0
+        for row, column in pairs:
+            if row != current:
+                if current is not None:
+                    self.bounds[current] = (start, len(self.targets))
+                current, start = row, len(self.targets)
+            self.targets.append(column)
+        if current is not None:
+            self.bounds[current] = (start, len(self.targets))
+
+    def __len__(self):
+        return len(self.targets)
+
+    def rows(self):
+        return self.bounds.keys()
+
+    def degree(self, row):
+        start, end = self.bounds.get(row, (0, 0))
+        return end - start
+
+    def neighbors(self, row):
+        start, end = self.bounds.get(row, (0, 0))
+        return self.targets[start:end]
+
+
+def load_adjacency(queryset, row, column, chunk_size):
+    pairs = queryset.filter(
+        **{f'{row}__isnull': False, f'{column}__isnull': False}
+    ).order_by(row, column).values_list(row, column).distinct()
+    return Adjacency(pairs.iterator(chunk_size=chunk_size))
+
+
+class RecommendationBuilder:
+    """Кандидаты «кого почитать» по подпискам и комментариям.
+
+    Оценка автора для пользователя — взвешенная сумма числа путей
+    «подписки подписок» и числа общих обсуждений (постов, которые оба
+    комментировали). Вершины с очень большой степенью пропускаются:
+    они почти ничего не говорят о вкусах и делают подсчёт квадратичным.
+    """
+
+    def __init__(self, chunk_size=10000, max_degree=1000,
+                 follow_weight=1.0, comment_weight=0.5):
+        self.max_degree = max_degree
+        self.follow_weight = follow_weight
+        self.comment_weight = comment_weight
+        self.follows = load_adjacency(
+            Follow.objects, 'user_id', 'author_id', chunk_size
+        )
+        self.commented = load_adjacency(
+            Comment.objects, 'author_id', 'post_id', chunk_size
+        )
+        self.commenters = load_adjacency(
+            Comment.objects, 'post_id', 'author_id', chunk_size
+        )
+        self.authors = set(
+            Post.live.order_by().values_list('author_id', flat=True)
+            .distinct().iterator(chunk_size=chunk_size)
+        )
+
+    def users(self):
+        return sorted(set(self.follows.rows()) | set(self.commented.rows()))
+
+    def expand(self, adjacency, sources):
+        counter = Counter()
+        for source in sources:
+            if adjacency.degree(source) <= self.max_degree:
+                counter.update(adjacency.neighbors(source))
+        return counter
+
+    def recommend(self, user_id, top):
+        followees = self.follows.neighbors(user_id)
+        scores = Counter()
+        for author_id, paths in self.expand(self.follows, followees).items():
+            scores[author_id] += paths * self.follow_weight
+        posts = self.commented.neighbors(user_id)
+        for author_id, shared in self.expand(self.commenters, posts).items():
+            scores[author_id] += shared * self.comment_weight
+        excluded = set(followees)
+        excluded.add(user_id)
+        candidates = (
+            (score, author_id) for author_id, score in scores.items()
+            if author_id in self.authors and author_id not in excluded
+        )
+        return heapq.nlargest(top, candidates)
+
+
+def get_recommendations(user_id):
+    """Рекомендованные авторы: словари с username и full_name.
+
+    Список берётся из кэша, а при промахе — одним запросом по индексу
+    (user, -score). Авторы, на которых пользователь уже подписался
+    после расчёта, отбрасываются.
+    """
+    key = f'recommendations:{get_version(VERSION_NAME)}:{user_id}'
+    authors = cache.get(key)
+    if authors is None:
+        authors = [
+            {
+                'id': recommendation.author_id,
+                'username': recommendation.author.username,
+                'full_name': recommendation.author.get_full_name(),
+            }
+            for recommendation in Recommendation.objects.filter(
+                user_id=user_id
+            ).select_related('author')[:settings.RECOMMENDATIONS_LIMIT]
+        ]
+        cache.set(key, authors, settings.RECOMMENDATIONS_TIMEOUT)
+    return [
+        author for author in authors
+        if not follow_graph.is_following(user_id, author['id'])
+    ][:settings.RECOMMENDATIONS_AMOUNT]
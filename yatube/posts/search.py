@@ -0,0 +1,106 @@
+"""Полнотекстовый поиск по постам и комментариям через SQLite FTS5.
+
+Таблицы FTS5 используют внешнее содержимое (`content=`), поэтому текст
+не дублируется, а триггеры держат индекс в актуальном состоянии.
+Триггеры создаются после каждой миграции: SQLite пересоздаёт таблицу
+при изменении схемы и теряет их. На других СУБД и в сборках SQLite без
+FTS5 поиск возвращает None, и вызывающий код использует обычный LIKE.
+"""
+from django.db import DatabaseError, connections
+from django.db.models.expressions import RawSQL
+
+FTS_TABLES = {
+    'posts_post': 'posts_post_fts',
+    'posts_comment': 'posts_comment_fts',
+}
+
+CREATE_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+    "text, content='{table}', content_rowid='id')"
+)
+TRIGGERS = {
+    '{fts}_ai': (
+        'AFTER INSERT ON {table} BEGIN '
+        'INSERT INTO {fts}(rowid, text) VALUES (new.id, new.text); END'
+    ),
+    '{fts}_ad': (
+        'AFTER DELETE ON {table} BEGIN '
+        "INSERT INTO {fts}({fts}, rowid, text) "
+        "VALUES ('delete', old.id, old.text); END"
+    ),
+    '{fts}_au': (
+        'AFTER UPDATE OF text ON {table} BEGIN '
+        "INSERT INTO {fts}({fts}, rowid, text) "
+        "VALUES ('delete', old.id, old.text); "
+        'INSERT INTO {fts}(rowid, text) VALUES (new.id, new.text); END'
+    ),
+}
+
+_available = {}
+
+
+def install_fts(using='default'):
+    """Создаёт таблицы и триггеры FTS5; при потере триггеров
+    перестраивает индекс."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    try:
+        with connection.cursor() as cursor:
+            for table, fts in FTS_TABLES.items():
+                cursor.execute(CREATE_TABLE.format(fts=fts, table=table))
+                cursor.execute(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type = 'trigger' AND tbl_name = %s",
+                    [table]
+                )
+                existing = {row[0] for row in cursor.fetchall()}
+                missing = {
+                    name.format(fts=fts): body.format(fts=fts, table=table)
+                    for name, body in TRIGGERS.items()
+                    if name.format(fts=fts) not in existing
+                }
+                for name, body in missing.items():
+                    cursor.execute(f'CREATE TRIGGER {name} {body}')
+                if missing:
+                    cursor.execute(
+                        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"
+                    )
+    except DatabaseError:
+        _available[using] = False
+        return False
+    _available[using] = True
+    return True
+
+
+def is_available(using):
+    if using not in _available:
+        connection = connections[using]
+        if connection.vendor != 'sqlite':
+            _available[using] = False
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = %s",
+                    [FTS_TABLES['posts_post']]
+                )
+                _available[using] = cursor.fetchone() is not None
+    return _available[using]
+
+
+def match_expression(term):
+    """Каждое слово ищется как префикс, слова объединяются через AND."""
+    words = term.replace('"', ' ').split()
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def full_text_filter(queryset, term):
+    """Фильтрует queryset по FTS-индексу или возвращает None."""
+    table = queryset.model._meta.db_table
+    fts = FTS_TABLES.get(table)
+    expression = match_expression(term)
+    if fts is None or not expression or not is_available(queryset.db):
+        return None
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [expression]
+    ))
@@ -0,0 +1,114 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.signals import is_visible_change
+from core.versions import bump_version
+from .events import publisher
+from .graph import follow_graph
+from .models import ActivityBucket, Comment, Follow, Group, Post, User
+from .trending import record_activity
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def bump_model_version(sender, **kwargs):
+    bump_version(sender._meta.label_lower)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def bump_author_version(sender, instance, **kwargs):
+    bump_version(f'posts.post:{instance.author_id}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_post_comments_version(sender, instance, **kwargs):
+    bump_version(f'posts.comment:{instance.post_id}')
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def bump_group_version(sender, instance, **kwargs):
+    # Название группы выводится в карточках её постов в любой ленте.
+    bump_version('posts.post', f'posts.group:{instance.pk}')
+
+
+@receiver(post_save, sender=User)
+def bump_user_pages(sender, instance, **kwargs):
+    """Имя пользователя выводится в карточках его постов и комментариях.
+
+    Версии лент и комментариев меняются, только если у пользователя
+    есть посты или комментарии: регистрация и правка профиля читателя
+    кэшей не сбрасывают.
+    """
+    if not is_visible_change(**kwargs):
+        return
+    names = [
+        f'posts.comment:{post_id}'
+        for post_id in Comment.objects.filter(author=instance).order_by(
+        ).values_list('post_id', flat=True).distinct().iterator()
+    ]
+    if Post.objects.filter(author=instance).exists():
+        names += ['posts.post', f'posts.post:{instance.pk}']
+    if names:
+        bump_version(*names)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follow_graph(sender, instance, **kwargs):
+    # После коммита: иначе другой процесс успеет загрузить старые
+    # подписки уже под новой версией.
+    transaction.on_commit(lambda: follow_graph.invalidate(
+        instance.user_id, instance.author_id
+    ))
+
+
+@receiver(post_save, sender=Comment)
+def record_comment_activity(sender, instance, created, **kwargs):
+    if created:
+        record_activity(
+            ActivityBucket.COMMENTS, instance.post_id,
+            instance.created.timestamp()
+        )
+
+
+@receiver(post_save, sender=Post)
+def record_post_activity(sender, instance, created, **kwargs):
+    if created and instance.group_id is not None:
+        record_activity(
+            ActivityBucket.POSTS, instance.group_id,
+            instance.pub_date.timestamp()
+        )
+
+
+@receiver(post_save, sender=Post)
+def publish_new_post(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(
+            lambda: publisher.publish(instance.pk, instance.author_id)
+        )
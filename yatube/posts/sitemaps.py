@@ -0,0 +1,256 @@
+import fcntl
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, F, Max
+from django.urls import reverse
+
+from core.concurrent import submit
+from core.versions import SHARED_CACHE
+from .models import ArchivedPost, Group, Post, User
+
+INDEX_NAME = 'sitemap.xml'
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = '.lock'
+SITEMAP_LOCK_KEY = 'sitemaps:lock'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+class ShardedSitemap:
+    """Раздел карты сайта, разбитый на файлы по диапазонам id.
+
+    Шард n содержит объекты с id из [n * size, (n + 1) * size), поэтому
+    новые объекты попадают только в последние шарды. Подпись шарда —
+    число объектов и максимальный id: если она не изменилась, файл
+    не перестраивается.
+    """
+    name = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def location(self, row):
+        raise NotImplementedError
+
+    def lastmod(self, row):
+        return None
+
+    def signatures(self):
+        """{номер шарда: [число объектов, максимальный id]} одним запросом."""
+        rows = self.get_queryset().order_by().annotate(
+            shard=F('pk') / settings.SITEMAP_SHARD_SIZE
+        ).values('shard').annotate(
+            total=Count('pk'), last=Max('pk')
+        ).values_list('shard', 'total', 'last')
+        return {shard: [total, last] for shard, total, last in rows}
+
+    def rows(self, shard):
+        size = settings.SITEMAP_SHARD_SIZE
+        return self.get_queryset().filter(
+            pk__gte=shard * size, pk__lt=(shard + 1) * size
+        ).order_by('pk').iterator()
+
+    def write(self, file, shard):
+        file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<urlset xmlns="{XMLNS}">\n'
+        )
+        for row in self.rows(shard):
+            file.write(
+                f'<url><loc>{escape(settings.SITE_URL + self.location(row))}'
+                '</loc>'
+            )
+            lastmod = self.lastmod(row)
+            if lastmod is not None:
+                file.write(
+                    f'<lastmod>{lastmod.isoformat(timespec="seconds")}'
+                    '</lastmod>'
+                )
+            file.write('</url>\n')
+        file.write('</urlset>\n')
+
+
+class PostSitemap(ShardedSitemap):
+    name = 'posts'
+
+    def get_queryset(self):
+        return Post.live.values_list('pk', 'updated')
+
+    def location(self, row):
+        return reverse('posts:post_detail', args=(row[0],))
+
+    def lastmod(self, row):
+        return row[1]
+
+
+class ArchivedPostSitemap(PostSitemap):
+    name = 'archive'
+
+    def get_queryset(self):
+        return ArchivedPost.objects.filter(deleted=False).values_list(
+            'pk', 'updated'
+        )
+
+
+class ProfileSitemap(ShardedSitemap):
+    name = 'profiles'
+
+    def get_queryset(self):
+        return User.objects.filter(is_active=True).values_list(
+            'pk', 'username'
+        )
+
+    def location(self, row):
+        return reverse('posts:profile', args=(row[1],))
+
+
+class GroupSitemap(ShardedSitemap):
+    name = 'groups'
+
+    def get_queryset(self):
+        return Group.objects.values_list('pk', 'slug')
+
+    def location(self, row):
+        return reverse('posts:group_list', args=(row[1],))
+
+
+SITEMAPS = (
+    PostSitemap(), ArchivedPostSitemap(), ProfileSitemap(), GroupSitemap()
+)
+
+
+def shard_filename(section, shard):
+    return f'sitemap-{section}-{shard}.xml'
+
+
+def write_file(path, write):
+    """Пишет файл через временный, чтобы не отдать его наполовину.
+
+    У каждого вызова свой временный файл, поэтому параллельные записи
+    одного пути не портят друг друга.
+    """
+    file = tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', dir=os.path.dirname(path),
+        prefix=f'.{os.path.basename(path)}.', delete=False
+    )
+    try:
+        with file:
+            write(file)
+        # NamedTemporaryFile создаёт файл с правами 0600, а файлы карты
+        # может отдавать и веб-сервер.
+        os.chmod(file.name, 0o644)
+        os.replace(file.name, path)
+    except BaseException:
+        os.remove(file.name)
+        raise
+
+
+@contextmanager
+def sitemap_lock(root):
+    """Блокировка файла в SITEMAP_ROOT: одна сборка на все процессы."""
+    with open(os.path.join(root, LOCK_NAME), 'w') as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def load_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST_NAME)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_sitemaps(full=False):
+    """Перестраивает изменившиеся шарды и индекс в SITEMAP_ROOT.
+
+    Сборки из разных процессов идут по очереди под файловой
+    блокировкой. Возвращает число перестроенных шардов и общее число
+    шардов.
+    """
+    root = settings.SITEMAP_ROOT
+    os.makedirs(root, exist_ok=True)
+    with sitemap_lock(root):
+        return _build(root, full)
+
+
+def _build(root, full):
+    manifest = {} if full else load_manifest(root)
+    shards = {}
+    built = 0
+    for sitemap in SITEMAPS:
+        for shard, signature in sorted(sitemap.signatures().items()):
+            filename = shard_filename(sitemap.name, shard)
+            path = os.path.join(root, filename)
+            if manifest.get(filename) != signature or not os.path.exists(
+                path
+            ):
+                write_file(path, lambda file: sitemap.write(file, shard))
+                built += 1
+            shards[filename] = signature
+    for filename in set(manifest) - set(shards):
+        try:
+            os.remove(os.path.join(root, filename))
+        except FileNotFoundError:
+            pass
+
+    def write_index(file):
+        file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<sitemapindex xmlns="{XMLNS}">\n'
+        )
+        for filename in shards:
+            modified = time.strftime(
+                '%Y-%m-%dT%H:%M:%S+00:00',
+                time.gmtime(os.path.getmtime(os.path.join(root, filename)))
+            )
+            location = escape(settings.SITE_URL + reverse(
+                'posts:sitemap_shard', args=(filename,)
+            ))
+            file.write(
+                f'<sitemap><loc>{location}</loc>'
+                f'<lastmod>{modified}</lastmod></sitemap>\n'
+            )
+        file.write('</sitemapindex>\n')
+
+    write_file(os.path.join(root, INDEX_NAME), write_index)
+    write_file(
+        os.path.join(root, MANIFEST_NAME),
+        lambda file: json.dump(shards, file)
+    )
+    return built, len(shards)
+
+
+def refresh_sitemaps():
+    """Готовит индекс к отдаче.
+
+    Если индекса ещё нет, строит его сразу: параллельные запросы ждут
+    на блокировке одну сборку. Устаревший индекс перестраивается в
+    фоне, а отдаётся пока прежний; ключ в общем кэше не даёт
+    процессам ставить сборку в очередь одновременно.
+    """
+    root = settings.SITEMAP_ROOT
+    index = os.path.join(root, INDEX_NAME)
+    try:
+        age = time.time() - os.path.getmtime(index)
+    except OSError:
+        os.makedirs(root, exist_ok=True)
+        with sitemap_lock(root):
+            if not os.path.exists(index):
+                _build(root, full=False)
+        return
+    if age < settings.SITEMAP_REFRESH:
+        return
+    if caches[SHARED_CACHE].add(
+        SITEMAP_LOCK_KEY, True, settings.SITEMAP_REFRESH
+    ):
+        submit(build_sitemaps)
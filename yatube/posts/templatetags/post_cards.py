@@ -0,0 +1,54 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from core.conditional import PROFILE_VERSION
+from core.versions import get_versions
+
+register = template.Library()
+
+CARD_TEMPLATE = 'posts/includes/post_card.html'
+
+
+def card_dependencies(post):
+    """Карточка выводит имя автора и ссылку на группу."""
+    names = [PROFILE_VERSION.format(post.author.username)]
+    if post.group_id is not None:
+        names.append(f'posts.group:{post.group_id}')
+    return names
+
+
+def card_key(post, versions):
+    """Ключ кэша карточки меняется при сохранении поста, автора и группы."""
+    version = int(post.updated.timestamp() * 1_000_000)
+    dependencies = '.'.join(
+        versions[name] for name in card_dependencies(post)
+    )
+    return f'post_card:{post.pk}:{version}:{dependencies}'
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Возвращает HTML карточек постов, беря готовые из кэша одним запросом.
+
+    Использование: `{% post_cards page_obj as cards %}`.
+    """
+    posts = list(posts)
+    versions = get_versions({
+        name for post in posts for name in card_dependencies(post)
+    })
+    keys = [card_key(post, versions) for post in posts]
+    cached = cache.get_many(keys)
+    rendered = {}
+    cards = []
+    for post, key in zip(posts, keys):
+        card = cached.get(key)
+        if card is None:
+            card = render_to_string(CARD_TEMPLATE, {'post': post})
+            rendered[key] = card
+        cards.append(mark_safe(card))
+    if rendered:
+        cache.set_many(rendered, settings.POST_CARD_TIMEOUT)
+    return cards
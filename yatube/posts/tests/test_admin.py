@@ -0,0 +1,77 @@
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Comment, Follow, Group, Post, User
+
+
+class AdminChangelistTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.admin)
+
+    def create_rows(self, count, start=0):
+        for number in range(start, start + count):
+            author = User.objects.create_user(username=f'user{number}')
+            post = Post.objects.create(
+                author=author, group=self.group, text=f'Пост номер {number}'
+            )
+            Comment.objects.create(post=post, author=author, text='Текст')
+            Follow.objects.create(user=author, author=self.admin)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов списка в админке не зависит от числа строк."""
+        urls = {
+            'post': reverse('admin:posts_post_changelist'),
+            'comment': reverse('admin:posts_comment_changelist'),
+            'follow': reverse('admin:posts_follow_changelist'),
+        }
+        self.create_rows(2)
+        # Первый запрос кладёт администратора в кэш пользователей.
+        self.client.get(reverse('admin:index'))
+        few = {name: self.count_queries(url) for name, url in urls.items()}
+        self.create_rows(10, start=2)
+        for name, url in urls.items():
+            with self.subTest(model=name):
+                self.assertEqual(self.count_queries(url), few[name])
+
+    def test_search_uses_full_text_index(self):
+        """Поиск находит посты по словам и по первичному ключу."""
+        self.create_rows(3)
+        post = Post.objects.get(text='Пост номер 1')
+        url = reverse('admin:posts_post_changelist')
+        for term in ('номер 1', 'НОМЕР 1', str(post.pk)):
+            with self.subTest(term=term):
+                response = self.client.get(url, {'q': term})
+                self.assertEqual(
+                    list(response.context['cl'].result_list), [post]
+                )
+
+    def test_editable_group_shows_selected_group(self):
+        """В редактируемом списке выбранная группа выводится без запроса."""
+        self.create_rows(1)
+        response = self.client.get(reverse('admin:posts_post_changelist'))
+        self.assertContains(
+            response,
+            f'<option value="{self.group.pk}" selected>{self.group}</option>',
+            html=True
+        )
@@ -0,0 +1,127 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from notifications.models import Notification
+from ..models import ArchivedComment, ArchivedPost, Comment, Post, User
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author')
+        self.old_post = Post.objects.create(
+            text='Старый пост', author=self.author
+        )
+        Post.objects.filter(pk=self.old_post.pk).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+        self.comment = Comment.objects.create(
+            post=self.old_post, author=self.author, text='Комментарий'
+        )
+        self.new_post = Post.objects.create(
+            text='Новый пост', author=self.author
+        )
+        self.client.force_login(self.author)
+
+    def archive(self):
+        call_command('archive_posts', older_than=365, stdout=StringIO())
+
+    def test_soft_delete_hides_post(self):
+        """Удалённый автором пост пропадает из лент и со страницы."""
+        response = self.client.post(
+            reverse('posts:post_delete', args=(self.new_post.pk,))
+        )
+        self.assertRedirects(
+            response, reverse('posts:profile', args=(self.author.username,))
+        )
+        self.assertTrue(Post.objects.get(pk=self.new_post.pk).deleted)
+        self.assertNotIn(self.new_post, Post.live.all())
+        self.assertNotContains(
+            self.client.get(reverse('posts:index')), 'Новый пост'
+        )
+        self.assertEqual(self.client.get(
+            reverse('posts:post_detail', args=(self.new_post.pk,))
+        ).status_code, 404)
+
+    def test_deleted_post_stays_in_admin(self):
+        """Менеджер по умолчанию не прячет удалённые посты."""
+        self.new_post.soft_delete()
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin)
+        response = self.client.get(
+            reverse('admin:posts_post_change', args=(self.new_post.pk,))
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Post._default_manager.count(), 2)
+
+    def test_only_author_can_delete(self):
+        other = User.objects.create_user(username='other')
+        self.client.force_login(other)
+        self.client.post(
+            reverse('posts:post_delete', args=(self.new_post.pk,))
+        )
+        self.assertFalse(Post.objects.get(pk=self.new_post.pk).deleted)
+
+    def test_command_moves_cold_posts(self):
+        """Старые и удалённые посты переносятся вместе с комментариями."""
+        self.new_post.soft_delete()
+        self.archive()
+        self.assertFalse(Post.objects.exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertEqual(
+            set(ArchivedPost.objects.values_list('pk', 'deleted')),
+            {(self.old_post.pk, False), (self.new_post.pk, True)}
+        )
+        archived = ArchivedComment.objects.get()
+        self.assertEqual(archived.pk, self.comment.pk)
+        self.assertEqual(archived.post_id, self.old_post.pk)
+
+    def test_archived_post_pages(self):
+        """Страница, комментарии и профиль читают пост из архива."""
+        self.archive()
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.old_post.pk,))
+        )
+        self.assertContains(response, 'Старый пост')
+        self.assertTrue(response.context['archived'])
+        self.assertContains(self.client.get(
+            reverse('posts:post_comments', args=(self.old_post.pk,))
+        ), 'Комментарий')
+        response = self.client.get(
+            reverse('posts:profile', args=(self.author.username,))
+        )
+        self.assertEqual(
+            [post.text for post in response.context['page_obj']],
+            ['Новый пост', 'Старый пост']
+        )
+
+    def test_deleted_archived_post_is_not_found(self):
+        self.old_post.soft_delete()
+        self.archive()
+        self.assertEqual(self.client.get(
+            reverse('posts:post_detail', args=(self.old_post.pk,))
+        ).status_code, 404)
+
+    def test_notifications_follow_archived_posts(self):
+        """Архивация не удаляет уведомления о комментариях к постам."""
+        reader = User.objects.create_user(username='reader')
+        notification = Notification.objects.create(
+            recipient=self.author, kind=Notification.COMMENT,
+            post=self.old_post, actor=reader
+        )
+        self.archive()
+        notification.refresh_from_db()
+        self.assertIsNone(notification.post_id)
+        self.assertEqual(notification.archived_post_id, self.old_post.pk)
+        response = self.client.get(reverse('notifications:inbox'))
+        self.assertContains(
+            response, reverse('posts:post_detail', args=(self.old_post.pk,))
+        )
@@ -0,0 +1,96 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Comment, Follow, Group, Post, Recommendation, User
+
+
+class SeedCommandTests(TestCase):
+    def test_seed_creates_related_data(self):
+        """Команда seed создаёт связанные данные нужного объёма."""
+        call_command('seed', posts=200, seed=1, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 200)
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Group.objects.count(), 1)
+        self.assertEqual(Comment.objects.count(), 400)
+        self.assertTrue(Follow.objects.exists())
+        self.assertFalse(
+            Follow.objects.filter(user_id=F('author_id')).exists()
+        )
+
+    def test_seed_without_posts(self):
+        call_command('seed', posts=0, seed=1, stdout=StringIO())
+        self.assertFalse(Post.objects.exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertEqual(User.objects.count(), 2)
+
+    def test_seed_twice_with_same_seed(self):
+        """Повторный запуск с тем же --seed добавляет новые данные."""
+        for _ in range(2):
+            call_command('seed', posts=20, seed=1, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 40)
+        self.assertEqual(User.objects.count(), 4)
+        self.assertEqual(Group.objects.count(), 2)
+
+
+class ComputeRecommendationsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader, cls.friend, cls.author, cls.commenter = (
+            User.objects.create_user(username=name)
+            for name in ('reader', 'friend', 'author', 'commenter')
+        )
+        Follow.objects.create(user=cls.reader, author=cls.friend)
+        Follow.objects.create(user=cls.friend, author=cls.author)
+        for user in (cls.friend, cls.author, cls.commenter):
+            Post.objects.create(author=user, text='Текст')
+        post = Post.objects.filter(author=cls.friend).get()
+        for user in (cls.reader, cls.commenter):
+            Comment.objects.create(post=post, author=user, text='Текст')
+
+    def test_friends_of_friends_and_co_commenters(self):
+        """Рекомендуются авторы подписок и соседи по обсуждениям."""
+        call_command('compute_recommendations', stdout=StringIO())
+        recommended = list(
+            Recommendation.objects.filter(user=self.reader)
+            .values_list('author__username', 'score')
+        )
+        self.assertEqual(recommended, [('author', 1.0), ('commenter', 0.5)])
+
+    def test_old_recommendations_are_replaced(self):
+        """Повторный расчёт заменяет старые строки."""
+        Recommendation.objects.create(
+            user=self.commenter, author=self.reader, score=10
+        )
+        call_command('compute_recommendations', stdout=StringIO())
+        call_command('compute_recommendations', stdout=StringIO())
+        self.assertFalse(
+            Recommendation.objects.filter(author=self.reader).exists()
+        )
+        self.assertEqual(
+            Recommendation.objects.filter(user=self.reader).count(), 2
+        )
+
+    def test_new_recommendations_change_etag(self):
+        """Пересчёт рекомендаций меняет ETag ленты подписок."""
+        self.client.force_login(self.reader)
+        url = reverse('posts:follow_index')
+        etag = self.client.get(url)['ETag']
+        call_command('compute_recommendations', stdout=StringIO())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_shown_on_follow_index(self):
+        """Рекомендации выводятся в ленте подписок."""
+        call_command('compute_recommendations', stdout=StringIO())
+        self.client.force_login(self.reader)
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            [author['username'] for author in
+             response.context['recommendations']],
+            ['author', 'commenter']
+        )
@@ -1,4 +1,4 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 
 from ..models import User, Group, Post, Comment
@@ -86,3 +86,51 @@ class TestComments(TestCase):
             f'/posts/{self.post.id}/comment/'
         )
         self.assertRedirects(response, f'/posts/{self.post.id}/')
+
+
+@override_settings(COMMENT_AMOUNT=3)
+class TestCommentPages(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый текст')
+        cls.comment_ids = [
+            Comment.objects.create(
+                post=cls.post, author=cls.user, text=f'Комментарий {number}'
+            ).pk
+            for number in range(7)
+        ]
+
+    def test_comment_count_is_maintained(self):
+        """Счётчик комментариев обновляется при добавлении и удалении."""
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 7)
+        Comment.objects.get(pk=self.comment_ids[0]).delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 6)
+
+    def test_post_detail_shows_first_page(self):
+        """На странице поста только первая страница комментариев."""
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.post.pk,))
+        )
+        comments = response.context['comments']
+        self.assertEqual(
+            [comment.pk for comment in comments], self.comment_ids[:3]
+        )
+        self.assertTrue(comments.has_next)
+
+    def test_fragment_pages_follow_cursor(self):
+        """Фрагменты по курсору отдают все комментарии по порядку."""
+        url = reverse('posts:post_comments', args=(self.post.pk,))
+        received = []
+        cursor = ''
+        for _ in range(3):
+            response = self.client.get(url, {'cursor': cursor})
+            comments = response.context['comments']
+            received.extend(comment.pk for comment in comments)
+            cursor = comments.next_cursor
+        self.assertEqual(received, self.comment_ids)
+        self.assertIsNone(cursor)
+        self.assertNotContains(response, 'comments-next')
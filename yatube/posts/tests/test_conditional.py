@@ -0,0 +1,108 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Group, Post, User
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, group=cls.group, text='Тестовый текст'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def revalidate(self, client, url):
+        # Первый ответ выставляет CSRF-куку, а она входит в ETag.
+        client.get(url)
+        etag = client.get(url)['ETag']
+        return client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_pages_return_not_modified(self):
+        """Неизменившиеся страницы отдаются с кодом 304."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+            reverse('posts:follow_index'),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.revalidate(self.authorized_client, url)
+                self.assertEqual(response.status_code, 304)
+
+    def test_new_post_changes_feed_etag(self):
+        """Новый пост меняет ETag ленты."""
+        url = reverse('posts:group_list', args=(self.group.slug,))
+        etag = self.client.get(url)['ETag']
+        Post.objects.create(
+            author=self.user, group=self.group, text='Новый пост'
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_new_comment_changes_post_etag(self):
+        """Новый комментарий меняет ETag страницы поста."""
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        etag = self.client.get(url)['ETag']
+        Comment.objects.create(
+            post=self.post, author=self.user, text='Комментарий'
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_renamed_author_changes_feed_etag(self):
+        """Смена имени автора меняет ETag ленты, а вход — нет."""
+        url = reverse('posts:group_list', args=(self.group.slug,))
+        etag = self.client.get(url)['ETag']
+        self.client.force_login(self.user)
+        self.client.logout()
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+        self.user.first_name = 'Новое имя'
+        self.user.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, 'Новое имя')
+
+    def test_other_users_do_not_change_feed_etag(self):
+        """Регистрация и правка профиля читателя не меняют ETag ленты."""
+        url = reverse('posts:index')
+        etag = self.client.get(url)['ETag']
+        reader = User.objects.create_user(username='reader')
+        reader.first_name = 'Читатель'
+        reader.save()
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+    def test_renamed_author_changes_profile_etag(self):
+        """Имя автора без постов тоже входит в ETag профиля."""
+        reader = User.objects.create_user(username='reader')
+        url = reverse('posts:profile', args=(reader.username,))
+        etag = self.client.get(url)['ETag']
+        reader.first_name = 'Читатель'
+        reader.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_depends_on_user(self):
+        """Разные пользователи получают разные ETag."""
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        self.assertNotEqual(
+            self.client.get(url)['ETag'],
+            self.authorized_client.get(url)['ETag'],
+        )
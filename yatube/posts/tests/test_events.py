@@ -0,0 +1,130 @@
+import asyncio
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.wsgi import get_wsgi_application
+from django.test import Client, TransactionTestCase
+
+from core.asgi import ASGIHandler
+from core.pubsub import bus
+from ..events import CHANNEL, publisher
+from ..models import Follow, Post, User
+
+
+class EventStream:
+    """Клиент server-sent events поверх ASGI-приложения."""
+
+    def __init__(self, application, query, cookie=None):
+        headers = [(b'cookie', cookie.encode())] if cookie else []
+        self.scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': settings.EVENTS_PATH,
+            'query_string': query.encode(),
+            'headers': headers,
+        }
+        self.application = application
+        self.sent = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.requested = False
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {'type': 'http.request', 'body': b''}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    def start(self):
+        self.task = asyncio.ensure_future(
+            self.application(self.scope, self.receive, self.sent.put)
+        )
+
+    async def next(self):
+        return await asyncio.wait_for(self.sent.get(), timeout=5)
+
+    async def close(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, timeout=5)
+
+
+class PostEventsTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        publisher.last_id = None
+        self.application = ASGIHandler(get_wsgi_application(), max_workers=2)
+        self.author = User.objects.create_user(username='author')
+        self.other = User.objects.create_user(username='other')
+        self.reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=self.reader, author=self.author)
+
+    def session_cookie(self, user):
+        client = Client()
+        client.force_login(user)
+        name = settings.SESSION_COOKIE_NAME
+        return f'{name}={client.cookies[name].value}'
+
+    def test_new_post_is_pushed(self):
+        """Новый пост приходит подключённым клиентам ленты."""
+        async def scenario():
+            stream = EventStream(self.application, 'feed=index')
+            stream.start()
+            start = await stream.next()
+            self.assertEqual(start['status'], 200)
+            self.assertIn(
+                (b'content-type', b'text/event-stream'), start['headers']
+            )
+            await stream.next()
+            post = Post.objects.create(text='Новый пост', author=self.author)
+            event = await stream.next()
+            await stream.close()
+            return post, event['body'].decode()
+
+        post, body = asyncio.run(scenario())
+        self.assertTrue(body.startswith('event: post\n'))
+        self.assertIn(f'"id": {post.pk}', body)
+
+    def test_follow_feed_filters_authors(self):
+        """Лента подписок получает только посты своих авторов."""
+        cookie = self.session_cookie(self.reader)
+
+        async def scenario():
+            stream = EventStream(self.application, 'feed=follow', cookie)
+            stream.start()
+            await stream.next()
+            await stream.next()
+            Post.objects.create(text='Чужой пост', author=self.other)
+            post = Post.objects.create(text='Пост', author=self.author)
+            event = await stream.next()
+            await stream.close()
+            return post, event['body'].decode()
+
+        post, body = asyncio.run(scenario())
+        self.assertIn(f'"id": {post.pk}', body)
+
+    def test_follow_feed_requires_login(self):
+        async def scenario():
+            stream = EventStream(self.application, 'feed=follow')
+            stream.start()
+            start = await stream.next()
+            await stream.close()
+            return start['status']
+
+        self.assertEqual(asyncio.run(scenario()), 403)
+
+    def test_poll_finds_posts_of_other_processes(self):
+        """Опрос находит посты, о которых не было ни сигнала, ни версии."""
+        async def scenario():
+            queue = bus.subscribe(CHANNEL)
+            publisher.poll()
+            post, = Post.objects.bulk_create(
+                [Post(text='Пост из другого процесса', author=self.author)]
+            )
+            publisher.poll()
+            message = await asyncio.wait_for(queue.get(), timeout=5)
+            bus.unsubscribe(CHANNEL, queue)
+            return message
+
+        message = asyncio.run(scenario())
+        self.assertEqual(message['author_id'], self.author.pk)
+        self.assertEqual(message['id'], Post.objects.get().pk)
@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post, User
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author')
+        self.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        self.post = Post.objects.create(
+            text='Пост в группе', author=self.author, group=self.group
+        )
+        Post.objects.create(text='Пост без группы', author=self.author)
+
+    def test_feeds_render(self):
+        """Ленты отдают RSS и Atom с постами своей выборки."""
+        cases = (
+            ('posts:index_rss', (), 'application/rss+xml', 2),
+            ('posts:index_atom', (), 'application/atom+xml', 2),
+            ('posts:group_rss', ('group',), 'application/rss+xml', 1),
+            ('posts:profile_atom', ('author',), 'application/atom+xml', 2),
+        )
+        for name, args, content_type, items in cases:
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name, args=args))
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response['Content-Type'].startswith(
+                    content_type
+                ))
+                tag = b'<item>' if 'rss' in content_type else b'<entry>'
+                self.assertEqual(response.content.count(tag), items)
+
+    def test_unknown_group(self):
+        response = self.client.get(reverse('posts:group_rss', args=('nope',)))
+        self.assertEqual(response.status_code, 404)
+
+    def test_cached_feed_does_not_query(self):
+        """Повторная выдача ленты идёт из кэша без запросов к базе."""
+        url = reverse('posts:index_rss')
+        first = self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            second = self.client.get(url)
+        self.assertEqual(context.captured_queries, [])
+        self.assertEqual(first.content, second.content)
+
+    def test_conditional_requests(self):
+        """ETag и Last-Modified дают 304, пока посты не изменились."""
+        url = reverse('posts:index_atom')
+        response = self.client.get(url)
+        self.assertEqual(self.client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code, 304)
+        self.assertEqual(self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        ).status_code, 304)
+        Post.objects.create(text='Новый пост', author=self.author)
+        self.assertEqual(self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        ).status_code, 200)
+        self.assertEqual(self.client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code, 200)
+
+    def test_renamed_group_rebuilds_feed(self):
+        """Лента перестраивается после смены названия группы."""
+        url = reverse('posts:index_rss')
+        response = self.client.get(url)
+        self.group.title = 'Новое название'
+        self.group.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Новое название')
@@ -1,4 +1,4 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 
 from ..models import User, Group, Post, Follow
@@ -102,3 +102,12 @@ class TestFollowing(TestCase):
             reverse('posts:follow_index')
         )
         self.assertNotIn(new_post, response.context['page_obj'])
+
+    @override_settings(FOLLOW_INDEX_MAX_IDS=0)
+    def test_many_subscriptions_feed(self):
+        """При большом числе подписок лента строится подзапросом."""
+        Follow.objects.create(user=self.follower, author=self.author)
+        response = self.authorized_follower_client.get(
+            reverse('posts:follow_index')
+        )
+        self.assertIn(self.post, response.context['page_obj'])
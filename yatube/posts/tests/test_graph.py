@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.versions import bump_version
+from ..graph import FOLLOWEES, VERSION_NAME, follow_graph
+from ..models import Follow, User
+
+
+class FollowGraphTests(TransactionTestCase):
+    def setUp(self):
+        follow_graph.clear()
+        self.reader = User.objects.create_user(username='reader')
+        self.authors = [
+            User.objects.create_user(username=f'author{number}')
+            for number in range(3)
+        ]
+        for author in self.authors[:2]:
+            Follow.objects.create(user=self.reader, author=author)
+
+    def test_arrays_are_sorted(self):
+        """Подписки и подписчики хранятся по возрастанию id."""
+        self.assertEqual(
+            list(follow_graph.followees(self.reader.pk)),
+            sorted(author.pk for author in self.authors[:2])
+        )
+        self.assertEqual(
+            list(follow_graph.followers(self.authors[0].pk)),
+            [self.reader.pk]
+        )
+
+    def test_lookups_do_not_query_after_load(self):
+        """Повторные проверки подписки не обращаются к базе."""
+        follow_graph.followees(self.reader.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(
+                follow_graph.is_following(self.reader.pk, self.authors[0].pk)
+            )
+            self.assertFalse(
+                follow_graph.is_following(self.reader.pk, self.authors[2].pk)
+            )
+        self.assertEqual(len(queries), 0)
+
+    def test_signals_invalidate_graph(self):
+        """Подписка и отписка сразу видны в графе."""
+        author = self.authors[2]
+        follow_graph.followees(self.reader.pk)
+        Follow.objects.create(user=self.reader, author=author)
+        self.assertTrue(follow_graph.is_following(self.reader.pk, author.pk))
+        Follow.objects.filter(author=author).get().delete()
+        self.assertFalse(
+            follow_graph.is_following(self.reader.pk, author.pk)
+        )
+
+    def test_other_process_changes_are_seen(self):
+        """Подписка из другого процесса видна по версии в общем кэше."""
+        author = self.authors[2]
+        follow_graph.followees(self.reader.pk)
+        # Другой процесс: строка без сигналов и новая версия.
+        Follow.objects.bulk_create([Follow(user=self.reader, author=author)])
+        bump_version(VERSION_NAME.format(FOLLOWEES, self.reader.pk))
+        self.assertTrue(follow_graph.is_following(self.reader.pk, author.pk))
+
+
+class FollowGraphTransactionTests(TestCase):
+    def test_not_cached_inside_transaction(self):
+        """Данные, прочитанные в транзакции, не запоминаются."""
+        reader = User.objects.create_user(username='reader')
+        follow_graph.followees(reader.pk)
+        with CaptureQueriesContext(connection) as queries:
+            follow_graph.followees(reader.pk)
+        self.assertEqual(len(queries), 1)
@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import TestCase
+
+from ..models import Group, Post, User
+
+
+class PostCardsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.template = Template(
+            '{% load post_cards %}{% post_cards posts as cards %}'
+            '{% for card in cards %}{{ card }}{% endfor %}'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(
+            author=self.user,
+            group=self.group,
+            text='Первая версия',
+        )
+
+    def render(self):
+        posts = Post.objects.select_related('author', 'group')
+        return self.template.render(Context({'posts': posts}))
+
+    def test_cards_are_served_from_cache(self):
+        """Повторный вывод карточек берёт HTML из кэша."""
+        Post.objects.create(author=self.user, text='Второй пост')
+        first = self.render()
+        self.assertIn('Первая версия', first)
+        self.assertEqual(first.count('<article>'), 2)
+        posts = list(Post.objects.select_related('author', 'group'))
+        with self.assertNumQueries(0):
+            second = self.template.render(Context({'posts': posts}))
+        self.assertEqual(first, second)
+
+    def test_card_is_rerendered_after_edit(self):
+        """После изменения поста карточка рендерится заново."""
+        self.render()
+        self.post.text = 'Вторая версия'
+        self.post.save()
+        html = self.render()
+        self.assertIn('Вторая версия', html)
+        self.assertNotIn('Первая версия', html)
+
+    def test_only_renamed_author_cards_are_rerendered(self):
+        """Правка автора сбрасывает только карточки его постов."""
+        other = User.objects.create_user(username='other')
+        Post.objects.create(author=other, text='Чужой пост')
+        self.render()
+        self.user.first_name = 'Новое имя'
+        self.user.save()
+        User.objects.create_user(username='reader')
+        posts = list(Post.objects.select_related('author', 'group'))
+        with self.assertTemplateUsed('posts/includes/post_card.html',
+                                     count=1):
+            html = self.template.render(Context({'posts': posts}))
+        self.assertIn('Новое имя', html)
+
+    def test_renamed_group_rerenders_cards(self):
+        self.render()
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'new-slug'
+        group.save()
+        self.assertIn('new-slug', self.render())
@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post, User
+from ..sitemaps import (
+    INDEX_NAME, build_sitemaps, shard_filename, write_file
+)
+
+
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        settings = override_settings(
+            SITEMAP_ROOT=self.root, SITEMAP_SHARD_SIZE=2,
+            SITE_URL='https://yatube.example'
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.author = User.objects.create_user(username='author')
+        Group.objects.create(title='Группа', slug='group', description='')
+        self.posts = [
+            Post.objects.create(text=f'Пост {number}', author=self.author)
+            for number in range(5)
+        ]
+
+    def read(self, filename):
+        with open(os.path.join(self.root, filename)) as file:
+            return file.read()
+
+    def shard_of(self, post):
+        return shard_filename('posts', post.pk // 2)
+
+    def test_shards_by_id_range(self):
+        """Посты раскладываются по шардам по диапазонам id."""
+        build_sitemaps()
+        for post in self.posts:
+            self.assertIn(
+                'https://yatube.example'
+                + reverse('posts:post_detail', args=(post.pk,)),
+                self.read(self.shard_of(post))
+            )
+        index = self.read('sitemap.xml')
+        for post in self.posts:
+            self.assertIn(self.shard_of(post), index)
+        self.assertIn(shard_filename('groups', 0), index)
+
+    def test_only_changed_shards_are_rebuilt(self):
+        """Новые и удалённые посты перестраивают только свои шарды."""
+        _, total = build_sitemaps()
+        self.assertEqual(build_sitemaps(), (0, total))
+        new_post = Post.objects.create(text='Новый', author=self.author)
+        built, _ = build_sitemaps()
+        self.assertEqual(built, 1)
+        self.assertIn(
+            reverse('posts:post_detail', args=(new_post.pk,)),
+            self.read(self.shard_of(new_post))
+        )
+        removed = next(
+            post for post in self.posts
+            if sum(other.pk // 2 == post.pk // 2 for other in self.posts) == 2
+        )
+        location = reverse('posts:post_detail', args=(removed.pk,))
+        filename = self.shard_of(removed)
+        removed.delete()
+        built, _ = build_sitemaps()
+        self.assertEqual(built, 1)
+        self.assertNotIn(location, self.read(filename))
+
+    def test_views_serve_files(self):
+        """Индекс строится при первом запросе, шарды отдаются с диска."""
+        response = self.client.get(reverse('posts:sitemap'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'<sitemapindex', b''.join(response.streaming_content))
+        response = self.client.get(reverse(
+            'posts:sitemap_shard', args=(self.shard_of(self.posts[0]),)
+        ))
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(reverse(
+            'posts:sitemap_shard', args=('sitemap-posts-999.xml',)
+        ))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(CONCURRENT_QUERIES=True)
+    def test_missing_index_is_built_before_response(self):
+        """Первый запрос не получает 404, пока индекс строится в фоне."""
+        with mock.patch('posts.sitemaps.submit') as submit:
+            response = self.client.get(reverse('posts:sitemap'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'<sitemapindex', b''.join(response.streaming_content))
+        submit.assert_not_called()
+
+    def test_failed_write_keeps_previous_file(self):
+        """Временные файлы не остаются, прежний файл не портится."""
+        build_sitemaps()
+        path = os.path.join(self.root, INDEX_NAME)
+        previous = self.read(INDEX_NAME)
+
+        def fail(file):
+            file.write('<sitemapindex')
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            write_file(path, fail)
+        self.assertEqual(self.read(INDEX_NAME), previous)
+        self.assertFalse([
+            name for name in os.listdir(self.root)
+            if name.startswith(f'.{INDEX_NAME}')
+        ])
@@ -0,0 +1,95 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import ActivityBucket, Comment, Group, Post, User
+from ..trending import (
+    get_trending, rebuild_buckets, record_activity, refresh_trending
+)
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.groups = [
+            Group.objects.create(
+                title=f'Группа {number}', slug=f'group-{number}',
+                description='Описание'
+            )
+            for number in range(2)
+        ]
+        cls.posts = [
+            Post.objects.create(
+                author=cls.user, group=cls.groups[0], text=f'Пост {number}'
+            )
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def comment(self, post, count):
+        for _ in range(count):
+            Comment.objects.create(post=post, author=self.user, text='Текст')
+
+    def test_posts_ranked_by_comment_velocity(self):
+        """Посты упорядочены по числу свежих комментариев."""
+        self.comment(self.posts[1], 3)
+        self.comment(self.posts[2], 1)
+        self.assertEqual(
+            refresh_trending()['posts'],
+            [self.posts[1].pk, self.posts[2].pk]
+        )
+
+    def test_old_activity_decays(self):
+        """Старые комментарии весят меньше новых."""
+        day_ago = time.time() - 24 * settings.TRENDING_BUCKET_SECONDS
+        for _ in range(5):
+            record_activity(
+                ActivityBucket.COMMENTS, self.posts[0].pk, day_ago
+            )
+        self.comment(self.posts[1], 1)
+        self.assertEqual(
+            refresh_trending()['posts'][0], self.posts[1].pk
+        )
+
+    def test_groups_ranked_by_posting_activity(self):
+        """Группы упорядочены по числу новых постов."""
+        Post.objects.create(
+            author=self.user, group=self.groups[1], text='Пост'
+        )
+        self.assertEqual(
+            refresh_trending()['groups'],
+            [self.groups[0].pk, self.groups[1].pk]
+        )
+
+    def test_served_from_cache(self):
+        """Готовый список отдаётся без запросов к базе."""
+        refresh_trending()
+        with CaptureQueriesContext(connection) as queries:
+            get_trending()
+        self.assertEqual(len(queries), 0)
+
+    def test_rebuild_buckets(self):
+        """Счётчики восстанавливаются из комментариев и постов."""
+        self.comment(self.posts[0], 2)
+        ActivityBucket.objects.all().delete()
+        rebuild_buckets()
+        self.assertEqual(refresh_trending()['posts'], [self.posts[0].pk])
+
+    def test_trending_page(self):
+        """Страница популярного выводит посты в порядке рейтинга."""
+        self.comment(self.posts[2], 2)
+        self.comment(self.posts[0], 1)
+        response = self.client.get(reverse('posts:trending'))
+        self.assertEqual(
+            response.context['posts'], [self.posts[2], self.posts[0]]
+        )
+        self.assertEqual(response.context['groups'], [self.groups[0]])
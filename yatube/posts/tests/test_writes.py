@@ -0,0 +1,159 @@
+import threading
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.versions import get_version
+from ..graph import follow_graph
+from ..models import ActivityBucket, Comment, Follow, Post, User
+from ..writes import Batch, Operation, write_buffer
+
+
+class WriteBufferTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        follow_graph.clear()
+        self.reader = User.objects.create_user(username='reader')
+        self.author = User.objects.create_user(username='author')
+        self.post = Post.objects.create(text='Пост', author=self.author)
+
+    def test_follow_toggles_are_coalesced(self):
+        """Подписка и отписка в одном пакете сводятся к последней."""
+        batch = Batch()
+        batch.follows[self.reader.pk, self.author.pk] = True
+        batch.follows[self.reader.pk, self.author.pk] = False
+        batch.follows[self.author.pk, self.reader.pk] = True
+        write_buffer.write(batch)
+        self.assertFalse(Follow.objects.filter(
+            user=self.reader, author=self.author).exists())
+        self.assertTrue(Follow.objects.filter(
+            user=self.author, author=self.reader).exists())
+
+    def test_comments_are_inserted_in_bulk(self):
+        """Комментарии пакета вставляются одним запросом."""
+        batch = Batch()
+        batch.comments = [
+            Comment(text=f'Комментарий {number}', author=self.reader,
+                    post=self.post)
+            for number in range(5)
+        ]
+        with CaptureQueriesContext(connection) as context:
+            write_buffer.write(batch)
+        inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "posts_comment"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 5)
+        self.assertEqual(ActivityBucket.objects.get(
+            kind=ActivityBucket.COMMENTS, object_id=self.post.pk
+        ).count, 5)
+
+    def test_writer_sees_own_follow(self):
+        """Сразу после подписки профиль показывает кнопку отписки."""
+        self.client.force_login(self.reader)
+        self.client.get(reverse('posts:profile', args=('author',)))
+        self.client.get(reverse('posts:profile_follow', args=('author',)))
+        response = self.client.get(reverse('posts:profile', args=('author',)))
+        self.assertTrue(response.context['following'])
+
+
+@override_settings(WRITE_BUFFER_DELAY=0.05)
+class GroupCommitTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        follow_graph.clear()
+        self.authors = [
+            User.objects.create_user(username=f'author{number}')
+            for number in range(5)
+        ]
+        self.reader = User.objects.create_user(username='reader')
+
+    def test_concurrent_follows_share_a_transaction(self):
+        """Одновременные подписки записываются одним пакетом."""
+        barrier = threading.Barrier(len(self.authors))
+        writes = []
+        original = write_buffer.write
+
+        def write(batch):
+            writes.append(len(batch.follows))
+            original(batch)
+
+        def follow(author):
+            try:
+                barrier.wait()
+                write_buffer.follow(self.reader.pk, author.pk)
+            finally:
+                connection.close()
+
+        write_buffer.write = write
+        try:
+            threads = [
+                threading.Thread(target=follow, args=(author,))
+                for author in self.authors
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            del write_buffer.write
+        self.assertEqual(sum(writes), len(self.authors))
+        self.assertLess(len(writes), len(self.authors))
+        self.assertEqual(
+            list(follow_graph.followees(self.reader.pk)),
+            sorted(author.pk for author in self.authors)
+        )
+
+    def test_versions_change_after_commit(self):
+        """Версии меняются только после коммита пакета."""
+        post = Post.objects.create(text='Пост', author=self.authors[0])
+        names = ('posts.follow', 'posts.comment', f'posts.comment:{post.pk}')
+        before = [get_version(name) for name in names]
+        batch = Batch()
+        batch.follows[self.reader.pk, self.authors[0].pk] = True
+        batch.comments.append(
+            Comment(text='Комментарий', author=self.reader, post=post)
+        )
+        with transaction.atomic():
+            write_buffer.write(batch)
+            self.assertEqual([get_version(name) for name in names], before)
+        for name, version in zip(names, before):
+            with self.subTest(name=name):
+                self.assertNotEqual(get_version(name), version)
+
+    def test_failed_operation_does_not_fail_the_batch(self):
+        """Ошибку получает только операция, которую нельзя записать."""
+        post = Post.objects.create(text='Пост', author=self.authors[0])
+        missing_post_id = post.pk + 1
+        operations = [
+            Operation(lambda batch: batch.follows.__setitem__(
+                (self.reader.pk, self.authors[1].pk), True
+            )),
+            Operation(lambda batch: batch.comments.append(Comment(
+                text='Комментарий', author=self.reader,
+                post_id=missing_post_id
+            ))),
+            Operation(lambda batch: batch.comments.append(Comment(
+                text='Комментарий', author=self.reader, post=post
+            ))),
+        ]
+        batch = Batch()
+        for operation in operations:
+            operation.add(batch)
+            batch.operations.append(operation)
+        write_buffer.flush(batch)
+        self.assertIsNone(operations[0].error)
+        self.assertIsInstance(operations[1].error, IntegrityError)
+        self.assertIsNone(operations[2].error)
+        self.assertTrue(Follow.objects.filter(
+            user=self.reader, author=self.authors[1]
+        ).exists())
+        self.assertEqual(
+            list(Comment.objects.values_list('post_id', flat=True)),
+            [post.pk]
+        )
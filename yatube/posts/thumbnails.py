@@ -0,0 +1,16 @@
+from sorl.thumbnail import get_thumbnail
+
+# Должны совпадать с {% thumbnail %} в шаблонах постов.
+POST_THUMBNAILS = (
+    ('960x339', {'crop': 'center', 'upscale': True}),
+)
+
+
+def make_thumbnails(image_name):
+    """Заранее создаёт миниатюры картинки поста.
+
+    Иначе их создаёт первый запрос страницы с постом, в потоке
+    рендеринга шаблона.
+    """
+    for geometry, options in POST_THUMBNAILS:
+        get_thumbnail(image_name, geometry, **options)
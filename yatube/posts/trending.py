@@ -0,0 +1,133 @@
+import heapq
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from core.concurrent import submit
+from .models import ActivityBucket, Comment, Post
+
+TRENDING_KEY = 'trending'
+TRENDING_LOCK_KEY = 'trending:lock'
+
+
+def get_bucket(timestamp=None):
+    if timestamp is None:
+        timestamp = time.time()
+    return int(timestamp // settings.TRENDING_BUCKET_SECONDS)
+
+
+def record_activity(kind, object_id, timestamp=None, amount=1):
+    """Увеличивает счётчик объекта в текущем интервале."""
+    bucket = get_bucket(timestamp)
+    counter = ActivityBucket.objects.filter(
+        kind=kind, object_id=object_id, bucket=bucket
+    )
+    if counter.update(count=F('count') + amount):
+        return
+    try:
+        with transaction.atomic():
+            ActivityBucket.objects.create(
+                kind=kind, object_id=object_id, bucket=bucket, count=amount
+            )
+    except IntegrityError:
+        counter.update(count=F('count') + amount)
+
+
+def rebuild_buckets(now=None):
+    """Пересобирает счётчики окна из комментариев и постов.
+
+    Нужна после массовой загрузки данных в обход сигналов. Читаются
+    только записи за окно, а не таблицы целиком.
+    """
+    now = get_bucket(now)
+    since = datetime.fromtimestamp(
+        (now - settings.TRENDING_WINDOW + 1)
+        * settings.TRENDING_BUCKET_SECONDS,
+        tz=timezone.utc
+    )
+    counts = Counter()
+    comments = Comment.objects.filter(
+        created__gte=since
+    ).values_list('post_id', 'created')
+    for post_id, created in comments.iterator():
+        counts[ActivityBucket.COMMENTS, post_id,
+               get_bucket(created.timestamp())] += 1
+    posts = Post.live.filter(
+        pub_date__gte=since, group__isnull=False
+    ).values_list('group_id', 'pub_date')
+    for group_id, pub_date in posts.iterator():
+        counts[ActivityBucket.POSTS, group_id,
+               get_bucket(pub_date.timestamp())] += 1
+    with transaction.atomic():
+        ActivityBucket.objects.all().delete()
+        ActivityBucket.objects.bulk_create(
+            ActivityBucket(
+                kind=kind, object_id=object_id, bucket=bucket, count=count
+            )
+            for (kind, object_id, bucket), count in counts.items()
+        )
+    return len(counts)
+
+
+def top_scores(kind, now):
+    """Лучшие объекты по сумме счётчиков с экспоненциальным затуханием.
+
+    Вес интервала уменьшается вдвое каждые TRENDING_HALF_LIFE интервалов,
+    поэтому оценка отражает скорость появления событий, а не их число.
+    """
+    since = now - settings.TRENDING_WINDOW + 1
+    scores = defaultdict(float)
+    rows = ActivityBucket.objects.filter(
+        kind=kind, bucket__gte=since
+    ).values_list('object_id', 'bucket', 'count')
+    for object_id, bucket, count in rows.iterator():
+        age = max(now - bucket, 0)
+        scores[object_id] += count * 0.5 ** (
+            age / settings.TRENDING_HALF_LIFE
+        )
+    return heapq.nlargest(
+        settings.TRENDING_SIZE, scores.items(), key=lambda item: item[1]
+    )
+
+
+def refresh_trending():
+    """Пересчитывает списки лучших постов и групп и кладёт их в кэш."""
+    now = get_bucket()
+    ActivityBucket.objects.filter(
+        bucket__lt=now - settings.TRENDING_WINDOW + 1
+    ).delete()
+    trending = {
+        'refreshed': time.time(),
+        'posts': [
+            object_id for object_id, _ in
+            top_scores(ActivityBucket.COMMENTS, now)
+        ],
+        'groups': [
+            object_id for object_id, _ in
+            top_scores(ActivityBucket.POSTS, now)
+        ],
+    }
+    cache.set(TRENDING_KEY, trending, None)
+    return trending
+
+
+def get_trending():
+    """Готовые списки id популярных постов и групп.
+
+    Устаревший список отдаётся сразу, а пересчитывается в фоне одним
+    процессом (блокировка в кэше).
+    """
+    trending = cache.get(TRENDING_KEY)
+    if trending is None:
+        return refresh_trending()
+    expires = trending['refreshed'] + settings.TRENDING_REFRESH
+    if expires < time.time() and cache.add(
+        TRENDING_LOCK_KEY, True, settings.TRENDING_REFRESH
+    ):
+        submit(refresh_trending)
+    return trending
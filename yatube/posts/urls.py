@@ -1,21 +1,46 @@
-from django.urls import path
-from . import views
+from django.urls import path, re_path
+from . import feeds, views
 
 app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('rss/', feeds.latest_rss, name='index_rss'),
+    path('atom/', feeds.latest_atom, name='index_atom'),
+    path('trending/', views.trending, name='trending'),
     path('group/<slug:group_name>/', views.group_posts, name='group_list'),
+    path('group/<slug:group_name>/rss/', feeds.group_rss, name='group_rss'),
+    path(
+        'group/<slug:group_name>/atom/', feeds.group_atom, name='group_atom'
+    ),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path('profile/<str:username>/rss/', feeds.author_rss, name='profile_rss'),
+    path(
+        'profile/<str:username>/atom/', feeds.author_atom, name='profile_atom'
+    ),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path(
+        'posts/<int:post_id>/delete/', views.post_delete, name='post_delete'
+    ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
     path(
         'posts/<int:post_id>/comment/',
         views.add_comment,
         name='add_comment'
     ),
     path('follow/', views.follow_index, name='follow_index'),
+    path('sitemap.xml', views.sitemap_index, name='sitemap'),
+    re_path(
+        r'^(?P<filename>sitemap-[a-z]+-[0-9]+\.xml)$',
+        views.sitemap_shard,
+        name='sitemap_shard'
+    ),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
@@ -1,31 +1,103 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.core.paginator import Paginator
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.cache import cache_page
+from django.views.decorators.http import condition, require_POST
+from django.views.static import serve
 
-from .models import Group, Post, User, Follow
+from core.concurrent import gather, submit
+from core.conditional import PROFILE_VERSION, make_etag, versions_etag
+from core.paginator import (
+    ChainedQuerySets, EstimatedCountPaginator, cached_count,
+    paginate_by_cursor
+)
+from core.versions import get_version
+from .models import ArchivedPost, Group, Post, User, Follow
+from .events import events_url
 from .forms import PostForm, CommentForm
+from .graph import follow_graph
+from .recommendations import get_recommendations
+from .sitemaps import INDEX_NAME, refresh_sitemaps
+from .trending import get_trending
+from .thumbnails import make_thumbnails
+from .writes import write_buffer
 
 
+def get_post_or_archived(post_id):
+    """Пост и его комментарии; если пост перенесён в архив — оттуда."""
+    post = Post.live.select_related('group', 'author').filter(
+        pk=post_id
+    ).first()
+    if post is None:
+        post = get_object_or_404(
+            ArchivedPost.objects.select_related('group', 'author'),
+            pk=post_id,
+            deleted=False
+        )
+    return post, post.comments.select_related('author')
+
+
+def post_detail_etag(request, post_id):
+    post = Post.live.filter(pk=post_id).values(
+        'updated', 'author_id', 'author__username', 'group_id'
+    ).first()
+    if post is None:
+        return None
+    return make_etag(
+        request,
+        post['updated'].isoformat(),
+        get_version(f'posts.post:{post["author_id"]}'),
+        get_version(f'posts.comment:{post_id}'),
+        get_version(PROFILE_VERSION.format(post['author__username'])),
+        get_version(f'posts.group:{post["group_id"]}'),
+    )
+
+
+def profile_etag(request, username):
+    # Имя автора видно и на странице без постов.
+    return make_etag(request, *(get_version(name) for name in (
+        'posts.post', 'posts.follow', 'posts.recommendation',
+        PROFILE_VERSION.format(username),
+    )))
+
+
+@condition(etag_func=versions_etag('posts.post'))
 @cache_page(20, key_prefix='index_page')
 def index(request):
     template = 'posts/index.html'
-    post_list = Post.objects.select_related('group').all()
-    paginator = Paginator(post_list, settings.POST_AMOUNT)
+    post_list = Post.live.select_related('group', 'author').all()
+    paginator = EstimatedCountPaginator(post_list, settings.POST_AMOUNT)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     context = {
         'page_obj': page_obj,
+        'events_url': events_url('index'),
     }
     return render(request, template, context)
 
 
+def trending(request):
+    template = 'posts/trending.html'
+    top = get_trending()
+    posts = Post.live.select_related('group', 'author').in_bulk(
+        top['posts']
+    )
+    groups = Group.objects.in_bulk(top['groups'])
+    context = {
+        'posts': [posts[pk] for pk in top['posts'] if pk in posts],
+        'groups': [groups[pk] for pk in top['groups'] if pk in groups],
+    }
+    return render(request, template, context)
+
+
+@condition(etag_func=versions_etag('posts.post'))
 def group_posts(request, group_name):
     template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=group_name)
-    post_list = group.posts.select_related('group').all()
-    paginator = Paginator(post_list, settings.POST_AMOUNT)
+    post_list = group.posts(manager='live').select_related(
+        'group', 'author'
+    ).all()
+    paginator = EstimatedCountPaginator(post_list, settings.POST_AMOUNT)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     context = {
@@ -35,38 +107,78 @@ def group_posts(request, group_name):
     return render(request, template, context)
 
 
+@condition(etag_func=profile_etag)
 def profile(request, username):
     template = 'posts/profile.html'
     author = get_object_or_404(User, username=username)
-    post_list = author.posts.select_related('group', 'author').all()
-    paginator = Paginator(post_list, settings.POST_AMOUNT)
+    post_list = author.posts(manager='live').select_related(
+        'group', 'author'
+    ).all()
+    archived = author.archived_posts.select_related(
+        'group', 'author'
+    ).filter(deleted=False)
+    if cached_count(archived):
+        # Архивные посты старше оставшихся, поэтому идут следом.
+        post_list = ChainedQuerySets(post_list, archived)
+    paginator = EstimatedCountPaginator(post_list, settings.POST_AMOUNT)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
-    following = (request.user.is_authenticated and Follow.objects.filter(
-        user=request.user,
-        author=author).exists()
+    following = (
+        request.user.is_authenticated
+        and follow_graph.is_following(request.user.pk, author.pk)
+    )
+    recommendations = (
+        get_recommendations(author.pk) if request.user == author else []
     )
     context = {
         'following': following,
+        'recommendations': recommendations,
         'author': author,
         'page_obj': page_obj,
     }
     return render(request, template, context)
 
 
+@condition(etag_func=post_detail_etag)
 def post_detail(request, post_id):
     template = 'posts/post_detail.html'
-    post = Post.objects.select_related('group', 'author').get(id=post_id)
-    comments_in_post = post.comments.select_related('author').all()
+    post, comments = get_post_or_archived(post_id)
+    comments, author_posts_count = gather(
+        lambda: paginate_by_cursor(
+            comments,
+            None,
+            settings.COMMENT_AMOUNT,
+            'created'
+        ),
+        lambda: Post.live.filter(author_id=post.author_id).count(),
+    )
     comment_form = CommentForm()
     context = {
         'post': post,
-        'comments': comments_in_post,
+        'archived': isinstance(post, ArchivedPost),
+        'comments': comments,
+        'author_posts_count': author_posts_count,
         'comment_form': comment_form,
     }
     return render(request, template, context)
 
 
+def post_comments(request, post_id):
+    template = 'posts/includes/comments.html'
+    post, comments = get_post_or_archived(post_id)
+    comments = paginate_by_cursor(
+        comments,
+        request.GET.get('cursor'),
+        settings.COMMENT_AMOUNT,
+        'created'
+    )
+    context = {
+        'post': post,
+        'comments': comments,
+    }
+    return render(request, template, context)
+
+
 @login_required
 def post_create(request):
     template = 'posts/create_post.html'
@@ -82,6 +194,8 @@ def post_create(request):
         post = form.save(commit=False)
         post.author = user
         post.save()
+        if post.image:
+            submit(make_thumbnails, post.image.name)
         return redirect('posts:profile', user.username)
     return render(request, template, context)
 
@@ -90,7 +204,7 @@ def post_create(request):
 def post_edit(request, post_id):
     template = 'posts/create_post.html'
     post = get_object_or_404(
-        Post.objects.select_related('group', 'author'),
+        Post.live.select_related('group', 'author'),
         pk=post_id
     )
     if request.user == post.author:
@@ -105,16 +219,28 @@ def post_edit(request, post_id):
             'is_edit': is_edit,
         }
         if form.is_valid():
-            form.save()
+            post = form.save()
+            if 'image' in form.changed_data and post.image:
+                submit(make_thumbnails, post.image.name)
             return redirect('posts:post_detail', post_id=post.id)
         return render(request, template, context)
     return redirect('posts:post_detail', post_id=post.id)
 
 
+@login_required
+@require_POST
+def post_delete(request, post_id):
+    post = get_object_or_404(Post.live, pk=post_id)
+    if request.user == post.author:
+        post.soft_delete()
+        return redirect('posts:profile', request.user.username)
+    return redirect('posts:post_detail', post_id=post.id)
+
+
 @login_required
 def add_comment(request, post_id):
     post = get_object_or_404(
-        Post.objects.select_related('group', 'author'),
+        Post.live.select_related('group', 'author'),
         pk=post_id
     )
     form = CommentForm(request.POST)
@@ -122,21 +248,36 @@ def add_comment(request, post_id):
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
-        comment.save()
+        write_buffer.add_comment(comment)
     return redirect('posts:post_detail', post_id=post_id)
 
 
 @login_required
+@condition(etag_func=versions_etag(
+    'posts.post', 'posts.follow', 'posts.recommendation'
+))
 def follow_index(request):
     template = 'posts/follow.html'
-    post_list = Post.objects.select_related('group').filter(
-        author__following__user=request.user
+    followees = follow_graph.followees(request.user.pk)
+    if len(followees) > settings.FOLLOW_INDEX_MAX_IDS:
+        # Длинный список параметров дороже подзапроса к подпискам.
+        followees = Follow.objects.filter(
+            user_id=request.user.pk
+        ).values('author_id')
+    post_list = Post.live.select_related('group', 'author').filter(
+        author_id__in=followees
+    )
+    paginator = EstimatedCountPaginator(
+        post_list,
+        settings.POST_AMOUNT,
+        dependencies=(Follow._meta.label_lower,)
     )
-    paginator = Paginator(post_list, settings.POST_AMOUNT)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     context = {
         'page_obj': page_obj,
+        'recommendations': get_recommendations(request.user.pk),
+        'events_url': events_url('follow'),
     }
     return render(request, template, context)
 
@@ -145,12 +286,21 @@ def follow_index(request):
 def profile_follow(request, username):
     author_object = get_object_or_404(User, username=username)
     if author_object != request.user:
-        author_object.following.get_or_create(user=request.user)
+        write_buffer.follow(request.user.pk, author_object.pk)
     return redirect('posts:profile', username=username)
 
 
 @login_required
 def profile_unfollow(request, username):
     author_object = get_object_or_404(User, username=username)
-    author_object.following.filter(user=request.user).delete()
+    write_buffer.unfollow(request.user.pk, author_object.pk)
     return redirect('posts:profile', username=username)
+
+
+def sitemap_index(request):
+    refresh_sitemaps()
+    return serve(request, INDEX_NAME, document_root=settings.SITEMAP_ROOT)
+
+
+def sitemap_shard(request, filename):
+    return serve(request, filename, document_root=settings.SITEMAP_ROOT)
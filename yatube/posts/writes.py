@@ -0,0 +1,184 @@
+import threading
+import time
+from collections import Counter
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.dispatch import Signal
+
+from core.versions import bump_version
+from .graph import follow_graph
+from .models import ActivityBucket, Comment, Follow, Post
+from .trending import get_bucket, record_activity
+
+# Отправляется после коммита пакета: bulk_create не шлёт post_save.
+# follows — новые пары (user_id, author_id), comments — вставленные
+# комментарии без первичных ключей.
+batch_written = Signal(providing_args=('follows', 'comments'))
+
+
+class Batch:
+    def __init__(self):
+        self.follows = {}
+        self.comments = []
+        # Операции ожидающих запросов: по ним пакет можно записать заново
+        # по одной, если он не записался целиком.
+        self.operations = []
+        self.done = threading.Event()
+
+
+class Operation:
+    def __init__(self, add):
+        self.add = add
+        self.error = None
+
+
+class WriteBuffer:
+    """Групповая запись подписок и комментариев.
+
+    Первый запрос открывает пакет, ждёт WRITE_BUFFER_DELAY секунд
+    и записывает всё накопленное одной транзакцией; остальные запросы
+    ждут её завершения. Повторные подписки и отписки от одного автора
+    схлопываются в последнее состояние, комментарии вставляются через
+    bulk_create. Запрос возвращается только после коммита, поэтому
+    автор изменения сразу видит его в любом процессе.
+
+    Если пакет не записался (например, пост комментария успели
+    удалить), операции записываются по одной, и ошибку получает только
+    запрос, чья операция не прошла.
+
+    bulk_create не шлёт сигналы, поэтому счётчики, версии и граф
+    подписок обновляются здесь же, по одному разу на пакет.
+    При нулевой задержке запись идёт сразу, без потоков.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._batch = None
+
+    def follow(self, user_id, author_id):
+        self._enqueue(lambda batch: batch.follows.__setitem__(
+            (user_id, author_id), True
+        ))
+
+    def unfollow(self, user_id, author_id):
+        self._enqueue(lambda batch: batch.follows.__setitem__(
+            (user_id, author_id), False
+        ))
+
+    def add_comment(self, comment):
+        self._enqueue(lambda batch: batch.comments.append(comment))
+
+    def _enqueue(self, add):
+        delay = settings.WRITE_BUFFER_DELAY
+        if not delay:
+            batch = Batch()
+            add(batch)
+            self.write(batch)
+            return
+        operation = Operation(add)
+        with self._lock:
+            leader = self._batch is None
+            if leader:
+                self._batch = Batch()
+            batch = self._batch
+            add(batch)
+            batch.operations.append(operation)
+        if leader:
+            time.sleep(delay)
+            with self._lock:
+                self._batch = None
+            try:
+                self.flush(batch)
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+        if operation.error is not None:
+            raise operation.error
+
+    def flush(self, batch):
+        """Записывает пакет, а при ошибке — его операции по одной."""
+        try:
+            self.write(batch)
+            return
+        except Exception as error:
+            if len(batch.operations) == 1:
+                batch.operations[0].error = error
+                return
+        for operation in batch.operations:
+            single = Batch()
+            operation.add(single)
+            try:
+                self.write(single)
+            except Exception as error:
+                operation.error = error
+
+    def write(self, batch):
+        created = [pair for pair, state in batch.follows.items() if state]
+        removed = [pair for pair, state in batch.follows.items() if not state]
+        inserted = []
+        with transaction.atomic():
+            if created:
+                # ignore_conflicts не сообщает, какие строки вставлены, а
+                # уведомления нужны только о новых подписках.
+                existing = set(Follow.objects.filter(reduce(or_, (
+                    Q(user_id=user_id, author_id=author_id)
+                    for user_id, author_id in created
+                ))).values_list('user_id', 'author_id'))
+                inserted = [pair for pair in created if pair not in existing]
+                Follow.objects.bulk_create(
+                    (
+                        Follow(user_id=user_id, author_id=author_id)
+                        for user_id, author_id in inserted
+                    ),
+                    ignore_conflicts=True
+                )
+            if removed:
+                Follow.objects.filter(reduce(or_, (
+                    Q(user_id=user_id, author_id=author_id)
+                    for user_id, author_id in removed
+                ))).delete()
+            if batch.comments:
+                self.write_comments(batch.comments)
+            if batch.follows:
+                # Версии меняются после коммита: иначе параллельный
+                # запрос закэширует старые строки под новой версией.
+                transaction.on_commit(lambda: bump_version('posts.follow'))
+                transaction.on_commit(
+                    lambda: self.invalidate_follows(batch.follows)
+                )
+            transaction.on_commit(lambda: batch_written.send(
+                sender=type(self), follows=inserted, comments=batch.comments
+            ))
+
+    def invalidate_follows(self, pairs):
+        for user_id, author_id in pairs:
+            follow_graph.invalidate(user_id, author_id)
+
+    def write_comments(self, comments):
+        Comment.objects.bulk_create(comments)
+        per_post = Counter(comment.post_id for comment in comments)
+        activity = Counter(
+            (comment.post_id, get_bucket(comment.created.timestamp()))
+            for comment in comments
+        )
+        for post_id, amount in per_post.items():
+            Post.objects.filter(pk=post_id).update(
+                comment_count=F('comment_count') + amount
+            )
+        for (post_id, bucket), amount in activity.items():
+            record_activity(
+                ActivityBucket.COMMENTS, post_id,
+                bucket * settings.TRENDING_BUCKET_SECONDS, amount
+            )
+        versions = ['posts.comment'] + [
+            f'posts.comment:{post_id}' for post_id in per_post
+        ]
+        transaction.on_commit(lambda: bump_version(*versions))
+
+
+write_buffer = WriteBuffer()
@@ -0,0 +1,19 @@
+"""
+ASGI config for yatube project.
+
+It exposes the ASGI callable as a module-level variable named
+``application``, e.g. ``uvicorn yatube.asgi:application``. Django 2.2
+has no native ASGI support, so requests are run by the WSGI handler in
+a thread pool (see core/asgi.py). Long-lived streams from ASGI_STREAMS,
+such as server-sent events, are served directly on the event loop.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+from core.asgi import ASGIHandler
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+application = ASGIHandler(get_wsgi_application())
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/2.2/ref/settings/
 
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -19,11 +21,26 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/2.2/howto/deployment/checklist/
 
+# Профиль настроек из окружения: dev (по умолчанию), prod или bench.
+# bench — как prod, но статика без манифеста, collectstatic не нужен.
+SETTINGS_PROFILE = os.environ.get('YATUBE_PROFILE', 'dev')
+if SETTINGS_PROFILE not in ('dev', 'prod', 'bench'):
+    raise ImproperlyConfigured(
+        f'Неизвестный профиль YATUBE_PROFILE={SETTINGS_PROFILE!r}'
+    )
+
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'i)8k(6snpt8m4711%u83fw-11xagd+=zab*ipq69ac0if1a-5m'
+SECRET_KEY = os.environ.get('YATUBE_SECRET_KEY')
+if SECRET_KEY is None:
+    # Ключ из репозитория известен всем: в продакшене он недопустим.
+    if SETTINGS_PROFILE == 'prod':
+        raise ImproperlyConfigured(
+            'Для профиля prod задайте YATUBE_SECRET_KEY'
+        )
+    SECRET_KEY = 'i)8k(6snpt8m4711%u83fw-11xagd+=zab*ipq69ac0if1a-5m'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = SETTINGS_PROFILE == 'dev'
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -51,36 +68,59 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
     'about.apps.AboutConfig',
+    'notifications.apps.NotificationsConfig',
     'sorl.thumbnail',
-    'debug_toolbar',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.auth.CachedAuthenticationMiddleware',
+    'core.middleware.ratelimit.RateLimitMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'core.middleware.profiler.ProfilerMiddleware',
 ]
 
+if DEBUG:
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+    # Проверка ищет APP_DIRS, а шаблоны панели находит
+    # core.loaders.AppDirectoriesLoader из TEMPLATE_LOADERS ниже.
+    SILENCED_SYSTEM_CHECKS = ['debug_toolbar.W006']
+
 ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATE_LOADERS = [
+    'core.loaders.FilesystemLoader',
+    'core.loaders.AppDirectoriesLoader',
+]
+if not DEBUG:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+# Прогреть импорты, URL и шаблоны при загрузке приложения, то есть
+# до fork воркеров при gunicorn --preload (см. core/warmup.py).
+WARMUP = not DEBUG
+# Убирать отступы из HTML-шаблонов при загрузке (см. core/loaders.py).
+TEMPLATES_MINIFY = not DEBUG
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'notifications.context_processors.unread_notifications',
             ],
         },
     },
@@ -138,8 +178,18 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+if SETTINGS_PROFILE == 'prod':
+    # Нужен collectstatic: без манифеста {% static %} не найдёт файлы.
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+# Раздавать STATIC_ROOT из Django, если перед ним нет веб-сервера.
+STATIC_SERVE = not DEBUG
 
 POST_AMOUNT = 10
+COMMENT_AMOUNT = 20
+NOTIFICATION_AMOUNT = 20
+FEED_AMOUNT = 20
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
@@ -155,5 +205,120 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Кэш, общий для всех процессов: версии данных (core/versions.py)
+    # и счётчики, которые воркеры должны видеть одинаково. В DEBUG
+    # процесс один, поэтому это то же хранилище, что и default.
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+# Для нескольких воркеров общий кэш — memcached: add и incr в нём
+# атомарны, а запись не перебирает файлы, как FileBasedCache.
+# YATUBE_MEMCACHED — адреса через запятую. Профиль bench запускается
+# одним процессом, поэтому без этой переменной обходится памятью.
+MEMCACHED_LOCATION = os.environ.get('YATUBE_MEMCACHED')
+if SETTINGS_PROFILE == 'prod' or MEMCACHED_LOCATION:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': (MEMCACHED_LOCATION or '127.0.0.1:11211').split(','),
     }
+
+PROFILER_ROOT = os.path.join(BASE_DIR, 'profiles')
+PROFILER_MODE = 'sample'
+PROFILER_INTERVAL = 0.001
+PROFILER_SAMPLE_RATE = 0
+PROFILER_QUERY_PARAM = '_profile'
+PROFILER_TOKEN_MAX_AGE = 60 * 60
+PROFILER_MAX_PROFILES = 100
+
+# Ключ карточки меняется при правке поста, автора или группы.
+POST_CARD_TIMEOUT = 60 * 60
+
+if not DEBUG:
+    # Сессии читаются из кэша и пишутся в кэш и в базу. Кэш общий,
+    # иначе после выхода сессия осталась бы живой в других воркерах.
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    SESSION_CACHE_ALIAS = 'shared'
+# Пользователи сессий в памяти процесса (см. core/middleware/auth.py).
+USER_CACHE_TIMEOUT = 60
+USER_CACHE_SIZE = 10000
+
+# Пользователей в графе подписок процесса (см. posts/graph.py).
+FOLLOW_GRAPH_SIZE = 100000
+# Сколько id авторов лента подписок подставляет в IN (...); при большем
+# числе подписок авторы выбираются подзапросом.
+FOLLOW_INDEX_MAX_IDS = 500
+
+# Рекомендации «кого почитать» (manage.py compute_recommendations).
+RECOMMENDATIONS_AMOUNT = 5
+RECOMMENDATIONS_LIMIT = 20
+RECOMMENDATIONS_TIMEOUT = 60 * 60
+
+# Популярное: счётчики по часам за двое суток, вес события уменьшается
+# вдвое за 6 часов, списки пересчитываются раз в 5 минут.
+TRENDING_BUCKET_SECONDS = 60 * 60
+TRENDING_WINDOW = 48
+TRENDING_HALF_LIFE = 6
+TRENDING_SIZE = 20
+TRENDING_REFRESH = 60 * 5
+
+# Ограничение частоты записей по имени URL (см. core/ratelimit.py).
+# В DEBUG выключено: тесты шлют много запросов с одного адреса.
+RATELIMIT_ENABLED = not DEBUG
+# Сколько обратных прокси перед приложением: от этого зависит, какой
+# адрес из X-Forwarded-For — клиентский. Без прокси должен быть 0,
+# иначе клиент подставит любой адрес сам.
+TRUSTED_PROXIES = int(
+    os.environ.get('YATUBE_TRUSTED_PROXIES', 0 if DEBUG else 1)
+)
+RATELIMITS = {
+    'posts:post_create': {'rate': '10/m', 'methods': ('POST',)},
+    'posts:post_edit': {'rate': '20/m', 'methods': ('POST',)},
+    'posts:add_comment': {'rate': '20/m', 'methods': ('POST',)},
+    'posts:profile_follow': {'rate': '30/m', 'methods': ('GET',)},
+    'posts:profile_unfollow': {'rate': '30/m', 'methods': ('GET',)},
+    'users:signup': {'rate': '5/h', 'methods': ('POST',)},
+    'users:login': {'rate': '10/m', 'methods': ('POST',)},
 }
+
+# Сколько секунд копить подписки и комментарии перед записью одной
+# транзакцией (posts/writes.py). 0 — писать сразу.
+WRITE_BUFFER_DELAY = 0 if DEBUG else 0.02
+
+NOTIFICATIONS_UNREAD_TIMEOUT = 60 * 60
+
+# Server-sent events о новых постах (posts/events.py). Поток отдаёт
+# только ASGI-приложение, поэтому в DEBUG (runserver) он не подключается.
+EVENTS_ENABLED = not DEBUG
+EVENTS_PATH = '/events/'
+EVENTS_HEARTBEAT = 15
+EVENTS_POLL_INTERVAL = 2
+EVENTS_RETRY = 10000
+PUBSUB_QUEUE_SIZE = 100
+ASGI_STREAMS = {EVENTS_PATH: 'posts.events.post_events'}
+
+# Адрес сайта для абсолютных ссылок в файлах, которые строятся вне
+# запроса (карта сайта).
+SITE_URL = os.environ.get('YATUBE_SITE_URL', 'http://localhost:8000')
+# Шардированная карта сайта на диске (posts/sitemaps.py). В шарде не
+# больше SITEMAP_SHARD_SIZE id — это и предел протокола на файл.
+SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
+SITEMAP_SHARD_SIZE = 50000
+SITEMAP_REFRESH = 60 * 60
+
+PAGINATOR_COUNT_TIMEOUT = 60 * 5
+PAGINATOR_EXACT_THRESHOLD = 10000
+PAGINATOR_ASYNC_REFRESH = True
+
+# Независимые запросы представлений выполняются в пуле потоков
+# (см. core/concurrent.py). В тестах выключено: потоки не видят данные
+# незавершённой транзакции.
+CONCURRENT_QUERIES = not DEBUG
+CONCURRENT_WORKERS = 8
+# Потоки, в которых ASGI-приложение выполняет запросы (см. yatube/asgi.py).
+ASGI_THREADS = 32
+
+# brotli включается, если установлен пакет brotli, иначе только gzip.
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_CACHE_TIMEOUT = 60 * 10
@@ -14,13 +14,19 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.views import static_file
+
 urlpatterns = [
     path('', include('posts.urls', namespace='posts')),
     path('auth/', include('users.urls', namespace='users')),
+    path(
+        'notifications/',
+        include('notifications.urls', namespace='notifications')
+    ),
     path('auth/', include('django.contrib.auth.urls')),
     path('admin/', admin.site.urls),
     path('about/', include('about.urls', namespace='about'))
@@ -30,6 +36,14 @@ handler404 = 'core.views.page_not_found'
 handler403 = 'core.views.permission_denied'
 handler500 = 'core.views.server_error'
 
+if settings.STATIC_SERVE:
+    urlpatterns += (
+        re_path(
+            r'^{}(?P<path>.*)$'.format(settings.STATIC_URL.lstrip('/')),
+            static_file
+        ),
+    )
+
 if settings.DEBUG:
     urlpatterns += static(
         settings.MEDIA_URL, document_root=settings.MEDIA_ROOT